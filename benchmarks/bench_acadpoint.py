@@ -0,0 +1,121 @@
+"""
+    AcadPoint memory and operations speed, before (0.0.10 implementation) and after
+
+    usage: python benchmarks/bench_acadpoint.py [N]
+"""
+
+import operator
+import os
+import sys
+import tracemalloc
+from timeit import timeit
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom.datatype import AcadPoint, AcadPointArray
+
+
+class LegacyAcadPoint:
+    """
+    AcadPoint as released in 0.0.10: instance __dict__, list based operators
+    """
+
+    def __init__(self, *args):
+        coords = []
+        if len(args) == 1:
+            if isinstance(args[0], (list, tuple)) and len(args[0]) == 3:
+                coords = [item for item in args[0] if isinstance(item, (float, int))]
+            elif isinstance(args[0], LegacyAcadPoint):
+                coords = [args[0].x, args[0].y, args[0].z]
+        elif len(args) == 3:
+            coords = [item for item in args if isinstance(item, (float, int))]
+        if len(coords) != 3:
+            raise TypeError("incorrect args")
+        self.x, self.y, self.z = coords
+
+    def __add__(self, other):
+        return self.__operand(self, other, operator.add)
+
+    def __mul__(self, other):
+        return self.__operand(self, other, operator.mul)
+
+    def __iadd__(self, other):
+        return self.__ioperand(other, operator.add)
+
+    def __operand(self, point1, point2, operation):
+        points = [point1, point2]
+        coordinates = []
+        for i in range(2):
+            if isinstance(points[i], LegacyAcadPoint):
+                coordinates.append([points[i].x, points[i].y, points[i].z])
+            elif isinstance(points[i], (list, tuple)) and len(points[i]) == 3:
+                coordinates.append([points[i][0], points[i][1], points[i][2]])
+            elif isinstance(points[i], (int, float)):
+                coordinates.append([points[i], points[i], points[i]])
+        return LegacyAcadPoint(operation(coordinates[0][0], coordinates[1][0]),
+                               operation(coordinates[0][1], coordinates[1][1]),
+                               operation(coordinates[0][2], coordinates[1][2]))
+
+    def __ioperand(self, point, operation):
+        if isinstance(point, LegacyAcadPoint):
+            coordinates = [point.x, point.y, point.z]
+        else:
+            coordinates = [point, point, point]
+        self.x = operation(self.x, coordinates[0])
+        self.y = operation(self.y, coordinates[1])
+        self.z = operation(self.z, coordinates[2])
+        return self
+
+
+def memory_per_point(cls, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    points = [cls(1.5, 2.5, 3.5) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list itself holds one pointer per point
+    return (after - before) / len(points) - 8
+
+
+def ops_per_second(statement, number):
+    return number / timeit(statement, number=number)
+
+
+def report(cls, count):
+    p1 = cls(1.5, 2.5, 3.5)
+    p2 = cls(4.0, 5.0, 6.0)
+
+    def iadd():
+        p = cls(0.0, 0.0, 0.0)
+        p += p2
+
+    return {
+        "bytes/point": memory_per_point(cls, count),
+        "init": ops_per_second(lambda: cls(1.5, 2.5, 3.5), count),
+        "point + point": ops_per_second(lambda: p1 + p2, count),
+        "point * scalar": ops_per_second(lambda: p1 * 2.0, count),
+        "point += point": ops_per_second(iadd, count),
+    }
+
+
+def check_comparison():
+    """
+    Points compare with points, arrays of points and sequences, other objects are not equal
+    """
+    point = AcadPoint(1.5, 2.5, 3.5)
+    assert point == AcadPointArray([(1.5, 2.5, 3.5)]) and AcadPointArray([(1.5, 2.5, 3.5)]) == point
+    assert point != None and point != "1.5,2.5,3.5" and AcadPointArray([(1.5, 2.5, 3.5)]) != object()
+    assert point in [None, "text", (1.5, 2.5, 3.5)]
+
+
+def main(count=200000):
+    check_comparison()
+    before = report(LegacyAcadPoint, count)
+    after = report(AcadPoint, count)
+    print("{:<16}{:>14}{:>14}{:>8}".format("", "before", "after", "ratio"))
+    for key in before:
+        print("{:<16}{:>14,.0f}{:>14,.0f}{:>8.2f}".format(key, before[key], after[key], after[key] / before[key]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,100 @@
+"""
+    AsyncAutoCAD: COM calls with latency overlapping with Python-side work against sequential calls
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_aio.py [N] [latency, ms]
+"""
+
+import asyncio
+import os
+import sys
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api
+from pyacadcom.aio import AsyncAutoCAD, AsyncProxy, COMWorker
+
+from bench_membercache import FakeLine
+
+
+class SlowLine(FakeLine):
+    latency = 0.001
+
+    def _get_Length(self):
+        # out of process call: caller waits, CPU is free
+        sleep(self.latency)
+        return 10.0
+
+
+def work(n):
+    # Python-side computation, e.g. report formatting
+    return sum(i * i for i in range(n))
+
+
+def sequential(app, n):
+    start = perf_counter()
+    for _ in range(n):
+        app.Length
+        work(20000)
+    return perf_counter() - start
+
+
+async def overlapped(acad, n):
+    start = perf_counter()
+    pending = []
+    for _ in range(n):
+        pending.append(asyncio.ensure_future(acad.Length))
+        work(20000)
+        await asyncio.sleep(0)
+    await asyncio.gather(*pending)
+    return perf_counter() - start
+
+
+async def check_nested(acad):
+    """
+    COM objects inside tuples, lists and dicts are passed as AsyncProxy both ways
+    """
+    result = await acad.call(lambda app: {"lines": (app, [app]), "count": 1})
+    assert isinstance(result["lines"][0], AsyncProxy) and isinstance(result["lines"][1][0], AsyncProxy)
+    assert await acad.call(lambda app, items: items["lines"][1][0] is app, result)
+
+
+def check_stop():
+    """
+    stop() before start() does nothing, jobs submitted after stop() are rejected instead of hanging
+    """
+    COMWorker(SlowLine).stop()
+    worker = COMWorker(SlowLine)
+    worker.start()
+    slow = worker.submit(sleep, 0.05)
+    worker.stop(wait=False)
+    try:
+        worker.submit(sleep, 0)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("job submitted after stop() was accepted")
+    slow.result(timeout=5)
+    worker.stop()
+
+
+async def main(n):
+    check_stop()
+    app = api.COMRetryObjectWrapper(SlowLine())
+    print("sequential:  {:.3f} s".format(sequential(app, n)))
+    async with AsyncAutoCAD(factory=lambda: api.COMRetryObjectWrapper(SlowLine())) as acad:
+        print("overlapped:  {:.3f} s".format(await overlapped(acad, n)))
+        await check_nested(acad)
+        stats = acad.stats()
+        print("worker: jobs {jobs}, queue depth {queue_depth}, utilisation {utilisation:.0%}".format(**stats))
+
+
+if __name__ == "__main__":
+    SlowLine.latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.001
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,99 @@
+"""
+    api.batch_edit: relayering and recolouring entities of fake AutoCAD backend with COM latency,
+    direct writes against write-behind batch, and failure handling during flush
+
+    usage: python benchmarks/bench_batch.py [entities]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api
+from pyacadcom.fake import FakeAutoCAD, Faults, populate
+
+LAYERS = {"AcDbLine": "Lines", "AcDbPolyline": "Lines", "AcDbArc": "Arcs", "AcDbCircle": "Arcs"}
+
+
+def edit(space):
+    # typical script: default writes first, then specific ones, some entities already match
+    for entity in space:
+        entity.Color = 256
+        layer = entity.Layer
+        entity.Layer = "Other"
+        entity.Layer = LAYERS.get(entity.ObjectName, layer)
+
+
+def document(count, latency):
+    faults = Faults(latency=latency)
+    app = api.COMRetryObjectWrapper(FakeAutoCAD(faults))
+    space = app.ActiveDocument.ModelSpace
+    populate(space, count, kinds=("line", "polyline", "arc", "mline", "circle", "text"), seed=1)
+    for number, entity in enumerate(space):
+        if number % 2:
+            entity.Layer = LAYERS.get(entity.ObjectName, "0")
+    return faults, space
+
+
+def throughput(count, latency=20e-6):
+    print("{} entities, {:.0f} us per COM call:".format(count, latency * 1e6))
+    layers = []
+    for name in ("direct writes", "batch_edit"):
+        faults, space = document(count, latency)
+        calls = faults.calls
+        start = perf_counter()
+        if name == "batch_edit":
+            with api.batch_edit() as batch:
+                edit(space)
+            stats = batch.stats()
+            assert stats["issued"] + stats["dropped"] == stats["writes"] and not stats["pending"]
+        else:
+            edit(space)
+            stats = ""
+        seconds = perf_counter() - start
+        print("  {:<16}{:8.3f} s {:8d} COM calls {}".format(name, seconds, faults.calls - calls, stats))
+        layers.append([(entity.Layer, entity.Color) for entity in space])
+    assert layers[0] == layers[1]
+
+
+def failures(count=100, chunk_size=25):
+    for stop_on_error in (True, False):
+        faults, space = document(count, 0.0)
+        entities = list(space)
+        entities[10].Delete()
+        chunks = []
+        try:
+            with api.batch_edit(chunk_size, stop_on_error, lambda done, seconds: chunks.append(done)) as batch:
+                for entity in entities:
+                    entity.Layer = "Edited"
+        except api.BatchEditError as error:
+            print("  stop_on_error=True:  {} ({})".format(error, batch.stats()))
+            # chunk with failed write is finished, following chunks are not issued
+            assert batch.issued == chunk_size - 1 and error.unapplied == count - chunk_size + 1
+            assert chunks == [chunk_size]
+        else:
+            print("  stop_on_error=False: {}".format(batch.stats()))
+            assert batch.issued == count - 1 and len(batch.failures) == 1
+            assert chunks == list(range(chunk_size, count + 1, chunk_size))
+    faults, space = document(count, 0.0)
+    try:
+        with api.batch_edit() as batch:
+            for entity in space:
+                entity.Layer = "Edited"
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        assert batch.issued == 0 and all(entity.Layer != "Edited" for entity in space)
+        print("  exception in block: writes discarded")
+
+
+if __name__ == "__main__":
+    throughput(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    print("failures:")
+    failures()
@@ -0,0 +1,149 @@
+"""
+    add_many() against one AddLine call per line on fake ModelSpace with COM call latency
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_bulk.py [N] [latency, us]
+"""
+
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom.bulk import add_many, dxf_text
+from pyacadcom.datatype import AcadPoint, set_variant_factory
+
+
+class FakeEntity:
+    def __init__(self, kind, args):
+        self.kind = kind
+        self.args = args
+
+
+class FakeDocument:
+    def __init__(self):
+        self.imported = []
+
+    def Import(self, path, point, scale):
+        with open(path) as file:
+            self.imported.append(file.read())
+
+
+class FakeModelSpace:
+    """
+    Records calls and spends latency seconds per call as out of process COM call does
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.created = []
+        self.Document = FakeDocument()
+
+    def _call(self, kind, args):
+        self.calls += 1
+        deadline = perf_counter() + self.latency
+        while perf_counter() < deadline:
+            pass
+        entity = FakeEntity(kind, args)
+        self.created.append(entity)
+        return entity
+
+    def AddLine(self, start, end):
+        return self._call("line", (start, end))
+
+    def AddLightWeightPolyline(self, coordinates):
+        return self._call("lwpolyline", (coordinates,))
+
+    def AddCircle(self, center, radius):
+        return self._call("circle", (center, radius))
+
+    def AddText(self, text, point, height):
+        return self._call("text", (text, point, height))
+
+
+def walk(count):
+    """
+    Connected path of segments, breaks every 50 segments
+    """
+    x = y = 0.0
+    segments = []
+    for i in range(count):
+        if i % 50 == 0:
+            x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+        nx, ny = x + random.uniform(-10, 10), y + random.uniform(-10, 10)
+        segments.extend((x, y, 0.0, nx, ny, 0.0))
+        x, y = nx, ny
+    return segments
+
+
+def main(count=20000, latency=50e-6):
+    random.seed(1)
+    segments = walk(count)
+
+    space = FakeModelSpace(latency)
+    start = perf_counter()
+    for i in range(0, len(segments), 6):
+        space.AddLine(AcadPoint(segments[i:i + 3])(), AcadPoint(segments[i + 3:i + 6])())
+    single = perf_counter() - start
+
+    space = FakeModelSpace(latency)
+    result = add_many(space, lines=segments)
+    assert space.calls == count
+
+    merged_space = FakeModelSpace(latency)
+    merged = add_many(merged_space, lines=segments, merge_lines=True)
+    assert merged.count == count and merged_space.calls == count // 50 + (count % 50 > 0)
+
+    assert dxf_text(lines=segments).count("\nLINE\n") == count
+
+    # generators are read once, also when entities are counted for DXF threshold
+    circles = [(float(i), 0.0, 0.0, 1.0) for i in range(100)]
+    for threshold in (None, count * 2, 0):
+        space = FakeModelSpace(0.0)
+        fed = add_many(space, lines=iter(segments), circles=(circle for circle in circles),
+                          dxf_threshold=threshold)
+        assert fed.count == count + len(circles), (threshold, fed)
+        if threshold == 0:
+            assert space.Document.imported[0].count("\nLINE\n") == count
+            assert space.Document.imported[0].count("\nCIRCLE\n") == len(circles)
+        else:
+            assert space.calls == count + len(circles)
+    check_variant_factory()
+    # text value is one DXF line, line break would shift group codes of the rest of file
+    lines = dxf_text(texts=[("first\nsecond\r\nthird", (0, 0, 0), 2.5)]).split("\n")
+    assert lines[lines.index("1") + 1] == "first second third" and lines[-3:] == ["0", "EOF", ""]
+    print("lines:                {}  (COM call latency {:.0f} us)".format(count, latency * 1e6))
+    print("AddLine loop:         {:.3f} s  {:,.0f} entities/s".format(single, count / single))
+    print("add_many:             {:.3f} s  {:,.0f} entities/s  {} calls".format(
+        result.elapsed, result.rate, result.calls))
+    print("add_many merged:      {:.3f} s  {:,.0f} entities/s  {} calls".format(
+        merged.elapsed, merged.rate, merged.calls))
+
+
+def check_variant_factory():
+    """
+    Coordinates of created entities are converted by variant factory of pyacadcom.datatype
+    """
+    set_variant_factory(tuple)
+    try:
+        space = FakeModelSpace(0.0)
+        add_many(space, lines=[0, 0, 0, 1, 1, 0], polylines=[[(0, 0), (5, 0), (5, 5)]],
+                 circles=[(2, 2, 0, 1)], texts=[("A", (1, 2), 2.5)])
+        assert [entity.args for entity in space.created] == [
+            ((0.0, 0.0, 0.0), (1.0, 1.0, 0.0)), ((0.0, 0.0, 5.0, 0.0, 5.0, 5.0),),
+            ((2.0, 2.0, 0.0), 1.0), ("A", (1.0, 2.0), 2.5)]
+    finally:
+        set_variant_factory()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         float(sys.argv[2]) * 1e-6 if len(sys.argv) > 2 else 50e-6)
@@ -0,0 +1,173 @@
+"""
+    EntityCache answers against rescanning entities, with simulated document events
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_cache.py [N]
+"""
+
+import os
+import random
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom.cache import EntityCache
+from pyacadcom.tool import sum_length
+
+
+MODEL_SPACE = 1
+BLOCK = 2
+
+
+class LayerRecord:
+    """
+    Non-entity object added to document with new layer
+    """
+    ObjectName = "AcDbLayerTableRecord"
+    OwnerID = 3
+
+    def __init__(self, number):
+        self.Handle = format(number + 0x100, "X")
+        self.ObjectID = number
+
+
+class Line:
+    """
+    In-process stand-in of AcDbLine entity
+    """
+    ObjectName = "AcDbLine"
+
+    def __init__(self, number, owner_id=MODEL_SPACE):
+        self.OwnerID = owner_id
+        self.Handle = format(number + 0x100, "X")
+        self.ObjectID = number
+        self.Layer = random.choice(("0", "Walls", "Doors", "Axes"))
+        self.StartPoint = (random.uniform(0, 1000), random.uniform(0, 1000), 0.0)
+        self.EndPoint = (random.uniform(0, 1000), random.uniform(0, 1000), 0.0)
+
+    @property
+    def Length(self):
+        return sum((a - b) ** 2 for a, b in zip(self.StartPoint, self.EndPoint)) ** 0.5
+
+    def GetBoundingBox(self):
+        return (tuple(map(min, self.StartPoint, self.EndPoint)), tuple(map(max, self.StartPoint, self.EndPoint)))
+
+
+class Entities(list):
+    ObjectID = MODEL_SPACE
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class SimulatedDocument:
+    """
+    Event source calling cache handlers the way document events do
+    """
+
+    def __init__(self, cache, entities):
+        self.cache = cache
+        self.entities = entities
+        self.next_id = len(entities)
+        # ids of added entities, cache reads them on next access
+        self.pending = set()
+        self.erased_pending = 0
+
+    def add(self):
+        entity = Line(self.next_id)
+        self.next_id += 1
+        self.entities.append(entity)
+        self.pending.add(entity.ObjectID)
+        self.cache.on_added(entity)
+
+    def add_other(self):
+        """
+        Add layer and line of block definition, they are not ModelSpace entities
+        """
+        for entity in (LayerRecord(self.next_id), Line(self.next_id + 1, BLOCK)):
+            self.cache.on_added(entity)
+        self.next_id += 2
+
+    def add_and_erase(self):
+        entity = Line(self.next_id)
+        self.next_id += 1
+        self.cache.on_added(entity)
+        self.cache.on_erased(entity.ObjectID)
+
+    def modify(self):
+        entity = random.choice(self.entities)
+        entity.Layer = "Modified"
+        self.cache.on_modified(entity)
+
+    def erase(self):
+        entity = self.entities.pop(random.randrange(len(self.entities)))
+        if entity.ObjectID in self.pending:
+            # added entity erased before it is read is skipped
+            self.erased_pending += 1
+        self.cache.on_erased(entity.ObjectID)
+
+
+class CountedLine(Line):
+    """
+    Line counting reads of ObjectName
+    """
+    reads = 0
+
+    @property
+    def ObjectName(self):
+        CountedLine.reads += 1
+        return "AcDbLine"
+
+
+def check_reads():
+    """
+    ObjectName is read once per entity by load(), repeated events of entity not read yet queue it once
+    """
+    cache = EntityCache(types=("AcDbLine",))
+    cache.load(Entities(CountedLine(i) for i in range(10)))
+    assert CountedLine.reads == 10, CountedLine.reads
+    entity = CountedLine(10)
+    cache.on_added(entity)
+    for _ in range(1000):
+        cache.on_modified(entity)
+    assert len(cache._added) == 1
+    assert len(cache) == 11 and cache.stats()["refreshes"] == 1 and CountedLine.reads == 11
+
+
+def main(count=100000):
+    check_reads()
+    entities = Entities(Line(i) for i in range(count))
+    cache = EntityCache()
+    load = timeit(lambda: cache.load(entities), number=1)
+    document = SimulatedDocument(cache, entities)
+    for _ in range(100):
+        document.add()
+        document.add_other()
+        document.add_and_erase()
+        document.modify()
+        document.erase()
+    first = timeit(cache.total_length, number=1)
+    cached = timeit(cache.total_length, number=1000) / 1000
+    layers = timeit(cache.count_by_layer, number=1000) / 1000
+    rescan = timeit(lambda: sum_length(entities), number=1)
+    assert abs(cache.total_length() - sum_length(entities)) < 1e-6 * count
+    assert sum(cache.count_by_layer().values()) == len(entities) == len(cache)
+    assert cache.stats()["skipped"] == 300 + document.erased_pending, cache.stats()
+    print("entities:             {}".format(count))
+    print("initial load:         {:.3f} s".format(load))
+    print("rescan sum_length:    {:.3f} s".format(rescan))
+    print("total after changes:  {:.3f} s".format(first))
+    print("cached total:         {:.2f} us".format(cached * 1e6))
+    print("count by layer:       {:.2f} us".format(layers * 1e6))
+    print("stats:                {}".format(cache.stats()))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
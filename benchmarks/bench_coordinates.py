@@ -0,0 +1,80 @@
+"""
+    Decoding of polyline Coordinates: triplecoordinates and loop of 0.0.10 mlinelength
+    against (N, dim) array from geometry.decode_coordinates, time and peak memory
+
+    usage: python benchmarks/bench_coordinates.py [vertices]
+"""
+
+import os
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom import geometry, tool
+
+
+def legacy_mlinelength(coordinates):
+    # mlinelength as released in 0.0.10
+    points = tool.triplecoordinates(coordinates)
+    length = 0
+    for i in range(len(points) - 1):
+        length += tool.distance(points[i], points[i + 1])
+    return length
+
+
+def legacy_bounding_box(points):
+    return tuple(map(min, zip(*points))), tuple(map(max, zip(*points)))
+
+
+def legacy_pairs(coordinates):
+    # no 2D function in tool: same slicing as triplecoordinates
+    return [coordinates[i:i + 2] for i in range(0, len(coordinates), 2)]
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = perf_counter()
+    result = function(*args)
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(name, elapsed, peak):
+    print("  {:<42}{:9.4f} s {:10.1f} MB peak".format(name, elapsed, peak / 2 ** 20))
+
+
+def main(vertices):
+    uniform = Random(1).uniform
+    flat3 = tuple(uniform(0, 1e4) for _ in range(vertices * 3))
+    flat2 = flat3[:vertices * 2]
+
+    print("3D coordinates (mline, 3D polyline), {} vertices:".format(vertices))
+    legacy, elapsed, peak = measure(legacy_mlinelength, flat3)
+    report("triplecoordinates + distance loop", elapsed, peak)
+    points, elapsed, peak = measure(tool.triplecoordinates, flat3)
+    report("triplecoordinates", elapsed, peak)
+    box, elapsed, peak = measure(legacy_bounding_box, points)
+    report("bounding box of tuples", elapsed, peak)
+    array, elapsed, peak = measure(geometry.decode_coordinates, flat3, None, "AcDbMline")
+    report("decode_coordinates", elapsed, peak)
+    length, elapsed, peak = measure(lambda: float(geometry.segment_lengths(array).sum()))
+    report("segment_lengths of array", elapsed, peak)
+    (low, high), elapsed, peak = measure(geometry.bounding_box, array)
+    report("bounding_box of array", elapsed, peak)
+    assert abs(length - legacy) <= 1e-9 * legacy and tuple(low) == box[0] and tuple(high) == box[1]
+
+    print("2D coordinates (lightweight polyline), {} vertices:".format(vertices))
+    pairs, elapsed, peak = measure(legacy_pairs, flat2)
+    report("slicing into pairs", elapsed, peak)
+    array, elapsed, peak = measure(geometry.decode_coordinates, flat2, None, "AcDbPolyline")
+    report("decode_coordinates", elapsed, peak)
+    assert array.shape == (vertices, 2) and tuple(array[-1]) == pairs[-1]
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,87 @@
+"""
+    Streaming export of synthetic entity stream: throughput of sinks and peak memory against count
+
+    usage: python benchmarks/bench_export.py [N]
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom.export import export, iter_records, CSVSink, JSONLSink, ParquetSink
+
+FIELDS = ("Handle", "ObjectName", "Layer", "Length", "StartPoint")
+
+
+class SyntheticLine:
+    ObjectName = "AcDbLine"
+
+    def __init__(self, number):
+        self.Handle = "{:X}".format(number + 0x100)
+        self.Layer = "Layer{}".format(number % 10)
+        self.StartPoint = (float(number), 0.0, 0.0)
+        self.Length = number * 0.5
+
+
+class SyntheticText:
+    ObjectName = "AcDbText"
+
+    def __init__(self, number):
+        self.Handle = "{:X}".format(number + 0x100)
+        self.Layer = "Text"
+        self.TextString = "Text {}".format(number)
+
+
+def entities(count):
+    # entities are created on the fly as COM wrappers are
+    for number in range(count):
+        yield SyntheticText(number) if number % 5 == 4 else SyntheticLine(number)
+
+
+def run(name, count, sink, **options):
+    tracemalloc.start()
+    result = export(entities(count), sink, FIELDS, **options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("  {:<28}{:10.0f} entities/s {:8.2f} MB peak".format(name, result.rate, peak / 2 ** 20))
+    return result
+
+
+def main(count):
+    directory = tempfile.mkdtemp()
+    assert sum(len(chunk) for chunk in iter_records(entities(2500), FIELDS)) == 2500
+    for size in (count // 10, count):
+        print("{} entities:".format(size))
+        jsonl = os.path.join(directory, "entities.jsonl")
+        run("JSONL", size, jsonl)
+        run("JSONL, writer thread", size, JSONLSink(jsonl), queue_size=4)
+        with open(jsonl, encoding="utf-8") as file:
+            lines = sum(1 for _ in file)
+            file.seek(0)
+            first = json.loads(file.readline())
+        assert lines == size and first["StartPoint"] == [0.0, 0.0, 0.0]
+        path = os.path.join(directory, "entities.csv")
+        run("CSV", size, CSVSink(path), chunk_size=5000)
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        assert len(rows) == size + 1 and rows[5][3] == "" and rows[1][4] == "[0.0, 0.0, 0.0]"
+        try:
+            sink = ParquetSink(os.path.join(directory, "entities.parquet"))
+        except ImportError:
+            print("  Parquet: pyarrow is not installed")
+        else:
+            run("Parquet", size, sink, chunk_size=10000)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
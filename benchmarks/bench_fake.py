@@ -0,0 +1,134 @@
+"""
+    COM wrappers on fake AutoCAD backend: wrapper overhead, retry tail latency under injected busy errors,
+    throughput of tool.sum_length and userinput.get_obj
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_fake.py [max entities, up to 10^6]
+"""
+
+import os
+import sys
+from timeit import timeit
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api
+from pyacadcom.fake import FakeAutoCAD, Faults, populate
+from pyacadcom.tool import entity_geometry, sum_length
+from pyacadcom.userinput import get_obj
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def wrapper_overhead(n=100000):
+    app = FakeAutoCAD()
+    populate(app.ActiveDocument.ModelSpace, 1, kinds=("line",))
+    raw = app.ActiveDocument.ModelSpace.Item(0)
+    wrapped = api.COMRetryObjectWrapper(app).ActiveDocument.ModelSpace.Item(0)
+    print("wrapper overhead, {} reads:".format(n))
+    for name, line in (("fake object", raw), ("COMRetryObjectWrapper", wrapped)):
+        seconds = timeit(lambda: line.Length, number=n)
+        print("  {:<24}{:8.2f} us/read".format(name, seconds / n * 1e6))
+
+
+def retry_tail(n=20000, latency=50e-6, busy_rate=0.02):
+    faults = Faults(latency=latency, busy_rate=busy_rate, attribute_error_rate=busy_rate / 4, seed=1)
+    app = api.COMRetryObjectWrapper(FakeAutoCAD(faults))
+    populate(app.ActiveDocument.ModelSpace, 1, kinds=("line",))
+    line = app.ActiveDocument.ModelSpace.Item(0)
+    policy = api.RetryPolicy(timeout=5.0, initial_delay=0.001, max_delay=0.05)
+    samples = []
+    with api.retry_policy(policy):
+        for _ in range(n):
+            start = perf_counter()
+            line.Length
+            samples.append(perf_counter() - start)
+    samples.sort()
+    print("retry tail latency, latency {:.0f} us, busy rate {:.0%}: {}".format(latency * 1e6, busy_rate, faults.stats()))
+    for quantile in (0.5, 0.9, 0.99, 0.999):
+        print("  p{:<6}{:10.1f} us".format(quantile * 100, samples[int(quantile * (n - 1))] * 1e6))
+    print("  max    {:10.1f} us".format(samples[-1] * 1e6))
+
+
+def polyline_geometry(n=1000):
+    """
+    entity_geometry() of polyline reads Coordinates, Closed and GetBulge of every vertex starting a segment;
+    local sum_length() does not ask AutoCAD for lengths but makes more COM calls than remote one
+    """
+    faults = Faults()
+    space = FakeAutoCAD(faults).ActiveDocument.ModelSpace
+    for number in range(n):
+        polyline = space.AddLightWeightPolyline((0.0, 0.0, 10.0, 0.0, 10.0, 10.0, 0.0, 10.0))
+        polyline.Closed = number % 2 == 0
+        if number % 4 == 3:
+            polyline.SetBulge(1, 0.5)
+    polylines = list(space)
+    calls = faults.calls
+    geometries = [entity_geometry(polyline, "AcDbPolyline") for polyline in polylines]
+    calls = faults.calls - calls
+    # Coordinates + Closed + 4 GetBulge for closed polyline, 3 GetBulge for open one
+    assert calls == 2 * n + 4 * (n - n // 2) + 3 * (n // 2), calls
+    print("polyline geometry: {} polylines, {:.2f} COM calls per polyline".format(n, calls / n))
+    if numpy is not None:
+        from pyacadcom.geometry import total_length
+        expected = sum(polyline.Length for polyline in polylines)
+        assert abs(total_length(geometries) - expected) <= 1e-9 * expected
+        for local in (False, True):
+            calls = faults.calls
+            sum_length(Selection(polylines), local=local)
+            print("  sum_length(local={}): {:.2f} COM calls per polyline".format(local, (faults.calls - calls) / n))
+
+
+class Selection(list):
+    """
+    List of entities with Count as SelectionSet has
+    """
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+def throughput(count):
+    app = api.COMRetryObjectWrapper(FakeAutoCAD())
+    document = app.ActiveDocument
+    populate(document.ModelSpace, count, kinds=("line", "polyline", "arc", "mline", "circle", "text"), seed=1)
+    results = []
+    start = perf_counter()
+    remote = sum_length(document.ModelSpace)
+    results.append(("sum_length", perf_counter() - start))
+    if numpy is not None:
+        start = perf_counter()
+        local = sum_length(document.ModelSpace, local=True)
+        results.append(("sum_length local", perf_counter() - start))
+        assert abs(local - remote) <= 1e-9 * remote
+    start = perf_counter()
+    code, selection = get_obj(app, "line arc")
+    results.append(("get_obj line arc", perf_counter() - start))
+    assert code == 1 and len(selection) == (count + 5) // 6 + (count + 3) // 6
+    print("{} entities:".format(count))
+    for name, seconds in results:
+        print("  {:<20}{:8.3f} s {:12.0f} entities/s".format(name, seconds, count / seconds))
+
+
+def main(max_count):
+    wrapper_overhead()
+    retry_tail()
+    polyline_geometry()
+    count = 1000
+    while count <= max_count:
+        throughput(count)
+        count *= 10
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,75 @@
+"""
+    pyacadcom.geometry: check against reference values and compare with pure Python length loop
+
+    usage: python benchmarks/bench_geometry.py [N]
+"""
+
+import math
+import os
+import random
+import sys
+from timeit import timeit
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom import geometry
+from pyacadcom.tool import distance, triplecoordinates
+
+TOLERANCE = 1e-9
+
+
+def check(name, value, reference):
+    if abs(value - reference) > TOLERANCE * max(1.0, abs(reference)):
+        raise AssertionError("{}: {} != {}".format(name, value, reference))
+
+
+def check_reference():
+    square = (0, 0, 10, 0, 10, 10, 0, 10)
+    check("square length", geometry.polyline_length(square, closed=True), 40.0)
+    check("square area", geometry.polyline_area(square), 100.0)
+    # half circle on chord (0,0)-(2,0) closed by the chord
+    check("half circle length", geometry.polyline_length((0, 0, 2, 0), bulges=(1, 0), closed=True), math.pi + 2)
+    check("half circle area", geometry.polyline_area((0, 0, 2, 0), bulges=(1, 0)), math.pi / 2)
+    # clockwise square with outer half circle on top side
+    check("clockwise area", geometry.polyline_area((0, 0, 0, 2, 2, 2, 2, 0), bulges=(0, -1, 0, 0)),
+          4 + math.pi / 2)
+    check("line", geometry.line_lengths([(0, 0, 0)], [(3, 4, 12)])[0], 13.0)
+    check("arc", geometry.arc_lengths([2.0], [0.0], [math.pi / 2])[0], math.pi)
+    check("arc over zero", geometry.arc_lengths([1.0], [3 * math.pi / 2], [math.pi / 2])[0], math.pi)
+    check("arc area", geometry.arc_areas([1.0], [0.0], [math.pi])[0], math.pi / 2)
+    check("circle", geometry.circle_lengths([1.0])[0], 2 * math.pi)
+    check("circle area", geometry.circle_areas([2.0])[0], 4 * math.pi)
+    total = geometry.total_length([
+        ("AcDbLine", ((0, 0, 0), (3, 4, 0))),
+        ("AcDbPolyline", (square, None, True)),
+        ("AcDbPolyline", ((0, 0, 2, 0), (1, 0), True)),
+        ("AcDbMline", ((0, 0, 0, 0, 0, 5, 0, 5, 5),)),
+        ("AcDbArc", (2.0, 0.0, math.pi / 2)),
+    ])
+    check("total", total, 5 + 40 + math.pi + 2 + 10 + math.pi)
+
+
+def python_length(polylines):
+    total = 0.0
+    for coordinates in polylines:
+        points = triplecoordinates(coordinates)
+        for i in range(len(points) - 1):
+            total += distance(points[i], points[i + 1])
+    return total
+
+
+def main(count=20000, vertices=50):
+    check_reference()
+    print("reference values:  ok")
+    polylines = [tuple(random.uniform(-1000, 1000) for _ in range(vertices * 3)) for _ in range(count)]
+    python = timeit(lambda: python_length(polylines), number=1)
+    local = timeit(lambda: geometry.polylines_total_length(((p, None, False) for p in polylines), dim=3), number=1)
+    check("polylines", geometry.polylines_total_length(((p, None, False) for p in polylines), dim=3) / count,
+          python_length(polylines) / count)
+    print("3D polylines:      {} x {} vertices".format(count, vertices))
+    print("python loop:       {:.3f} s".format(python))
+    print("geometry kernel:   {:.3f} s  (x{:.1f})".format(local, python / local))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,91 @@
+"""
+    Import time of pyacadcom measured with python -X importtime, exits with code 1 on regression:
+    import is slower than budget, pywin32 or numpy are imported by import of pure Python parts,
+    or pure Python parts can not be imported without pywin32
+
+    usage: python benchmarks/bench_import.py [--budget-ms 30] [--runs 7]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pythoncom", "pywintypes", "win32com", "numpy")
+
+# statement, modules which must not be imported by it
+CHECKS = (
+    ("import pyacadcom", HEAVY),
+    ("from pyacadcom import AcadPoint", HEAVY),
+    ("from pyacadcom import tool, utils", HEAVY),
+    ("from pyacadcom.datatype import AcadPoint, convertcoordinates", HEAVY),
+)
+
+# pure Python parts, imported and used with pywin32 made unimportable
+WITHOUT_PYWIN32 = """
+import sys
+for name in ("pythoncom", "pywintypes", "win32com", "win32com.client"):
+    sys.modules[name] = None
+import pyacadcom
+from pyacadcom import AcadPoint, tool, utils
+assert AcadPoint(1, 2, 3) + (1, 1, 1) == (2, 3, 4)
+assert tool.distance((0, 0), (3, 4)) == 5.0
+assert utils.distance((0, 0, 0), (0, 3, 4)) == 5.0
+assert tool.mlinelength(type("Multiline", (), {"Coordinates": (0, 0, 0, 3, 4, 0)})()) == 5.0
+"""
+
+
+def python(code, *options):
+    return subprocess.run([sys.executable] + list(options) + ["-c", code], cwd=ROOT, capture_output=True, text=True)
+
+
+def import_time(statement):
+    """
+    :return: ({module: cumulative microseconds}, set of imported modules)
+    """
+    result = python(statement, "-X", "importtime")
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pyacadcom import time check")
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="allowed time of import pyacadcom")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+    failures = []
+
+    runs = sorted(import_time("import pyacadcom").get("pyacadcom", 0) / 1000 for _ in range(args.runs))
+    median = runs[len(runs) // 2]
+    print("import pyacadcom: median {:.2f} ms, min {:.2f} ms, max {:.2f} ms of {} runs".format(
+        median, runs[0], runs[-1], args.runs))
+    if median > args.budget_ms:
+        failures.append("import pyacadcom takes {:.2f} ms, budget is {:.2f} ms".format(median, args.budget_ms))
+
+    for statement, forbidden in CHECKS:
+        times = import_time(statement)
+        imported = sorted(name for name in times if name.split(".")[0] in forbidden)
+        total = sum(value for name, value in times.items() if "." not in name and name.startswith("pyacadcom"))
+        print("{:<64}{:8.2f} ms".format(statement, total / 1000))
+        if imported:
+            failures.append("{} imports {}".format(statement, ", ".join(imported)))
+
+    result = python(WITHOUT_PYWIN32)
+    print("pure Python parts without pywin32: {}".format("ok" if result.returncode == 0 else "failed"))
+    if result.returncode:
+        failures.append("pure Python parts can not be used without pywin32:\n" + result.stderr)
+
+    for failure in failures:
+        print("FAILED: " + failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+    COMRetryObjectWrapper attribute access overhead with and without member cache
+
+    Runs against in-process fake dispatch objects that resolve names through
+    GetIDsOfNames/Invoke the same way as win32com dynamic dispatch does
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_membercache.py [N]
+"""
+
+import os
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pythoncom import DISPATCH_PROPERTYGET
+from pyacadcom import api
+
+
+class FakeOleObject:
+    """
+    IDispatch of fake entity
+    """
+
+    def __init__(self, owner):
+        self._owner = owner
+        self.invokes = 0
+
+    def GetIDsOfNames(self, lcid, name):
+        try:
+            return self._owner._dispids_[name]
+        except KeyError:
+            raise api.com_error(-2147352570, "Unknown name.", None, None)
+
+    def Invoke(self, dispid, lcid, flags, result):
+        self.invokes += 1
+        return getattr(self._owner, "_get_" + self._owner._names_[dispid])()
+
+
+@api.register_wrapped_type
+class FakeLine:
+    CLSID = "{FAKE-LINE}"
+    _dispids_ = {"ObjectName": 1, "Length": 2, "Layer": 3, "Document": 4}
+    _names_ = {value: key for key, value in _dispids_.items()}
+
+    def __init__(self, document=None):
+        self._oleobj_ = FakeOleObject(self)
+        self._document = document
+
+    def __getattr__(self, item):
+        # same work as dynamic CDispatch: name lookup and Invoke on every access
+        dispid = self._oleobj_.GetIDsOfNames(0, item)
+        return self._oleobj_.Invoke(dispid, 0, DISPATCH_PROPERTYGET, 1)
+
+    def _get_good_object_(self, value):
+        return value
+
+    def _get_ObjectName(self):
+        return "AcDbLine"
+
+    def _get_Length(self):
+        return 10.0
+
+    def _get_Layer(self):
+        return "0"
+
+    def _get_Document(self):
+        return self._document
+
+
+def run(items):
+    total = 0.0
+    for item in items:
+        if item.ObjectName == "AcDbLine":
+            total += item.Length
+        item.Layer
+        item.Document
+    return total
+
+
+def main(count=100000):
+    document = FakeLine()
+    items = [api.COMRetryObjectWrapper(FakeLine(document)) for _ in range(count)]
+    api.member_cache.maxsize = 0
+    api.member_cache.clear()
+    uncached = timeit(lambda: run(items), number=3) / 3
+    api.member_cache.maxsize = 4096
+    api.member_cache.clear()
+    cached = timeit(lambda: run(items), number=3) / 3
+    accesses = count * 4
+    print("attribute reads: {}".format(accesses))
+    print("no cache:        {:.3f} s  {:.2f} us/access".format(uncached, uncached / accesses * 1e6))
+    print("member cache:    {:.3f} s  {:.2f} us/access".format(cached, cached / accesses * 1e6))
+    print("cache info:      {}".format(api.member_cache.info()))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,52 @@
+"""
+    Overhead of COM metrics collection on COMRetryObjectWrapper attribute access
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_metrics.py [N]
+"""
+
+import os
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api, metrics
+from bench_membercache import FakeLine
+
+
+def run(items):
+    for item in items:
+        item.ObjectName
+        item.Length
+
+
+def main(count=100000):
+    raw = [FakeLine() for _ in range(count)]
+    items = [api.COMRetryObjectWrapper(item) for item in raw]
+    accesses = count * 2
+    direct = timeit(lambda: run(raw), number=3) / 3
+    off = timeit(lambda: run(items), number=3) / 3
+    # the only work done for metrics while they are off is this check per call
+    check = timeit("if metrics._collectors: pass", globals={"metrics": metrics}, number=accesses)
+    with metrics.measure() as collected:
+        on = timeit(lambda: run(items), number=3) / 3
+    print("attribute reads:   {}".format(accesses))
+    print("fake object:       {:.3f} us/access".format(direct / accesses * 1e6))
+    print("metrics off:       {:.3f} us/access".format(off / accesses * 1e6))
+    print("off check:         {:.3f} us/access".format(check / accesses * 1e6))
+    print("metrics on:        {:.3f} us/access  (+{:.3f} us)".format(on / accesses * 1e6, (on - off) / accesses * 1e6))
+    print(collected.to_prometheus())
+    # label values are escaped as Prometheus text format requires
+    special = metrics.COMMetrics()
+    special.record_call('a"b\\c\nd', 0.001)
+    assert 'member="a\\"b\\\\c\\nd"' in special.to_prometheus()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
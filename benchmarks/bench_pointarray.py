@@ -0,0 +1,45 @@
+"""
+    AcadPointArray vs Python loop over AcadPoint
+
+    Translates, scales and exports N points to flat coordinates list
+    usage: python benchmarks/bench_pointarray.py [N]
+"""
+
+import os
+import sys
+from timeit import timeit
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom.datatype import AcadPoint, AcadPointArray
+
+
+def loop_points(points, offset):
+    result = [(point + offset) * 2 for point in points]
+    flat = []
+    for point in result:
+        flat.extend(point)
+    return flat
+
+
+def vector_points(points, offset):
+    return ((points + offset) * 2).flat().tolist()
+
+
+def main(count=100000):
+    points = [AcadPoint(float(i), float(i * 2), 0.0) for i in range(count)]
+    array = AcadPointArray.from_points(points)
+    offset = AcadPoint(10.0, 20.0, 5.0)
+    assert loop_points(points[:10], offset) == vector_points(array[:10], offset)
+    assert array[:10] == array[:10] and array[:10] != array[:5]
+    loop = timeit(lambda: loop_points(points, offset), number=3) / 3
+    vector = timeit(lambda: vector_points(array, offset), number=3) / 3
+    convert = timeit(lambda: AcadPointArray.from_points(points).to_points(), number=3) / 3
+    print("points:            {}".format(count))
+    print("AcadPoint loop:    {:.4f} s".format(loop))
+    print("AcadPointArray:    {:.4f} s  (x{:.1f})".format(vector, loop / vector))
+    print("round trip conv.:  {:.4f} s".format(convert))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,95 @@
+"""
+    AutoCADPool scheduling, crash and hang recovery with worker processes running fake application
+
+    Every job "opens drawing" (sleeps latency seconds as AutoCAD does) and counts its entities,
+    some drawings crash or hang the instance. Fake application starts a sleeping child process in place of acad.exe,
+    it must not outlive the pool.
+    Runs on Linux: fake application does not use COM, so workers run without worker context and pywin32
+    usage: python benchmarks/bench_pool.py [jobs] [latency, s]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from functools import partial
+from time import perf_counter, sleep
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom.pool import AutoCADPool, InstanceCrashError
+
+
+class FakeApplication:
+    def __init__(self, latency, directory):
+        self.latency = latency
+        self.process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(3600)"])
+        self.pid = self.process.pid
+        # pool does not report pids of crashed and hung instances
+        open(os.path.join(directory, str(self.pid)), "w").close()
+
+    def Quit(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+def application_pid(app):
+    return app.pid
+
+
+def alive(pid):
+    try:
+        with open("/proc/{}/stat".format(pid)) as stat:
+            # zombie waits for parent which was killed, process itself is gone
+            return stat.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def count_entities(app, drawing):
+    if drawing == "crash.dwg":
+        os._exit(3)
+    if drawing == "hang.dwg":
+        sleep(3600)
+    sleep(app.latency)
+    return drawing, app.pid, sum(range(100000))
+
+
+def run(size, drawings, latency, **options):
+    with tempfile.TemporaryDirectory() as directory:
+        with AutoCADPool(size, partial(FakeApplication, latency, directory), worker_context=None,
+                         application_pid=application_pid, **options) as pool:
+            start = perf_counter()
+            results = pool.map(count_entities, drawings, return_exceptions=True)
+            elapsed = perf_counter() - start
+            stats = pool.stats()
+        leaked = [pid for pid in map(int, os.listdir(directory)) if alive(pid)]
+    assert not leaked, "application processes left after pool: {}".format(leaked)
+    return results, elapsed, stats
+
+
+def main(jobs, latency):
+    drawings = ["{}.dwg".format(number) for number in range(jobs)]
+    for size in (1, 2, 4):
+        results, elapsed, stats = run(size, drawings, latency)
+        assert [result[0] for result in results] == drawings
+        print("{} instances: {:.2f} s, {:.1f} drawings/s, {} processes used".format(
+            size, elapsed, jobs / elapsed, len({result[1] for result in results})))
+
+    faulty = drawings[:4] + ["crash.dwg", "hang.dwg"] + drawings[4:8]
+    results, elapsed, stats = run(2, faulty, latency, job_timeout=1.0, retries=1)
+    assert [result[0] for result in results[:4] + results[6:]] == drawings[:8]
+    assert isinstance(results[4], InstanceCrashError) and isinstance(results[5], TimeoutError)
+    assert stats["crashes"] == 2 and stats["hangs"] == 2 and stats["restarts"] >= 3 and stats["failed"] == 2
+    print("faulty drawings: {:.2f} s, {}".format(elapsed, stats))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40, float(sys.argv[2]) if len(sys.argv) > 2 else 0.2)
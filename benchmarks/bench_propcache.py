@@ -0,0 +1,77 @@
+"""
+    api.property_cache: COM calls and time of interactive style loop reading app.ActiveDocument.Utility
+    and ModelSpace on fake AutoCAD backend, with and without memoization, and invalidation checks
+
+    usage: python benchmarks/bench_propcache.py [iterations]
+"""
+
+import os
+import sys
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api
+from pyacadcom.fake import FakeAutoCAD, Faults, populate
+
+
+def loop(app, iterations):
+    # userinput style: document and utility are read on every step
+    for _ in range(iterations):
+        doc = app.ActiveDocument
+        doc.Utility.Prompt("")
+        doc.ModelSpace.Count
+
+
+def throughput(iterations, latency=20e-6):
+    print("{} iterations, {:.0f} us per COM call:".format(iterations, latency * 1e6))
+    for enabled in (False, True):
+        faults = Faults(latency=latency)
+        app = api.COMRetryObjectWrapper(FakeAutoCAD(faults))
+        api.property_cache.clear()
+        if enabled:
+            api.property_cache.enable()
+        start = perf_counter()
+        loop(app, iterations)
+        seconds = perf_counter() - start
+        print("  {:<20}{:8.3f} s {:8d} COM calls {}".format(
+            "memoized" if enabled else "not memoized", seconds, faults.calls,
+            api.property_cache.info() if enabled else ""))
+        api.property_cache.disable()
+
+
+def invalidation():
+    app = api.COMRetryObjectWrapper(FakeAutoCAD())
+    api.property_cache.clear()
+    api.property_cache.enable()
+    first = app.ActiveDocument
+    assert app.ActiveDocument is first
+    app.Documents.Add("Second.dwg")
+    # Documents.Add activates new document and invalidates cached members
+    second = app.ActiveDocument
+    assert second is not first
+    assert second.Name == "Second.dwg"
+    first.Activate()
+    assert app.ActiveDocument.Name == "Drawing1.dwg"
+    api.property_cache.enable(ttl=0.01)
+    space = app.ActiveDocument.ModelSpace
+    populate(space, 10)
+    sleep(0.02)
+    assert app.ActiveDocument.ModelSpace is not space
+    api.property_cache.maxsize = 2
+    app.ActiveDocument.ModelSpace, app.ActiveDocument.Utility
+    assert len(api.property_cache) == 2
+    print("invalidation: {}".format(api.property_cache.info()))
+    api.property_cache.disable()
+    api.property_cache.maxsize = 1024
+    api.property_cache.ttl = None
+
+
+if __name__ == "__main__":
+    throughput(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    invalidation()
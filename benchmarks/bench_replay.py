@@ -0,0 +1,106 @@
+"""
+    pyacadcom.replay: record script session on fake AutoCAD backend with latency and busy errors,
+    replay it without backend, with and without recorded COM time, and profile trace.
+    Trace is also replayed in child process without pywin32 stand-ins, as on Linux without pywin32
+
+    usage: python benchmarks/bench_replay.py [entities]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+if sys.argv[1:2] != ["--replay"]:
+    comstub.install()
+
+from pyacadcom import replay as replay_module
+from pyacadcom.replay import Player, ReplayError, profile, read_trace, record, replay
+from pyacadcom.tool import sum_length
+
+
+def script(acad):
+    doc = acad.ActiveDocument
+    doc.Utility.Prompt("Length\n")
+    total = sum_length(doc.ModelSpace)
+    layers = {}
+    for entity in doc.ModelSpace:
+        layers[entity.Layer] = layers.get(entity.Layer, 0) + 1
+    line = doc.ModelSpace.AddLine((0.0, 0.0, 0.0), (3.0, 4.0, 0.0))
+    line.Layer = "Edited"
+    return round(total, 6), layers, line.Length, doc.Name
+
+
+def replay_without_pywin32(path):
+    """
+    Replay trace in this process, pywin32 and its stand-ins must not be importable
+    """
+    assert replay_module.api is None, "pywin32 is available"
+    player = Player(path)
+    start = perf_counter()
+    result = script(player.application())
+    assert player.finished
+    print(repr((result, perf_counter() - start)))
+
+
+def main(count):
+    from pyacadcom import api
+    from pyacadcom.fake import FakeAutoCAD, Faults, populate
+
+    path = os.path.join(tempfile.mkdtemp(), "session.trace.gz")
+    faults = Faults(latency=50e-6, busy_rate=0.02, seed=1)
+    app = FakeAutoCAD(faults)
+    populate(app.ActiveDocument.ModelSpace, count, seed=1)
+    policy = api.RetryPolicy(initial_delay=0.0005, max_delay=0.005)
+    with api.retry_policy(policy):
+        start = perf_counter()
+        with record(path, app) as acad:
+            recorded = script(acad)
+        seconds = perf_counter() - start
+    header, events = read_trace(path)
+    retried = sum(1 for event in events if isinstance(event[4], dict) and "$error" in event[4])
+    print("{} entities, fake backend {}:".format(count, faults.stats()))
+    print("  {:<24}{:8.3f} s {:8d} events {:6d} failed attempts {:8.1f} KB trace".format(
+        "record", seconds, len(events), retried, os.path.getsize(path) / 1024))
+    for timing in (0.0, 1.0):
+        player = Player(path, timing=timing)
+        start = perf_counter()
+        replayed = script(player.application())
+        seconds = perf_counter() - start
+        assert replayed == recorded, (replayed, recorded)
+        assert player.finished
+        print("  {:<24}{:8.3f} s {:8d} events replayed".format("replay timing={}".format(timing), seconds,
+                                                               player.stats()["replayed"]))
+    with replay(path) as acad, api.retry_policy(policy):
+        # retry policy of script does not delay replay: retried busy errors are skipped
+        start = perf_counter()
+        assert script(acad) == recorded
+        print("  {:<24}{:8.3f} s".format("replay in retry_policy", perf_counter() - start))
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--replay", path], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    replayed, seconds = eval(output)
+    assert replayed == recorded, (replayed, recorded)
+    print("  {:<24}{:8.3f} s".format("replay without pywin32", seconds))
+    try:
+        with replay(path) as acad:
+            acad.ActiveDocument.Regen(1)
+    except ReplayError as error:
+        print("  changed script: {}".format(error))
+    else:
+        raise AssertionError("changed script is not detected")
+    print("  profile:")
+    for key, calls, errors, seconds in profile(path)[:5]:
+        print("    {:<24}{:8d} calls {:6d} errors {:8.3f} s".format(key, calls, errors, seconds))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--replay"]:
+        replay_without_pywin32(sys.argv[2])
+        sys.exit()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
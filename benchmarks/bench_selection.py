@@ -0,0 +1,80 @@
+"""
+    pyacadcom.selection: repeated get_obj and programmatic selection on fake AutoCAD backend with COM latency,
+    new selection set per query against SelectionSetPool, cleanup after errors
+
+    usage: python benchmarks/bench_selection.py [queries]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import api
+from pyacadcom.fake import FakeAutoCAD, Faults, pick, populate
+from pyacadcom.selection import SELECT_ALL, SELECT_WINDOW_POLYGON, SelectionSetPool
+from pyacadcom.userinput import COMInput, get_obj, input_provider, selection_filter
+
+
+def document(latency):
+    faults = Faults(latency=latency)
+    doc = api.COMRetryObjectWrapper(FakeAutoCAD(faults)).ActiveDocument
+    populate(doc.ModelSpace, 50, kinds=("line", "arc", "circle", "text"), seed=1)
+    pick(doc)
+    return faults, doc
+
+
+def get_obj_queries(queries, latency):
+    print("{} get_obj queries, {:.0f} us per COM call:".format(queries, latency * 1e6))
+    results = []
+    for name in ("new set per query", "COMInput provider"):
+        faults, doc = document(latency)
+        calls = faults.calls
+        start = perf_counter()
+        if name == "COMInput provider":
+            # provider reuses its selection set by default
+            with COMInput(doc) as provider, input_provider(provider):
+                selections = [get_obj(None, "line arc")[1] for _ in range(queries)]
+            stats = provider.pool.stats()
+            assert stats["created"] == 1 and stats["hits"] == queries - 1
+        else:
+            selections = [get_obj(doc.Application, "line arc")[1] for _ in range(queries)]
+            stats = ""
+        seconds = perf_counter() - start
+        assert doc.SelectionSets.Count == 0
+        results.append([len(selection) for selection in selections])
+        print("  {:<24}{:8.3f} s {:8d} COM calls".format(name, seconds, faults.calls - calls))
+    assert results[0] == results[1]
+    print("  pool: {}".format(stats))
+
+
+def programmatic():
+    faults, doc = document(0.0)
+    filter_type, filter_data, _, _ = selection_filter("circle")
+    with SelectionSetPool(doc, size=1) as pool:
+        circles = pool.select(SELECT_ALL, filter_type=filter_type, filter_data=filter_data)
+        assert circles and all(entity.ObjectName == "AcDbCircle" for entity in circles)
+        assert len(pool.select()) == doc.ModelSpace.Count
+        assert len(pool.select_by_polygon(SELECT_WINDOW_POLYGON, [(0, 0), (1000, 0), (500, 800)])) == 50
+        try:
+            with pool.selection_set() as selset:
+                selset.SelectOnScreen()
+                raise KeyError("script error")
+        except KeyError:
+            pass
+        assert doc.SelectionSets.Count == 1 and doc.SelectionSets.Item(0).Count == 0
+        with SelectionSetPool(doc) as other, other.selection_set() as first, pool.selection_set() as second:
+            assert first.Name != second.Name
+    assert doc.SelectionSets.Count == 0
+    print("programmatic selection: {}".format(pool.stats()["timings"]))
+
+
+if __name__ == "__main__":
+    get_obj_queries(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, 20e-6)
+    programmatic()
@@ -0,0 +1,110 @@
+"""
+    snapshot() throughput against reading properties one by one
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    usage: python benchmarks/bench_snapshot.py [N]
+"""
+
+import os
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pywintypes import com_error
+
+from pyacadcom import api
+from pyacadcom.snapshot import snapshot
+from bench_membercache import FakeLine
+
+
+@api.register_wrapped_type
+class FakeArc(FakeLine):
+    CLSID = "{FAKE-ARC}"
+    _dispids_ = {"ObjectName": 1, "Layer": 3, "Handle": 5, "ArcLength": 6}
+    _names_ = {value: key for key, value in _dispids_.items()}
+
+    def _get_ObjectName(self):
+        return "AcDbArc"
+
+    def _get_ArcLength(self):
+        return 15.0
+
+    def _get_Handle(self):
+        return hex(id(self))
+
+
+FakeLine._dispids_["Handle"] = 5
+FakeLine._names_[5] = "Handle"
+FakeLine._get_Handle = FakeArc._get_Handle
+
+
+class BusyArc(FakeArc):
+    """
+    Arc of AutoCAD which rejects first read of ArcLength, Layer does not apply to it
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rejected = False
+
+    def _get_ArcLength(self):
+        if not self.rejected:
+            self.rejected = True
+            raise com_error(-2147418111, "Call was rejected by callee.", None, None)
+        return 15.0
+
+    def _get_Layer(self):
+        raise com_error(-2147467263, "Not implemented", None, None)
+
+
+def check_errors():
+    """
+    Properties which do not apply are None, busy AutoCAD is not: error is raised or retried by wrapper
+    """
+    try:
+        snapshot([BusyArc()], ["ArcLength"])
+    except com_error:
+        pass
+    else:
+        raise AssertionError("error of busy AutoCAD was read as None")
+    wrapped = api.COMRetryObjectWrapper(BusyArc(), api.RetryPolicy(initial_delay=0.0, jitter=0.0))
+    data = snapshot([wrapped], ["ArcLength", "Layer"])
+    assert data["ArcLength"] == [15.0] and data["Layer"] == [None], data
+
+
+def one_by_one(items):
+    total = 0.0
+    for item in items:
+        if item.ObjectName == "AcDbLine":
+            total += item.Length
+        elif item.ObjectName == "AcDbArc":
+            total += item.ArcLength
+    return total
+
+
+def columns(items):
+    data = snapshot(items, ["ObjectName", "Length", "ArcLength"], chunk_size=10000)
+    return sum(value for column in (data["Length"], data["ArcLength"]) for value in column if value is not None)
+
+
+def main(count=100000):
+    check_errors()
+    items = [api.COMRetryObjectWrapper(FakeLine() if i % 2 else FakeArc()) for i in range(count)]
+    assert one_by_one(items) == columns(items)
+    single = timeit(lambda: one_by_one(items), number=1)
+    bulk = timeit(lambda: columns(items), number=1)
+    data = snapshot(items, ["Handle", "ObjectName", "Layer", "Length", "ArcLength"], as_numpy=True)
+    print("entities:          {}".format(count))
+    print("one by one:        {:.3f} s  {:,.0f} entities/s".format(single, count / single))
+    print("snapshot:          {:.3f} s  {:,.0f} entities/s".format(bulk, count / bulk))
+    print("5 field snapshot:  {:,.0f} entities/s".format(data.rate))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
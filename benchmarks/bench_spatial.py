@@ -0,0 +1,83 @@
+"""
+    GridIndex on synthetic bounding boxes: bulk load, window, crossing and nearest queries
+
+    usage: python benchmarks/bench_spatial.py [N]
+"""
+
+import os
+import random
+import sys
+from math import sqrt
+from time import perf_counter
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyacadcom.spatial import GridIndex
+
+
+def synthetic_boxes(count, extent=100000.0, size=50.0):
+    for number in range(count):
+        x, y = random.uniform(0, extent), random.uniform(0, extent)
+        yield format(number, "X"), (x, y, 0.0), (x + random.uniform(0, size), y + random.uniform(0, size), 0.0)
+
+
+def brute_nearest(boxes, point, k):
+    distances = []
+    for handle, (x0, y0, x1, y1) in boxes.items():
+        dx = max(x0 - point[0], 0.0, point[0] - x1)
+        dy = max(y0 - point[1], 0.0, point[1] - y1)
+        distances.append((sqrt(dx * dx + dy * dy), handle))
+    return [distance for distance, _ in sorted(distances)[:k]]
+
+
+def timed(title, function, repeat=1):
+    start = perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (perf_counter() - start) / repeat
+    print("{:<22}{:>10.3f} ms".format(title, elapsed * 1000))
+    return result
+
+
+def main(count=1000000):
+    random.seed(1)
+    items = list(synthetic_boxes(count))
+    index = GridIndex()
+    print("boxes:                {}".format(count))
+    timed("bulk load", lambda: index.bulk_load(items))
+    print("cell size:            {:.1f}".format(index.cell_size))
+    found = timed("crossing 1000x1000", lambda: index.crossing((5000, 5000), (6000, 6000)), 100)
+    timed("window 1000x1000", lambda: index.window((5000, 5000), (6000, 6000)), 100)
+    timed("at point", lambda: index.at_point((5000, 5000)), 1000)
+    nearest = timed("nearest k=10", lambda: index.nearest((5000, 5000), 10), 1000)
+    timed("insert + remove", lambda: (index.insert("new", (1, 1), (2, 2)), index.remove("new")), 1000)
+    boxes = {handle: index.box(handle) for handle in index._boxes}
+    expected = [handle for handle, (x0, y0, x1, y1) in boxes.items()
+                if x0 <= 6000 and x1 >= 5000 and y0 <= 6000 and y1 >= 5000]
+    assert sorted(found) == sorted(expected)
+    assert [distance for _, distance in nearest] == brute_nearest(boxes, (5000, 5000), 10)
+    print("checked against brute force: ok")
+    check_reload()
+
+
+def check_reload():
+    """
+    bulk_load() of indexed handles moves them, boxes with min greater than max are rejected
+    """
+    index = GridIndex(cell_size=10.0)
+    index.bulk_load([("A", (0, 0), (5, 5)), ("B", (100, 100), (105, 105))])
+    index.bulk_load([("A", (200, 200), (205, 205))])
+    assert index.crossing((0, 0), (10, 10)) == [] and index.crossing((190, 190), (210, 210)) == ["A"]
+    index.remove("A")
+    assert index.crossing((-1000, -1000), (1000, 1000)) == ["B"]
+    try:
+        index.bulk_load([("C", (10, 10), (0, 0))])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bulk_load() accepted min point greater than max point")
+    assert "C" not in index
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,108 @@
+"""
+    pyacadcom.transform: vectorized transformation of points against AcadPoint arithmetic,
+    batch TransformBy of entities against Move + Rotate + ScaleEntity calls on fake AutoCAD backend
+
+    usage: python benchmarks/bench_transform.py [points, 10^6 by default] [entities]
+"""
+
+import math
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+import numpy as np
+
+from pyacadcom import api
+from pyacadcom.datatype import AcadPoint, AcadPointArray, convertcoordinates, set_variant_factory
+from pyacadcom.fake import FakeAutoCAD, Faults, populate
+from pyacadcom.transform import apply, compose, matrix_variant, rotation, scaling, transform_many, translation
+
+BASE = (100.0, 50.0, 0.0)
+ANGLE = math.pi / 6
+FACTOR = 1.5
+OFFSET = (250.0, -40.0, 0.0)
+MATRIX = compose(rotation(ANGLE, base=BASE), scaling(FACTOR, base=BASE), translation(OFFSET))
+
+
+def check_reference():
+    point = apply(MATRIX, np.array([[BASE[0] + 10, BASE[1], 0.0]]))[0]
+    expected = (BASE[0] + OFFSET[0] + 15 * math.cos(ANGLE), BASE[1] + OFFSET[1] + 15 * math.sin(ANGLE), 0.0)
+    assert np.allclose(point, expected), (point, expected)
+    assert np.allclose(apply(rotation(math.pi / 2, axis=(1, 0, 0)), [(0, 1, 0)]), [(0, 0, 1)])
+    flat = apply(MATRIX, (BASE[0] + 10, BASE[1]), dim=2)
+    assert flat.shape == (2,) and np.allclose(flat, expected[:2])
+    # matrix is converted to 4x4 array by variant factory of pyacadcom.datatype
+    set_variant_factory(tuple)
+    try:
+        assert matrix_variant(MATRIX) == tuple(map(tuple, MATRIX.tolist()))
+    finally:
+        set_variant_factory()
+
+
+def python_transform(points):
+    # point by point with AcadPoint arithmetic
+    c, s = math.cos(ANGLE), math.sin(ANGLE)
+    base = AcadPoint(BASE)
+    offset = AcadPoint(OFFSET)
+    result = []
+    for point in points:
+        relative = point - base
+        rotated = AcadPoint(relative.x * c - relative.y * s, relative.x * s + relative.y * c, relative.z)
+        result.append(rotated * FACTOR + base + offset)
+    return result
+
+
+def points_benchmark(count):
+    data = np.random.default_rng(1).uniform(-1e4, 1e4, (count, 3))
+    array = AcadPointArray(data)
+    points = array.to_points()
+    start = perf_counter()
+    reference = python_transform(points)
+    python_time = perf_counter() - start
+    start = perf_counter()
+    result = apply(MATRIX, array)
+    numpy_time = perf_counter() - start
+    assert np.allclose(result.array, AcadPointArray(reference).array)
+    print("{} points:".format(count))
+    print("  {:<28}{:10.3f} s".format("AcadPoint arithmetic", python_time))
+    print("  {:<28}{:10.3f} s {:8.0f}x".format("transform.apply", numpy_time, python_time / numpy_time))
+
+
+def entities_benchmark(count, latency=20e-6):
+    print("{} entities, {:.0f} us per COM call:".format(count, latency * 1e6))
+    geometry = []
+    for name in ("Move + Rotate + ScaleEntity", "transform_many"):
+        faults = Faults(latency=latency)
+        app = api.COMRetryObjectWrapper(FakeAutoCAD(faults))
+        space = app.ActiveDocument.ModelSpace
+        populate(space, count, kinds=("line", "polyline", "arc", "mline", "circle", "text"), seed=1)
+        calls = faults.calls
+        start = perf_counter()
+        if name == "transform_many":
+            result = transform_many(space, MATRIX)
+            assert result.calls == count and result.matrices == 1
+        else:
+            base = convertcoordinates(*BASE)
+            origin = convertcoordinates(0.0, 0.0, 0.0)
+            offset = convertcoordinates(*OFFSET)
+            for entity in space:
+                entity.Rotate(base, ANGLE)
+                entity.ScaleEntity(base, FACTOR)
+                entity.Move(origin, offset)
+        seconds = perf_counter() - start
+        print("  {:<28}{:10.3f} s {:8d} COM calls".format(name, seconds, faults.calls - calls))
+        geometry.append([entity.GetBoundingBox() for entity in space])
+    assert np.allclose(np.array(geometry[0]), np.array(geometry[1]))
+
+
+if __name__ == "__main__":
+    check_reference()
+    points_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
+    entities_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
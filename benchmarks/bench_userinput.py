@@ -0,0 +1,103 @@
+"""
+    userinput with input providers: the same command run with live COM input on fake AutoCAD backend
+    and headless with ScriptedInput (list and file), results are compared
+
+    usage: python benchmarks/bench_userinput.py [runs]
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pywintypes import com_error
+
+from pyacadcom import api
+from pyacadcom.fake import FakeAutoCAD, Faults, feed, pick, populate
+from pyacadcom.userinput import (CANCEL, CANCEL_LINE, ScriptedInput, dist, get_keyword, get_obj, input_provider,
+                                 text_input)
+
+_KEYWORD = -2145320928
+
+
+def measure(app, provider=None):
+    code, count = text_input(app, "int", "Count", provider=provider)
+    _, mode = get_keyword(app, "Mode", {"fast": "Fast", "exact": "Exact"}, default="fast", provider=provider)
+    _, length = dist(app, provider=provider)
+    return code, count, mode, round(length, 9)
+
+
+def command(app, provider=None):
+    _, selection = get_obj(app, "line arc", provider=provider)
+    return measure(app, provider) + (len(selection),)
+
+
+def com_run(runs, latency):
+    app = api.COMRetryObjectWrapper(FakeAutoCAD(Faults(latency=latency)))
+    doc = app.ActiveDocument
+    populate(doc.ModelSpace, 20, kinds=("line", "arc", "circle"), seed=1)
+    pick(doc)
+    results = []
+    start = perf_counter()
+    for _ in range(runs):
+        feed(doc, "x", "5", "Exact", (0, 0, 0), (3, 4, 0), (3, 8, 0), com_error(_KEYWORD), "")
+        results.append(command(app))
+    return perf_counter() - start, results
+
+
+def responses(runs, entities):
+    for _ in range(runs):
+        yield from (entities, "x", "5", "Exact", (0, 0), "3,4", (3, 8), "")
+
+
+def scripted_run(runs, entities):
+    start = perf_counter()
+    with input_provider(ScriptedInput(responses(runs, entities))):
+        results = [command(None) for _ in range(runs)]
+    return perf_counter() - start, results
+
+
+def file_run(runs):
+    path = os.path.join(tempfile.mkdtemp(), "answers.txt")
+    with open(path, "w", encoding="utf-8") as file:
+        for _ in range(runs):
+            file.write("x\n5\nExact\n0,0\n3,4\n3,8\n\n")
+    provider = ScriptedInput.from_file(path)
+    start = perf_counter()
+    results = [measure(None, provider) for _ in range(runs)]
+    return perf_counter() - start, results
+
+
+def main(runs, latency=20e-6):
+    app = FakeAutoCAD()
+    populate(app.ActiveDocument.ModelSpace, 20, kinds=("line", "arc", "circle"), seed=1)
+    entities = list(app.ActiveDocument.ModelSpace)
+    com_seconds, expected = com_run(runs, latency)
+    scripted_seconds, results = scripted_run(runs, entities)
+    assert results == expected, (results[0], expected[0])
+    file_seconds, results = file_run(runs)
+    assert results == [result[:4] for result in expected]
+    assert expected[0] == (1, 5, "exact", 9.0, 14)
+    print("{} runs of command (text_input, get_keyword, dist, get_obj):".format(runs))
+    for name, seconds in (("COM input, {:.0f} us latency".format(latency * 1e6), com_seconds),
+                          ("ScriptedInput list", scripted_seconds),
+                          ("ScriptedInput file, no get_obj", file_seconds)):
+        print("  {:<32}{:8.3f} s {:10.1f} us/run".format(name, seconds, seconds / runs * 1e6))
+    assert text_input(None, "str", provider=ScriptedInput([CANCEL])) == (-1, "Esc is pressed")
+    assert dist(None, provider=ScriptedInput([(0, 0)])) == (-2, "Esc is pressed")
+    assert CANCEL_LINE == "*cancel*"
+    # nothing picked with type filter: no choice, as without filter
+    lines_only = ScriptedInput([[entity for entity in entities if entity.ObjectName != "AcDbLine"]])
+    assert get_obj(None, "line", provider=lines_only) == (-1, "No choice")
+    assert lines_only.prompts[-1] == "Ничего не выбрано"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,65 @@
+"""
+    Stand-ins of pywin32 modules (pythoncom, pywintypes, win32com.client) for running benchmarks without Windows
+
+    Installed into sys.modules by install() only if pywin32 can not be imported,
+    COM objects can not be created with them: Dispatch() raises OSError
+"""
+
+import sys
+import types
+
+
+class com_error(Exception):
+    def __init__(self, hresult=0, *args):
+        super().__init__(hresult, *args)
+        self.hresult = hresult
+
+
+class VARIANT:
+    def __init__(self, varianttype, value):
+        self.varianttype = varianttype
+        self.value = value
+
+    def __repr__(self):
+        return "VARIANT({!r}, {!r})".format(self.varianttype, self.value)
+
+
+def _no_com(*args, **kwargs):
+    raise OSError("COM is not available")
+
+
+def install():
+    """
+    Register stand-ins of missing pywin32 modules
+    :return: True if stand-ins are installed, False if pywin32 is available
+    """
+    try:
+        import pythoncom
+        import win32com.client
+        return False
+    except ImportError:
+        pass
+    pythoncom = types.ModuleType("pythoncom")
+    pythoncom.com_error = com_error
+    pythoncom.VT_I2, pythoncom.VT_R8, pythoncom.VT_BSTR, pythoncom.VT_DISPATCH = 2, 5, 8, 9
+    pythoncom.VT_VARIANT, pythoncom.VT_ARRAY, pythoncom.VT_BYREF = 12, 0x2000, 0x4000
+    pythoncom.DISPATCH_METHOD, pythoncom.DISPATCH_PROPERTYGET, pythoncom.DISPATCH_PROPERTYPUT = 1, 2, 4
+    pythoncom.IID_IDispatch = "{00020400-0000-0000-C000-000000000046}"
+    pythoncom.PyIDispatch = type("PyIDispatch", (), {})
+    pythoncom.TypeIIDs = {pythoncom.IID_IDispatch: pythoncom.PyIDispatch}
+    pythoncom.CoInitialize = pythoncom.CoUninitialize = lambda: None
+    pywintypes = types.ModuleType("pywintypes")
+    pywintypes.com_error = com_error
+    win32com = types.ModuleType("win32com")
+    client = types.ModuleType("win32com.client")
+    client.VARIANT = VARIANT
+    for name in ("CDispatch", "CoClassBaseClass", "DispatchBaseClass", "Constants", "EventsProxy"):
+        setattr(client, name, type(name, (), {}))
+    client.Dispatch = client.DispatchEx = client.DispatchWithEvents = client.WithEvents = _no_com
+    dynamic = types.ModuleType("win32com.client.dynamic")
+    dynamic.CDispatch = type("CDispatch", (), {})
+    win32com.client = client
+    client.dynamic = dynamic
+    sys.modules.update({"pythoncom": pythoncom, "pywintypes": pywintypes, "win32com": win32com,
+                        "win32com.client": client, "win32com.client.dynamic": dynamic})
+    return True
@@ -0,0 +1,284 @@
+"""
+    Microbenchmarks of pure Python hot paths: AcadPoint, convertcoordinates, utils.distance/correct_point,
+    tool.distance, triplecoordinates and mlinelength
+
+    Runs on Linux: pywin32 modules are replaced by benchmarks/comstub.py stand-ins if they are missing.
+    Results are saved as JSON and compared with saved baseline, exit code is 1 if any case got slower
+    than threshold allows.
+
+    usage: python benchmarks/microbench.py [--quick] [--filter TEXT] [--output FILE] [--baseline FILE]
+                                           [--threshold 0.2]
+        >>python benchmarks/microbench.py --output baseline.json
+        >>python benchmarks/microbench.py --baseline baseline.json --output current.json
+"""
+
+import argparse
+import array
+import json
+import os
+import platform
+import random
+import sys
+import time
+from timeit import Timer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comstub
+
+comstub.install()
+
+from pyacadcom import tool, utils
+from pyacadcom.datatype import AcadPoint, convertcoordinates, convertpoints
+
+SIZES = (1000, 100000, 1000000)
+QUICK_SIZES = (1000, 10000)
+
+CASES = {}
+
+
+def case(name, sizes=SIZES):
+    """
+    Register benchmark case: function(size) prepares input and returns function processing size items
+    """
+    def register(setup):
+        CASES[name] = (setup, sizes)
+        return setup
+    return register
+
+
+def _triples(size, seed=1):
+    uniform = random.Random(seed).uniform
+    return [(uniform(-1e4, 1e4), uniform(-1e4, 1e4), uniform(-1e3, 1e3)) for _ in range(size)]
+
+
+def _flat(size):
+    return tuple(value for triple in _triples(size) for value in triple)
+
+
+class _Multiline:
+    """
+    Multiline: only Coordinates property is read by mlinelength
+    """
+
+    def __init__(self, coordinates):
+        self.Coordinates = coordinates
+
+
+@case("AcadPoint(x, y, z)")
+def _(size):
+    triples = _triples(size)
+    return lambda: [AcadPoint(x, y, z) for x, y, z in triples]
+
+
+@case("AcadPoint(tuple)")
+def _(size):
+    triples = _triples(size)
+    return lambda: [AcadPoint(triple) for triple in triples]
+
+
+@case("AcadPoint + AcadPoint")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    others = points[1:] + points[:1]
+    return lambda: [a + b for a, b in zip(points, others)]
+
+
+@case("AcadPoint + tuple")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    triples = _triples(size, seed=2)
+    return lambda: [a + b for a, b in zip(points, triples)]
+
+
+@case("AcadPoint * float")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    return lambda: [point * 2.5 for point in points]
+
+
+@case("AcadPoint += AcadPoint")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+
+    def run():
+        total = AcadPoint(0, 0, 0)
+        for point in points:
+            total += point
+        return total
+    return run
+
+
+@case("AcadPoint == AcadPoint")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    others = [AcadPoint(point) for point in points]
+    return lambda: [a == b for a, b in zip(points, others)]
+
+
+@case("AcadPoint()")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    return lambda: [point() for point in points]
+
+
+@case("AcadPoint() after move")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+
+    def run():
+        for point in points:
+            point.x += 1.0
+            point()
+    return run
+
+
+@case("convertpoints(AcadPoint list)")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    return lambda: convertpoints(points)
+
+
+@case("convertpoints(array.array)")
+def _(size):
+    buffer = array.array("d", _flat(size))
+    return lambda: convertpoints(buffer)
+
+
+@case("convertpoints(array.array of ints)")
+def _(size):
+    buffer = array.array("i", (int(value) for value in _flat(size)))
+    # items are converted by value, not reinterpreted as doubles
+    assert list(convertpoints(buffer[:6]).value) == [float(value) for value in buffer[:6]]
+    return lambda: convertpoints(buffer)
+
+
+@case("convertcoordinates(x, y, z)")
+def _(size):
+    triples = _triples(size)
+    return lambda: [convertcoordinates(*triple) for triple in triples]
+
+
+@case("convertcoordinates(*flat)")
+def _(size):
+    flat = _flat(size)
+    return lambda: convertcoordinates(*flat)
+
+
+@case("utils.correct_point")
+def _(size):
+    triples = _triples(size)
+    return lambda: [utils.correct_point(triple) for triple in triples]
+
+
+@case("utils.distance")
+def _(size):
+    triples = _triples(size)
+    others = _triples(size, seed=2)
+    return lambda: [utils.distance(a, b) for a, b in zip(triples, others)]
+
+
+@case("utils.distance(AcadPoint)")
+def _(size):
+    points = [AcadPoint(triple) for triple in _triples(size)]
+    others = [AcadPoint(triple) for triple in _triples(size, seed=2)]
+    return lambda: [utils.distance(a, b) for a, b in zip(points, others)]
+
+
+@case("tool.distance")
+def _(size):
+    triples = _triples(size)
+    others = _triples(size, seed=2)
+    return lambda: [tool.distance(a, b) for a, b in zip(triples, others)]
+
+
+@case("tool.triplecoordinates")
+def _(size):
+    flat = _flat(size)
+    return lambda: tool.triplecoordinates(flat)
+
+
+@case("tool.mlinelength")
+def _(size):
+    multiline = _Multiline(_flat(size))
+    return lambda: tool.mlinelength(multiline)
+
+
+def measure(function, repeat, min_time):
+    """
+    :return: best time of one call in seconds, calls are repeated to take at least min_time
+    """
+    timer = Timer(function)
+    seconds = timer.timeit(1)
+    number = 1 if seconds >= min_time else int(min_time / max(seconds, 1e-9)) + 1
+    return min(timer.timeit(number) / number for _ in range(repeat))
+
+
+def run(sizes, name_filter=None, repeat=3, min_time=0.2):
+    """
+    Run cases
+    :return: {"case[size]": {"case", "size", "seconds": best time of call, "ns_per_item"}}
+    """
+    results = {}
+    for name, (setup, case_sizes) in CASES.items():
+        if name_filter and name_filter.lower() not in name.lower():
+            continue
+        for size in sizes or case_sizes:
+            function = setup(size)
+            seconds = measure(function, repeat, min_time)
+            key = "{}[{}]".format(name, size)
+            results[key] = {"case": name, "size": size, "seconds": seconds, "ns_per_item": seconds / size * 1e9}
+            print("{:<44}{:12.1f} ns/item {:12.4f} s".format(key, seconds / size * 1e9, seconds))
+            del function
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print ratio of current to baseline times
+    :return: list of keys of cases slower than baseline by more than threshold
+    """
+    regressions = []
+    print("\n{:<44}{:>12}{:>12}{:>8}".format("case", "baseline", "current", "ratio"))
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            mark = "  REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            mark = "  faster"
+        print("{:<44}{:10.1f}ns{:10.1f}ns{:8.2f}{}".format(
+            key, old["ns_per_item"], result["ns_per_item"], ratio, mark))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pyacadcom microbenchmarks")
+    parser.add_argument("--quick", action="store_true", help="small sizes and short timing")
+    parser.add_argument("--filter", help="run cases which names contain text")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="compare with results saved before")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 is 20%%")
+    args = parser.parse_args()
+
+    results = run(QUICK_SIZES if args.quick else None, args.filter, repeat=3, min_time=0.05 if args.quick else 0.2)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, file, indent=1)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+        if regressions:
+            print("\n{} case(s) slower than baseline by more than {:.0%}".format(len(regressions), args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
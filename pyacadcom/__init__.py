@@ -10,6 +10,45 @@
 
 __version__ = "0.0.10"
 
-from pyacadcom.api import *
-from pyacadcom.datatype import *
-from pyacadcom.userinput import *
\ No newline at end of file
+from importlib import import_module
+
+# names are imported from submodules on first access (PEP 562), so pywin32 and numpy are imported
+# only by code using them, and AcadPoint, tool, utils and geometry work without pywin32
+_EXPORTS = {
+    "api": ("AutoCAD", "COMRetryObjectWrapper", "COMRetryMethodWrapper", "COMRetryTimeoutError", "RetryPolicy",
+            "MemberCache", "member_cache", "register_wrapped_type", "retry_policy", "set_retry_policy",
+            "BatchEdit", "BatchEditError", "batch_edit", "PropertyCache", "property_cache"),
+    "datatype": ("AcadPoint", "AcadPointArray", "convertcoordinates", "convertmatrix", "convertpoints",
+                 "set_variant_factory"),
+    "userinput": ("text_input", "get_obj", "get_keyword", "dist", "selection_filter", "InputProvider", "COMInput",
+                  "ScriptedInput", "input_provider"),
+}
+# other names of former star imports of userinput and api, they resolve but are not in __all__;
+# unknown names raise AttributeError without importing submodules
+_STAR_EXPORTS = {
+    "userinput": ("double_from_string", "int_from_string", "VT_R8", "VT_ARRAY", "VT_DISPATCH", "VT_BSTR",
+                  "VT_BYREF"),
+    "api": ("Dispatch", "CDispatch", "CoClassBaseClass", "DispatchBaseClass", "Constants", "EventsProxy",
+            "dynCDispatch", "com_error", "MethodType", "sleep"),
+}
+_NAMES = {name: module for exports in (_STAR_EXPORTS, _EXPORTS) for module, names in exports.items()
+          for name in names}
+_SUBMODULES = ("aio", "api", "bulk", "cache", "datatype", "export", "fake", "geometry", "metrics", "pool",
+               "replay", "selection", "snapshot", "spatial", "tool", "transform", "userinput", "utils")
+
+__all__ = sorted(name for names in _EXPORTS.values() for name in names)
+
+
+def __getattr__(name):
+    if name in _NAMES:
+        value = getattr(import_module("." + _NAMES[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = import_module("." + name, __name__)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
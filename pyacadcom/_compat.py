@@ -0,0 +1,24 @@
+"""
+    pyacadcom._compat
+    ******************
+
+    pywin32 names needed by modules which work without pywin32 (fake backend, replay of traces)
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+try:
+    from pywintypes import com_error
+except ImportError:
+    class com_error(Exception):
+        """
+        Stand-in of pywintypes.com_error without pywin32: (hresult, text, excepinfo, argerror)
+        """
+
+        def __init__(self, hresult=0, *args):
+            super().__init__(hresult, *args)
+            self.hresult = hresult
+
+# hresults of busy AutoCAD: RPC_E_CALL_REJECTED, RPC_E_SERVERCALL_RETRYLATER, RPC_E_SERVERCALL_REJECTED
+_ERRORCODES = [-2147418111, -2147417847, -2147417846]
@@ -0,0 +1,304 @@
+"""
+    pyacadcom.aio
+    ******************
+
+    asyncio front-end for AutoCAD: all COM calls run in one single-threaded apartment worker thread
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from time import monotonic
+
+import pythoncom
+
+from .api import AutoCAD, COMRetryObjectWrapper, COMRetryMethodWrapper
+
+
+class COMWorker:
+    """
+    Thread that initializes single-threaded COM apartment, creates root object there and runs submitted jobs
+    one by one. COM objects must be used in this thread only, retry delays of COM wrappers sleep here too.
+
+        >>worker = COMWorker(AutoCAD)
+        >>worker.start()
+        >>worker.submit(lambda: worker.root.ActiveDocument.Name).result()
+        >>worker.stats()
+        {'queue_depth': 0, 'jobs': 1, 'busy_time': 0.02, 'uptime': 1.5, 'utilisation': 0.013}
+        >>worker.stop()
+    """
+
+    def __init__(self, factory=AutoCAD, name="pyacadcom-com-worker"):
+        """
+        :param factory: function creating root object in worker thread, AutoCAD by default
+        :param name: name of thread
+        """
+        self.factory = factory
+        self.root = None
+        self.jobs = 0
+        self.busy_time = 0.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self._ready = threading.Event()
+        self._error = None
+        self._started = None
+        # submit() and stop() are serialized, no job is queued after sentinel of stop()
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def start(self):
+        """
+        Start worker thread and wait for root object to be created
+        """
+        self._started = monotonic()
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self, wait=True):
+        """
+        Stop worker after jobs already submitted, worker which was not started is not changed.
+        Jobs submitted after stop() are rejected
+        """
+        with self._lock:
+            if self._started is None:
+                return
+            if not self._stopping:
+                self._stopping = True
+                self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Run function in worker thread
+        :return: concurrent.futures.Future of function result
+        """
+        future = Future()
+        with self._lock:
+            if self._stopping or not self._thread.is_alive():
+                raise RuntimeError("COM worker is not running")
+            self._queue.put((future, function, args, kwargs))
+        return future
+
+    def stats(self):
+        """
+        :return: {"queue_depth": jobs waiting, "jobs": jobs done, "busy_time": seconds spent in jobs,
+                  "uptime": seconds since start, "utilisation": share of uptime spent in jobs}
+        """
+        uptime = monotonic() - self._started if self._started is not None else 0.0
+        return {"queue_depth": self._queue.qsize(), "jobs": self.jobs, "busy_time": self.busy_time,
+                "uptime": uptime, "utilisation": self.busy_time / uptime if uptime else 0.0}
+
+    def __run(self):
+        pythoncom.CoInitialize()
+        try:
+            try:
+                self.root = self.factory()
+            except BaseException as error:
+                self._error = error
+                return
+            finally:
+                self._ready.set()
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                future, function, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                start = monotonic()
+                try:
+                    result = function(*args, **kwargs)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+                self.busy_time += monotonic() - start
+                self.jobs += 1
+        finally:
+            self.root = None
+            self.__fail_pending()
+            pythoncom.CoUninitialize()
+
+    def __fail_pending(self):
+        """
+        Fail jobs left in queue after worker stopped, so nobody waits for them forever
+        """
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None and job[0].set_running_or_notify_cancel():
+                job[0].set_exception(RuntimeError("COM worker is stopped"))
+
+
+def _is_com(value):
+    return isinstance(value, (COMRetryObjectWrapper, COMRetryMethodWrapper, AutoCAD))
+
+
+class AsyncProxy:
+    """
+    Handle of COM object living in worker thread, members are read and called with await
+        >>doc = await acad.ActiveDocument
+        >>name = await doc.Name
+        >>line = await (await doc.ModelSpace).AddLine(p1(), p2())
+        >>await line.set("Layer", "Walls")
+    """
+
+    __slots__ = ("_worker", "_obj")
+
+    def __init__(self, worker, obj):
+        self._worker = worker
+        self._obj = obj
+
+    def __repr__(self):
+        return "AsyncProxy({})".format(object.__repr__(self._obj))
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _AsyncMember(self, name)
+
+    def set(self, name, value):
+        """
+        Set property of COM object
+        :return: awaitable
+        """
+        return _submit(self._worker, setattr, self._obj, name, value)
+
+
+class _AsyncMember:
+    """
+    Member of COM object: await it to read property or call it to call method
+    """
+
+    __slots__ = ("_proxy", "_name")
+
+    def __init__(self, proxy, name):
+        self._proxy = proxy
+        self._name = name
+
+    def __await__(self):
+        return _submit(self._proxy._worker, getattr, self._proxy._obj, self._name).__await__()
+
+    def __call__(self, *args, **kwargs):
+        return _submit(self._proxy._worker, _call_member, self._proxy._obj, self._name, *args, **kwargs)
+
+
+def _call_member(obj, name, *args, **kwargs):
+    return getattr(obj, name)(*args, **kwargs)
+
+
+def _convert(value, convert):
+    """
+    Apply convert to value and to items of lists, tuples and dicts in it recursively,
+    containers are copied only if some of their items are converted
+    """
+    converted = convert(value)
+    if converted is not value:
+        return converted
+    if isinstance(value, (list, tuple)):
+        items = [_convert(item, convert) for item in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+        # named tuples take items as arguments
+        return type(value)(*items) if hasattr(value, "_fields") else type(value)(items)
+    if isinstance(value, dict):
+        items = {key: _convert(item, convert) for key, item in value.items()}
+        if all(items[key] is item for key, item in value.items()):
+            return value
+        return items
+    return value
+
+
+def _unwrap(value):
+    return value._obj if isinstance(value, AsyncProxy) else value
+
+
+def _submit(worker, function, *args, **kwargs):
+    """
+    Run function in worker, COM objects in arguments and result, also inside lists, tuples and dicts,
+    are passed as AsyncProxy
+    :return: asyncio future
+    """
+    args = [_convert(arg, _unwrap) for arg in args]
+    kwargs = {key: _convert(value, _unwrap) for key, value in kwargs.items()}
+
+    def proxy(value):
+        return AsyncProxy(worker, value) if _is_com(value) else value
+
+    def job():
+        return _convert(function(*args, **kwargs), proxy)
+
+    return asyncio.wrap_future(worker.submit(job))
+
+
+class AsyncAutoCAD:
+    """
+    AutoCAD application for asyncio code: COM latency and retries do not block event loop,
+    so computations, file and network I/O overlap with COM calls
+
+        >>async with AsyncAutoCAD() as acad:
+        >>    doc = await acad.ActiveDocument
+        >>    count = await acad.call(lambda app: app.ActiveDocument.ModelSpace.Count)
+        >>    items = await acad.call(lambda app, space: list(space), await doc.ModelSpace)
+        >>    acad.stats()
+    """
+
+    def __init__(self, factory=AutoCAD):
+        """
+        :param factory: function creating application object in worker thread, AutoCAD by default
+        """
+        self.worker = COMWorker(factory)
+
+    async def start(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.worker.start)
+        return self
+
+    async def stop(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.worker.stop)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def app(self):
+        """
+        AsyncProxy of application object
+        """
+        return AsyncProxy(self.worker, self.worker.root)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.app, name)
+
+    def call(self, function, *args, **kwargs):
+        """
+        Run function(app, *args, **kwargs) in COM worker thread, app is application object,
+        AsyncProxy arguments are passed as COM objects
+            >>name = await acad.call(lambda app: app.ActiveDocument.Name)
+            >>code, lines = await acad.call(get_obj, "line", "Select lines")
+        :return: awaitable of function result
+        """
+        return _submit(self.worker, function, self.app, *args, **kwargs)
+
+    def stats(self):
+        """
+        Queue depth and utilisation of COM worker
+        """
+        return self.worker.stats()
@@ -9,116 +9,736 @@
 """
 
 from win32com.client.dynamic import CDispatch as dynCDispatch
-from win32com.client import Dispatch, CDispatch, CoClassBaseClass, DispatchBaseClass, Constants, EventsProxy
+from win32com.client import Dispatch, DispatchEx, CDispatch, CoClassBaseClass, DispatchBaseClass, Constants, EventsProxy
 from pywintypes import com_error
+from pythoncom import DISPATCH_PROPERTYGET, TypeIIDs, IID_IDispatch
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from random import random
 from types import MethodType
-from time import sleep
+from time import sleep, monotonic
 
-_DELAY = 0.05  # seconds: default delay step incremental
-_TIMEOUT = 15.0  # seconds: default maximum delay
-_ERRORCODES = [-2147418111, -2147417847, -2147417846]
+from . import metrics
+from ._compat import _ERRORCODES
+
+_DELAY = 0.05  # seconds: default delay before first retry
+_TIMEOUT = 15.0  # seconds: default deadline of call with retries
 _TYPES_TO_WRAP = (CDispatch, CoClassBaseClass, DispatchBaseClass, dynCDispatch, Constants, EventsProxy)
+_PYIDISPATCH = TypeIIDs[IID_IDispatch]
 
-class COMRetryMethodWrapper:
+# kinds of resolved COM members stored in member cache
+PROPERTY = "property"
+DISPATCH = "dispatch"
+METHOD = "method"
 
-    def __init__(self, method):
-        self.__method = method
 
-    def __call__(self, *args, **kwargs):
-        delay_time = 0
-        while delay_time <= _TIMEOUT:
+def register_wrapped_type(cls):
+    """
+    Register type which instances are to be wrapped by COMRetryObjectWrapper (e.g. test doubles of COM objects)
+    Can be used as class decorator
+    :param cls: class to wrap
+    :return: cls
+    """
+    global _TYPES_TO_WRAP
+    if cls not in _TYPES_TO_WRAP:
+        _TYPES_TO_WRAP = _TYPES_TO_WRAP + (cls,)
+    return cls
+
+
+class MemberCache:
+    """
+    Bounded LRU cache of resolved COM members keyed by (COM type CLSID, member name)
+    Each entry is (kind, dispid), where kind is PROPERTY, DISPATCH (property returning COM object) or METHOD
+
+        >>member_cache.info()
+        {'hits': 1200, 'misses': 3, 'size': 3, 'maxsize': 4096}
+        >>member_cache.entries()
+        {(IID('{...}'), 'ObjectName'): ('property', 1), ...}
+    maxsize = 0 disables caching
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, kind, dispid):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (kind, dispid)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def entries(self):
+        return dict(self._entries)
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+member_cache = MemberCache()
+
+
+# members returning objects which stay the same until document is switched
+STABLE_MEMBERS = ("ActiveDocument", "Application", "Documents", "Preferences", "Utility", "ModelSpace",
+                  "PaperSpace", "SelectionSets", "Layers", "Blocks")
+# methods after which cached members are invalidated, they open, close or switch documents
+# (Documents.Add creates and activates document; Add of other collections only causes extra reads)
+DOCUMENT_METHODS = ("Activate", "Add", "Close", "Open", "New", "Quit")
+
+_MISSING = object()
+
+
+class PropertyCache:
+    """
+    Opt-in memoization of COM members returning stable objects (ActiveDocument, Utility, ModelSpace...).
+    Cached member is read through COM once, next reads return the same wrapper. Entries are stamped with
+    generation, which is increased by invalidate(), by calls of DOCUMENT_METHODS through wrappers and by
+    application events after connect(). Entries also expire after ttl seconds and are limited by LRU maxsize.
+
+        >>property_cache.enable()                     # STABLE_MEMBERS
+        >>property_cache.enable("Layers", ttl=5.0)
+        >>property_cache.connect(acad)
+        >>property_cache.info()
+        {'hits': 9800, 'misses': 200, 'expired': 0, 'invalidations': 2, 'generation': 2, 'size': 4, 'maxsize': 1024}
+    """
+
+    def __init__(self, members=(), maxsize=1024, ttl=None, invalidating=DOCUMENT_METHODS):
+        """
+        :param members: names of members to cache, nothing is cached by default
+        :param maxsize: maximum number of cached values
+        :param ttl: seconds: lifetime of cached value, None - until invalidation
+        :param invalidating: names of methods invalidating cache when called through wrapper
+        """
+        self.members = frozenset(members)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.invalidating = frozenset(invalidating)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        # (id of COM object, member) -> (COM object, value, generation, expiration time)
+        self._entries = OrderedDict()
+        self._events = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def enable(self, *members, ttl=_MISSING):
+        """
+        Cache members, STABLE_MEMBERS if no names are given
+        :param ttl: seconds: lifetime of cached values, None - until invalidation, unchanged if not given
+        """
+        self.members = self.members | frozenset(members or STABLE_MEMBERS)
+        if ttl is not _MISSING:
+            self.ttl = ttl
+
+    def disable(self, *members):
+        """
+        Stop caching members, all if no names are given
+        """
+        self.members = self.members - frozenset(members) if members else frozenset()
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Make all cached values stale, they are read through COM again
+        """
+        self.generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def get(self, inner, name):
+        """
+        :return: cached value of member of COM object or _MISSING
+        """
+        key = (id(inner), name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            owner, value, generation, expires = entry
+            if owner is inner and generation == self.generation:
+                if expires is None or monotonic() < expires:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                self.expired += 1
+            del self._entries[key]
+        self.misses += 1
+        return _MISSING
+
+    def put(self, inner, name, value, generation=None):
+        """
+        :param generation: generation before value was read, current if None
+        """
+        if self.maxsize <= 0:
+            return
+        if generation is None:
+            generation = self.generation
+        key = (id(inner), name)
+        self._entries[key] = (inner, value, generation, None if self.ttl is None else monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.expired = self.invalidations = 0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "expired": self.expired,
+                "invalidations": self.invalidations, "generation": self.generation,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+    def connect(self, application):
+        """
+        Invalidate cache on events of AutoCAD application: new or opened drawing, window change, quit
+        :param application: AutoCAD object
+        """
+        from win32com.client import WithEvents
+
+        cache = self
+
+        class ApplicationEvents:
+            def OnNewDrawing(self):
+                cache.invalidate()
+
+            def OnEndOpen(self, name):
+                cache.invalidate()
+
+            def OnWindowChanged(self, state):
+                cache.invalidate()
+
+            def OnBeginQuit(self, cancel):
+                cache.invalidate()
+
+        while not isinstance(application, _TYPES_TO_WRAP):
+            application = application._inner
+        self._events = WithEvents(application, ApplicationEvents)
+        return self._events
+
+    def disconnect(self):
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+
+
+property_cache = PropertyCache()
+
+
+def _type_key(inner):
+    """
+    Get CLSID of COM object interface: makepy classes have CLSID attribute,
+    dynamic dispatch keeps it in type information (_olerepr_)
+    :return: CLSID or None if type of object is unknown
+    """
+    clsid = getattr(type(inner), "CLSID", None)
+    if clsid is None:
+        try:
+            clsid = getattr(inner.__dict__.get("_olerepr_"), "clsid", None)
+        except AttributeError:
+            return None
+    return clsid
+
+
+class COMRetryTimeoutError(TimeoutError):
+    """
+    COM call is still rejected by busy AutoCAD after deadline of retry policy
+    """
+
+    def __init__(self, member, attempts, elapsed, error):
+        super().__init__("{} is not completed in {:.2f} s after {} attempts: {!r}".format(
+            member, elapsed, attempts, error))
+        self.member = member
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.error = error
+
+
+class _UnknownMember(AttributeError):
+    """
+    Attribute is missing in object that is not COM dispatch, no reason to retry
+    """
+
+
+class RetryPolicy:
+    """
+    Policy of retrying COM calls rejected by busy AutoCAD
+
+    Delay before n-th retry is initial_delay * multiplier ** n limited by max_delay,
+    jitter randomly shortens every delay by up to its share. Calls are not retried
+    after timeout seconds from the first attempt, COMRetryTimeoutError is raised instead.
+        >>policy = RetryPolicy(timeout=5.0, initial_delay=0.01, max_delay=0.5)
+        >>acad = AutoCAD(retry_policy=policy)                    # application and all its objects
+        >>set_retry_policy(RetryPolicy(timeout=60.0), doc)        # one object and objects got from it
+        >>with retry_policy(RetryPolicy(timeout=120.0)):          # calls in block
+        >>    doc.SaveAs(path)
+    """
+
+    def __init__(self, timeout=_TIMEOUT, initial_delay=_DELAY, max_delay=1.0, multiplier=2.0, jitter=0.5,
+                 hresults=_ERRORCODES, retry_attribute_errors=True):
+        """
+        :param timeout: seconds: deadline of call with all retries
+        :param initial_delay: seconds: delay before first retry
+        :param max_delay: seconds: maximum delay between retries
+        :param multiplier: growth of delay after every retry
+        :param jitter: share of delay (0..1) to be randomly cut off
+        :param hresults: hresults of com_error to be retried, other errors are raised at once
+        :param retry_attribute_errors: retry AttributeError raised by win32com while AutoCAD is busy
+        """
+        if timeout < 0 or initial_delay < 0 or max_delay < 0 or multiplier < 1 or not 0 <= jitter <= 1:
+            raise ValueError("Incorrect retry policy parameters")
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.hresults = frozenset(hresults)
+        self.retry_attribute_errors = retry_attribute_errors
+
+    def __repr__(self):
+        return "RetryPolicy(timeout={}, initial_delay={}, max_delay={}, multiplier={}, jitter={})".format(
+            self.timeout, self.initial_delay, self.max_delay, self.multiplier, self.jitter)
+
+    def delay(self, attempt):
+        """
+        Delay before retry
+        :param attempt: number of failed attempts before, from 0
+        :return: seconds
+        """
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        if self.jitter:
+            delay -= delay * self.jitter * random()
+        return delay
+
+    def call(self, member, function, *args, **kwargs):
+        """
+        Call function retrying it while AutoCAD is busy
+        :param member: name of COM member for error message
+        :param function: function to call
+        :return: function result
+        """
+        measured = metrics._collectors
+        start = monotonic()
+        attempt = 0
+        while True:
             try:
-                i = self.__method(*args, **kwargs)
-                if isinstance(i, _TYPES_TO_WRAP):
-                    return COMRetryObjectWrapper(i)
-                elif type(i) is MethodType:
-                    return COMRetryMethodWrapper(i)
-                else:
-                    return i
+                result = function(*args, **kwargs)
+                if measured:
+                    metrics.record_call(member, monotonic() - start)
+                return result
             except com_error as error:
-                if error.hresult not in _ERRORCODES:
+                if error.hresult not in self.hresults:
+                    if measured:
+                        metrics.record_error(member)
                     raise
-                else:
-                    delay_time += _DELAY
-                    sleep(delay_time)
-            except AttributeError:
-                delay_time += _DELAY
-                sleep(delay_time)
+                last_error = error
+            except _UnknownMember:
+                raise
+            except AttributeError as error:
+                if not self.retry_attribute_errors:
+                    if measured:
+                        metrics.record_error(member)
+                    raise
+                last_error = error
+            attempt += 1
+            elapsed = monotonic() - start
+            if elapsed >= self.timeout:
+                if measured:
+                    metrics.record_timeout()
+                raise COMRetryTimeoutError(member, attempt, elapsed, last_error) from last_error
+            delay = min(self.delay(attempt - 1), self.timeout - elapsed)
+            if measured:
+                metrics.record_retry(last_error, delay)
+            sleep(delay)
+
+
+_default_policy = RetryPolicy()
+_scoped_policy = ContextVar("pyacadcom_retry_policy", default=None)
+
+
+def _policy(own):
+    """
+    Get effective retry policy: block scoped, then object's own, then default
+    """
+    return _scoped_policy.get() or own or _default_policy
+
+
+def set_retry_policy(policy, obj=None):
+    """
+    Set retry policy of wrapped COM object and objects got from it or default policy
+    :param policy: RetryPolicy object, None resets object policy to default
+    :param obj: AutoCAD or COMRetryObjectWrapper object, None to set default policy
+    """
+    global _default_policy
+    if obj is None:
+        _default_policy = policy or RetryPolicy()
+    elif isinstance(obj, AutoCAD):
+        set_retry_policy(policy, obj._inner)
+    elif isinstance(obj, (COMRetryObjectWrapper, COMRetryMethodWrapper)):
+        object.__setattr__(obj, "_policy", policy)
+    else:
+        raise TypeError("Retry policy can be set to AutoCAD, COMRetryObjectWrapper or COMRetryMethodWrapper only")
+
+
+@contextmanager
+def retry_policy(policy):
+    """
+    Context manager to use retry policy for all COM calls in block
+        >>with retry_policy(RetryPolicy(timeout=1.0)):
+        >>    acad.ActiveDocument.Regen(1)
+    """
+    token = _scoped_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _scoped_policy.reset(token)
+
+
+class BatchEditError(RuntimeError):
+    """
+    Property write failed while batch of edits was flushed, writes of following chunks were not issued
+    """
+
+    def __init__(self, failures, unapplied):
+        entity, name, error = failures[0]
+        super().__init__("{}.{} write failed: {!r}, {} writes are not applied".format(
+            entity, name, error, unapplied))
+        self.failures = failures
+        self.unapplied = unapplied
+
+
+# values of properties which can be compared with written value without COM call
+_PLAIN_TYPES = (str, int, float, bool)
+
+
+class BatchEdit:
+    """
+    Property writes of COM objects collected by batch_edit() and issued when block exits:
+    later write of the same property replaces earlier one, write of value equal to the value read
+    or written before in the same batch is dropped. Reading property with pending write returns pending value.
+    Writes are issued in chunks of objects, failed write skips other writes of its object.
+    """
+
+    def __init__(self, chunk_size=1000, stop_on_error=True, progress=None):
+        """
+        :param chunk_size: number of objects in chunk of flush, progress and errors are checked after every chunk
+        :param stop_on_error: True - finish chunk with failed write, then stop and raise BatchEditError,
+                              False - continue with next chunks, failures are in .failures
+        :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.stop_on_error = stop_on_error
+        self.progress = progress
+        self.failures = []
+        self.writes = 0
+        self.dropped = 0
+        self.issued = 0
+        # id of COM object -> (wrapper, {property: value}) in order of first write
+        self._pending = {}
+        # (id of COM object, property) -> current value, objects are kept alive so that ids are not reused
+        self._known = {}
+        self._objects = {}
+
+    def __repr__(self):
+        return "BatchEdit(writes={}, dropped={}, issued={}, failed={}, pending={})".format(
+            self.writes, self.dropped, self.issued, len(self.failures), self.pending)
+
+    @property
+    def pending(self):
+        """
+        Number of writes waiting for flush
+        """
+        return sum(len(values) for _, values in self._pending.values())
+
+    def stats(self):
+        return {"writes": self.writes, "dropped": self.dropped, "issued": self.issued,
+                "failed": len(self.failures), "pending": self.pending}
+
+    def set(self, wrapper, name, value):
+        """
+        Collect write of property
+        """
+        self.writes += 1
+        inner = wrapper._inner
+        key = id(inner)
+        entry = self._pending.get(key)
+        if entry is not None and name in entry[1]:
+            # earlier write is replaced in its place
+            self.dropped += 1
+            entry[1][name] = value
+        elif self.__known(key, name, value):
+            self.dropped += 1
+            return
+        else:
+            if entry is None:
+                entry = self._pending[key] = (wrapper, {})
+                self._objects[key] = inner
+            entry[1][name] = value
+        if self.__known(key, name, value):
+            # object is back to its current value
+            del entry[1][name]
+            self.dropped += 1
+
+    def __known(self, key, name, value):
+        if type(value) not in _PLAIN_TYPES:
+            return False
+        known = self._known.get((key, name), self)
+        return known is not self and type(known) is type(value) and known == value
+
+    def lookup(self, wrapper, name):
+        """
+        :return: (True, pending value) or (False, None) if property has no pending write
+        """
+        entry = self._pending.get(id(wrapper._inner))
+        if entry is not None and name in entry[1]:
+            return True, entry[1][name]
+        return False, None
+
+    def seen(self, wrapper, name, value):
+        """
+        Remember value of property read in batch
+        """
+        if type(value) in _PLAIN_TYPES:
+            key = id(wrapper._inner)
+            self._objects[key] = wrapper._inner
+            self._known[(key, name)] = value
+
+    def discard(self):
+        """
+        Drop pending writes
+        """
+        self._pending = {}
+
+    def flush(self):
+        """
+        Issue pending writes in order, objects one by one in chunks of chunk_size objects
+        :raises BatchEditError: write failed and stop_on_error is True, raised after chunk with failed write
+        """
+        entries = list(self._pending.items())
+        self._pending = {}
+        failed = len(self.failures)
+        start = monotonic()
+        for offset in range(0, len(entries), self.chunk_size):
+            chunk = entries[offset:offset + self.chunk_size]
+            skipped = sum(self.__issue(key, wrapper, values) for key, (wrapper, values) in chunk)
+            done = offset + len(chunk)
+            if self.progress is not None:
+                self.progress(done, monotonic() - start)
+            if self.stop_on_error and len(self.failures) > failed:
+                unapplied = sum(len(values) for _, (_, values) in entries[done:])
+                raise BatchEditError(self.failures[failed:], skipped + unapplied)
+
+    def __issue(self, key, wrapper, values):
+        """
+        Write properties of object until first failure
+        :return: number of writes not applied
+        """
+        policy = _policy(wrapper._policy)
+        for number, (name, value) in enumerate(values.items()):
+            try:
+                policy.call(name, setattr, wrapper._inner, name, value)
+            except Exception as error:
+                self.failures.append((wrapper, name, error))
+                self._known.pop((key, name), None)
+                return len(values) - number
+            self.issued += 1
+            self._known[(key, name)] = value
+        return 0
+
+
+_batch = ContextVar("pyacadcom_batch_edit", default=None)
+
+
+@contextmanager
+def batch_edit(chunk_size=1000, stop_on_error=True, progress=None):
+    """
+    Context manager to collect property writes of COM objects in block and issue them when block exits.
+    Repeated writes and writes of values already read or written in block are dropped.
+    Writes are discarded if block raises exception.
+        >>with batch_edit() as batch:
+        >>    for entity in selset:
+        >>        if entity.ObjectName == "AcDbText":
+        >>            entity.Layer = "Text"
+        >>        entity.Color = 256
+        >>batch.stats()
+        {'writes': 20000, 'dropped': 3120, 'issued': 16880, 'failed': 0, 'pending': 0}
+    :param chunk_size: number of objects in chunk of flush, progress and errors are checked after every chunk
+    :param stop_on_error: True - finish chunk with failed write, then stop and raise BatchEditError,
+                          False - continue with next chunks, failures are in .failures;
+                          other writes of failed object are skipped in both cases
+    :param progress: function called after every chunk of flush with arguments (entities done, seconds elapsed)
+    :return: BatchEdit object
+    """
+    batch = BatchEdit(chunk_size, stop_on_error, progress)
+    token = _batch.set(batch)
+    try:
+        yield batch
+    except BaseException:
+        batch.discard()
+        raise
+    finally:
+        _batch.reset(token)
+    batch.flush()
+
+
+def _wrap(value, policy=None):
+    """
+    Wrap COM objects and methods to retry their calls
+    """
+    if isinstance(value, _TYPES_TO_WRAP):
+        return COMRetryObjectWrapper(value, policy)
+    elif type(value) is MethodType:
+        return COMRetryMethodWrapper(value, policy)
+    return value
+
+
+class COMRetryMethodWrapper:
+
+    def __init__(self, method, policy=None):
+        self.__method = method
+        self._policy = policy
+
+    def __call__(self, *args, **kwargs):
+        name = self.__method.__name__
+        try:
+            return _policy(self._policy).call(name, self.__call, args, kwargs)
+        finally:
+            if name in property_cache.invalidating and property_cache.members:
+                property_cache.invalidate()
+
+    def __call(self, args, kwargs):
+        return _wrap(self.__method(*args, **kwargs), self._policy)
 
 
 class COMRetryObjectWrapper:
-    def __init__(self, inner):
+    def __init__(self, inner, policy=None):
         object.__setattr__(self, "_inner", inner)
+        object.__setattr__(self, "_typekey", _type_key(inner))
+        object.__setattr__(self, "_policy", policy)
 
     def __repr__(self):
         return repr(self._inner)
 
     def __setattr__(self, key, value):
-        delay_time = 0
-        while delay_time <= _TIMEOUT:
-            try:
-                return setattr(self._inner, key, value)
-            except com_error as error:
-                if error.hresult not in _ERRORCODES:
-                    raise
-                else:
-                    delay_time += _DELAY
-                    sleep(delay_time)
-            except AttributeError:
-                delay_time += _DELAY
-                sleep(delay_time)
+        if key in property_cache.members:
+            # e.g. ActiveDocument is set to switch document
+            property_cache.invalidate()
+        batch = _batch.get()
+        if batch is not None:
+            return batch.set(self, key, value)
+        return _policy(self._policy).call(key, setattr, self._inner, key, value)
 
     def __getattr__(self, item):
-        delay_time = 0
-        while delay_time <= _TIMEOUT:
+        if item in property_cache.members:
+            value = property_cache.get(self._inner, item)
+            if value is _MISSING:
+                # value read during invalidation is stored as stale
+                generation = property_cache.generation
+                value = _policy(self._policy).call(item, self.__get, item)
+                property_cache.put(self._inner, item, value, generation)
+            return value
+        batch = _batch.get()
+        if batch is None:
+            return _policy(self._policy).call(item, self.__get, item)
+        found, value = batch.lookup(self, item)
+        if not found:
+            value = _policy(self._policy).call(item, self.__get, item)
+            batch.seen(self, item, value)
+        return value
+
+    def __get(self, item):
+        if self._typekey is not None:
+            entry = member_cache.get((self._typekey, item))
+            if entry is not None:
+                return self.__get_resolved(item, entry)
+        try:
+            i = getattr(self._inner, item)
+        except AttributeError:
             try:
-                i = getattr(self._inner, item)
-                if isinstance(i, _TYPES_TO_WRAP):
-                    return COMRetryObjectWrapper(i)
-                elif type(i) is MethodType:
-                    return COMRetryMethodWrapper(i)
-                else:
-                    return i
-            except com_error as error:
-                if error.hresult not in _ERRORCODES:
-                    raise
-                else:
-                    delay_time += _DELAY
-                    sleep(delay_time)
+                oleobj = self._inner._oleobj_
             except AttributeError:
-                try:
-                    self._oleobj_.GetIDsOfNames(0, item)
-                except com_error as error:
-                    if error.hresult == -2147352570:
-                        raise
-                delay_time += _DELAY
-                sleep(delay_time)
-
-    def __call__(self, *args, **kwargs):
-        delay_time = 0
-        while delay_time <= _TIMEOUT:
+                raise _UnknownMember(item) from None
             try:
-                i = self._inner(*args, **kwargs)
-                if isinstance(i, _TYPES_TO_WRAP):
-                    return COMRetryObjectWrapper(i)
-                elif type(i) is MethodType:
-                    return COMRetryMethodWrapper(i)
-                else:
-                    return i
+                oleobj.GetIDsOfNames(0, item)
             except com_error as error:
-                if error.hresult not in _ERRORCODES:
+                # name unknown to COM object can not appear after retry
+                if error.hresult == -2147352570:
                     raise
-                else:
-                    delay_time += _DELAY
-                    sleep(delay_time)
-            except AttributeError:
-                delay_time += _DELAY
-                sleep(delay_time)
+            raise
+        if isinstance(i, _TYPES_TO_WRAP):
+            self.__resolved(item, DISPATCH)
+            return COMRetryObjectWrapper(i, self._policy)
+        elif type(i) is MethodType:
+            self.__resolved(item, METHOD)
+            return COMRetryMethodWrapper(i, self._policy)
+        else:
+            self.__resolved(item, PROPERTY)
+            return i
+
+    def __resolved(self, item, kind):
+        """
+        Store kind and DISPID of resolved member in member cache,
+        python attributes of win32com classes (_oleobj_, _FlagAsMethod...) are not cached
+        """
+        if self._typekey is None or member_cache.maxsize <= 0 or item.startswith("_"):
+            return
+        try:
+            dispid = self._inner._oleobj_.GetIDsOfNames(0, item)
+        except (com_error, AttributeError):
+            return
+        member_cache.put((self._typekey, item), kind, dispid)
+
+    def __get_resolved(self, item, entry):
+        """
+        Get member value by its cached kind and DISPID
+        """
+        kind, dispid = entry
+        if kind == METHOD:
+            return COMRetryMethodWrapper(getattr(self._inner, item), self._policy)
+        value = self._inner._oleobj_.Invoke(dispid, 0, DISPATCH_PROPERTYGET, 1)
+        if kind == PROPERTY and type(value) is not _PYIDISPATCH:
+            return value
+        if value is None:
+            return None
+        if kind == PROPERTY:
+            # property of VARIANT type returned COM object first time
+            member_cache.put((self._typekey, item), DISPATCH, dispid)
+        return COMRetryObjectWrapper(self._inner._get_good_object_(value), self._policy)
+
+    def __call__(self, *args, **kwargs):
+        return _policy(self._policy).call("__call__", self.__call, args, kwargs)
+
+    def __call(self, args, kwargs):
+        return _wrap(self._inner(*args, **kwargs), self._policy)
 
     def __iter__(self):
         for i in self._inner:
             if isinstance(i, _TYPES_TO_WRAP):
-                yield COMRetryObjectWrapper(i)
+                yield COMRetryObjectWrapper(i, self._policy)
             else:
                 yield i
 
@@ -127,12 +747,15 @@ class AutoCAD:
     """
     Class that represent AutoCAD program via COM
     """
-    def __init__(self, Visible=True):
+    def __init__(self, Visible=True, retry_policy=None, new_instance=False):
         """
         Initiation of AutoCAD application
         :param Visible: States if AutoCAD application to be visible, visible by default
+        :param retry_policy: RetryPolicy of all COM calls of application, default policy if None
+        :param new_instance: start new AutoCAD process instead of attaching to running one
         """
-        object.__setattr__(self, "_inner", COMRetryObjectWrapper(Dispatch("AutoCAD.Application")))
+        dispatch = DispatchEx if new_instance else Dispatch
+        object.__setattr__(self, "_inner", COMRetryObjectWrapper(dispatch("AutoCAD.Application"), retry_policy))
         if Visible:
             self._inner.Visible = True
 
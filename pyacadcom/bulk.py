@@ -0,0 +1,253 @@
+"""
+    pyacadcom.bulk
+    ******************
+
+    Bulk creation of entities from packed coordinate arrays
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import os
+import tempfile
+from itertools import islice
+from time import monotonic
+
+from .datatype import convertcoordinates, convertpoints
+
+
+class BulkResult:
+    """
+    Result of add_many(): created entities (empty list for DXF import), number of entities,
+    number of COM calls and time spent
+    """
+
+    def __init__(self, entities, count, calls, elapsed):
+        self.entities = entities
+        self.count = count
+        self.calls = calls
+        self.elapsed = elapsed
+
+    @property
+    def rate(self):
+        """
+        Throughput in entities per second
+        """
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return "BulkResult(count={}, calls={}, elapsed={:.3f}, rate={:.0f})".format(
+            self.count, self.calls, self.elapsed, self.rate)
+
+
+def _flatten(row):
+    for item in row:
+        if isinstance(item, (int, float)):
+            yield item
+        else:
+            yield from item
+
+
+def pack(data, width):
+    """
+    Convert packed coordinates to rows of floats
+        >>pack((0, 0, 0, 10, 0, 0, 10, 0, 0, 10, 10, 0), 6)
+        [[0.0, 0.0, 0.0, 10.0, 0.0, 0.0], [10.0, 0.0, 0.0, 10.0, 10.0, 0.0]]
+        >>pack([((0, 0, 0), (10, 0, 0))], 6)
+        [[0.0, 0.0, 0.0, 10.0, 0.0, 0.0]]
+    :param data: flat sequence of numbers, sequence of rows (rows can consist of points), or numpy array
+    :param width: number of values in row
+    :return: list of rows
+    """
+    if hasattr(data, "reshape"):
+        return data.reshape(-1, width).astype(float).tolist()
+    data = list(data)
+    if data and isinstance(data[0], (int, float)):
+        if len(data) % width:
+            raise ValueError("packed data length must be a multiple of {}".format(width))
+        return [[float(value) for value in data[i:i + width]] for i in range(0, len(data), width)]
+    rows = [[float(value) for value in _flatten(row)] for row in data]
+    if any(len(row) != width for row in rows):
+        raise ValueError("every row must have {} values".format(width))
+    return rows
+
+
+def merge_segments(segments, tolerance=1e-9):
+    """
+    Join consecutive segments (end of one is start of next, all in one XY plane) into polylines
+    :param segments: rows [x1, y1, z1, x2, y2, z2]
+    :param tolerance: distance to consider points equal
+    :return: (single segments, polylines), polyline is (flat 2D coordinates, elevation)
+    """
+    lines = []
+    polylines = []
+    chain = []
+
+    def flush():
+        if len(chain) == 1:
+            lines.append(chain[0])
+        elif chain:
+            coordinates = chain[0][:2]
+            for segment in chain:
+                coordinates += segment[3:5]
+            polylines.append((coordinates, chain[0][2]))
+        del chain[:]
+
+    for segment in segments:
+        if chain:
+            last = chain[-1]
+            if (abs(last[3] - segment[0]) <= tolerance and abs(last[4] - segment[1]) <= tolerance
+                    and abs(segment[2] - last[2]) <= tolerance and abs(segment[5] - last[2]) <= tolerance):
+                chain.append(segment)
+                continue
+            flush()
+        if abs(segment[2] - segment[5]) <= tolerance:
+            chain.append(segment)
+        else:
+            lines.append(segment)
+    flush()
+    return lines, polylines
+
+
+def _jobs(lines, polylines, circles, texts, merge_lines, close_polylines):
+    """
+    Generate (number of entities, method name, arguments, properties to set) for every COM call
+    :param lines: rows of lines packed by pack() or None
+    :param circles: rows of circles packed by pack() or None
+    """
+    if lines is not None:
+        segments = lines
+        merged = []
+        if merge_lines:
+            segments, merged = merge_segments(segments)
+        for segment in segments:
+            yield 1, "AddLine", (convertcoordinates(*segment[:3]), convertcoordinates(*segment[3:])), None
+        for coordinates, elevation in merged:
+            yield len(coordinates) // 2 - 1, "AddLightWeightPolyline", (convertcoordinates(*coordinates),), \
+                {"Elevation": elevation} if elevation else None
+    for coordinates in polylines or ():
+        yield 1, "AddLightWeightPolyline", (convertpoints(pack(coordinates, 2), dim=2),), \
+            {"Closed": True} if close_polylines else None
+    if circles is not None:
+        for x, y, z, radius in circles:
+            yield 1, "AddCircle", (convertcoordinates(x, y, z), radius), None
+    for text, point, height in texts or ():
+        yield 1, "AddText", (text, convertcoordinates(*(float(value) for value in point)), height), None
+
+
+def add_many(space, lines=None, polylines=None, circles=None, texts=None, merge_lines=False,
+             close_polylines=False, layer=None, chunk_size=1000, progress=None, dxf_threshold=None):
+    """
+    Create many entities in ModelSpace, PaperSpace or block
+        >>result = add_many(acad.ActiveDocument.ModelSpace, lines=numpy_array_n_by_6, merge_lines=True)
+        >>result.rate
+    :param space: ModelSpace, PaperSpace or Block object
+    :param lines: lines as packed (x1,y1,z1,x2,y2,z2) rows: flat sequence, (N, 6) array or pairs of points
+    :param polylines: iterable of lightweight polylines as flat (x1,y1,x2,y2,...) coordinates or (N, 2) arrays
+    :param circles: circles as packed (x,y,z,radius) rows
+    :param texts: iterable of (text, insertion point, height)
+    :param merge_lines: join consecutive lines into lightweight polylines, every merged line is counted as entity
+    :param close_polylines: make polylines closed
+    :param layer: layer of new entities, current layer if None
+    :param chunk_size: number of COM calls between progress reports
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :param dxf_threshold: import entities from generated DXF file if there are more entities than threshold
+    :return: BulkResult object
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    start = monotonic()
+    # generators can be read only once, so rows are packed before counting and creating entities
+    lines = pack(lines, 6) if lines is not None else None
+    circles = pack(circles, 4) if circles is not None else None
+    polylines = list(polylines or ())
+    texts = list(texts or ())
+    if dxf_threshold is not None:
+        total = len(polylines) + len(texts) + len(lines or ()) + len(circles or ())
+        if total > dxf_threshold:
+            import_dxf(space.Document, dxf_text(lines, polylines, circles, texts, close_polylines, layer or "0"))
+            if progress is not None:
+                progress(total, monotonic() - start)
+            return BulkResult([], total, 1, monotonic() - start)
+    # VARIANTs are created chunk by chunk
+    jobs = _jobs(lines, polylines, circles, texts, merge_lines, close_polylines)
+    entities = []
+    calls = 0
+    done = 0
+    while True:
+        chunk = list(islice(jobs, chunk_size))
+        if not chunk:
+            break
+        for count, method, args, properties in chunk:
+            entity = getattr(space, method)(*args)
+            calls += 1
+            if properties:
+                for name, value in properties.items():
+                    setattr(entity, name, value)
+                    calls += 1
+            if layer is not None:
+                entity.Layer = layer
+                calls += 1
+            entities.append(entity)
+            done += count
+        if progress is not None:
+            progress(done, monotonic() - start)
+    return BulkResult(entities, done, calls, monotonic() - start)
+
+
+def _dxf_string(value):
+    """
+    Make text value of one DXF line: line breaks would end value and break group code pairs after it
+    """
+    return " ".join(str(value).splitlines())
+
+
+def dxf_text(lines=None, polylines=None, circles=None, texts=None, close_polylines=False, layer="0"):
+    """
+    Generate DXF (R12 ENTITIES section) with entities, line breaks in texts are replaced by spaces
+    :return: DXF file content
+    """
+    out = ["0", "SECTION", "2", "ENTITIES"]
+
+    def point(code, values):
+        for offset, value in enumerate(values):
+            out.extend((str(code + offset * 10), repr(float(value))))
+
+    if lines is not None:
+        for row in pack(lines, 6):
+            out.extend(("0", "LINE", "8", layer))
+            point(10, row[:3])
+            point(11, row[3:])
+    for coordinates in polylines or ():
+        out.extend(("0", "POLYLINE", "8", layer, "66", "1", "70", "1" if close_polylines else "0"))
+        point(10, (0.0, 0.0, 0.0))
+        for x, y in pack(coordinates, 2):
+            out.extend(("0", "VERTEX", "8", layer))
+            point(10, (x, y))
+        out.extend(("0", "SEQEND", "8", layer))
+    if circles is not None:
+        for x, y, z, radius in pack(circles, 4):
+            out.extend(("0", "CIRCLE", "8", layer))
+            point(10, (x, y, z))
+            out.extend(("40", repr(float(radius))))
+    for text, insertion, height in texts or ():
+        out.extend(("0", "TEXT", "8", layer))
+        point(10, insertion)
+        out.extend(("40", repr(float(height)), "1", _dxf_string(text)))
+    out.extend(("0", "ENDSEC", "0", "EOF"))
+    return "\n".join(out) + "\n"
+
+
+def import_dxf(document, text):
+    """
+    Import DXF content into document through temporary file
+    :param document: AutoCAD document
+    :param text: DXF content
+    """
+    handle, path = tempfile.mkstemp(suffix=".dxf")
+    try:
+        with os.fdopen(handle, "w") as file:
+            file.write(text)
+        document.Import(path, convertcoordinates(0.0, 0.0, 0.0), 1.0)
+    finally:
+        os.remove(path)
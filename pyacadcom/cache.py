@@ -0,0 +1,290 @@
+"""
+    pyacadcom.cache
+    ******************
+
+    Entity cache kept up to date by AutoCAD document events
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from collections import namedtuple, Counter
+
+from pywintypes import com_error
+
+from .tool import entity_geometry
+
+EntityRecord = namedtuple("EntityRecord", "handle object_id object_name layer min_point max_point geometry")
+
+
+def read_entity(entity, object_name=None):
+    """
+    Read entity record: type, layer, bounding box and geometry data for pyacadcom.geometry
+    :param entity: AutoCAD entity
+    :param object_name: ObjectName of entity if it is already read
+    :return: EntityRecord object
+    """
+    if object_name is None:
+        object_name = entity.ObjectName
+    try:
+        min_point, max_point = entity.GetBoundingBox()
+    except com_error:
+        # entities without extents: empty text, rays, xlines
+        min_point = max_point = None
+    return EntityRecord(entity.Handle, entity.ObjectID, object_name, entity.Layer, min_point, max_point,
+                        entity_geometry(entity, object_name))
+
+
+class EntityCache:
+    """
+    Cache of entity records by Handle, updated from ObjectAdded/ObjectModified/ObjectErased events
+    instead of rescanning ModelSpace. Added and modified entities are read on next access only,
+    objects of other owners (layers, dictionaries, entities of blocks) and of other types are skipped then.
+
+        >>cache = EntityCache(types=("AcDbLine", "AcDbPolyline"))
+        >>cache.load(acad.ActiveDocument.ModelSpace)
+        >>cache.connect(acad.ActiveDocument)
+        >>cache.total_length()
+        >>cache.count_by_layer()
+        {'0': 1200, 'Walls': 340}
+        >>cache.stats()
+        {'hits': 10, 'misses': 0, 'invalidations': 3, 'refreshes': 3, 'skipped': 12, 'size': 1540}
+    Events can be simulated by calling on_added(entity), on_modified(entity), on_erased(object_id)
+    """
+
+    def __init__(self, reader=read_entity, types=None, owner_id=None):
+        """
+        :param reader: function of entity and its ObjectName (None if it was not read) returning EntityRecord
+        :param types: ObjectNames of entities to cache, all entities if None
+        :param owner_id: ObjectID of space (ModelSpace) which entities are cached, set by load() and connect(),
+                         objects of all owners are cached if None
+        """
+        self.reader = reader
+        self.types = frozenset(types) if types is not None else None
+        self.owner_id = owner_id
+        self._records = {}
+        self._entities = {}
+        self._dirty = set()
+        # handle -> added object, repeated events of one object are read once
+        self._added = {}
+        self._erased = set()
+        self._handles = {}
+        self._layers = Counter()
+        self._aggregates = {}
+        self._events = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.refreshes = 0
+        self.skipped = 0
+
+    def __len__(self):
+        self.__refresh()
+        return len(self._records)
+
+    def __contains__(self, handle):
+        self.__refresh()
+        return handle in self._records
+
+    def load(self, entities):
+        """
+        Fill cache from entities (ModelSpace, SelectionSet, list), entities are read at once
+        :param entities: ModelSpace or PaperSpace sets owner of cached entities, other iterables keep it
+        """
+        if self.owner_id is None:
+            try:
+                self.owner_id = entities.ObjectID
+            except (AttributeError, com_error):
+                # SelectionSet, list
+                pass
+        for entity in entities:
+            object_name = entity.ObjectName
+            if self.types is None or object_name in self.types:
+                self.__store(self.reader(entity, object_name), entity)
+            else:
+                self.skipped += 1
+
+    def clear(self):
+        self._records.clear()
+        self._entities.clear()
+        self._dirty.clear()
+        self._added.clear()
+        self._erased.clear()
+        self._handles.clear()
+        self._layers.clear()
+        self._aggregates.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations,
+                "refreshes": self.refreshes, "skipped": self.skipped, "size": len(self._records)}
+
+    def __store(self, record, entity):
+        old = self._records.get(record.handle)
+        if old is not None:
+            self._layers[old.layer] -= 1
+            if not self._layers[old.layer]:
+                del self._layers[old.layer]
+        self._records[record.handle] = record
+        self._entities[record.handle] = entity
+        self._handles[record.object_id] = record.handle
+        self._layers[record.layer] += 1
+        self._aggregates.clear()
+
+    def on_added(self, entity):
+        # object can be still open for write in event handler and not an entity of cached space,
+        # it is checked and read later
+        self._added[entity.Handle] = entity
+        self._aggregates.clear()
+
+    def on_modified(self, entity):
+        handle = entity.Handle
+        if handle in self._records:
+            # entity can be still open for write in event handler, it is re-read later
+            self._entities[handle] = entity
+            self._dirty.add(handle)
+            self._aggregates.clear()
+            self.invalidations += 1
+        else:
+            self.on_added(entity)
+
+    def on_erased(self, object_id):
+        handle = self._handles.pop(object_id, None)
+        if handle is None:
+            if self._added:
+                # object can be erased before it is read
+                self._erased.add(object_id)
+            return
+        record = self._records.pop(handle)
+        del self._entities[handle]
+        self._dirty.discard(handle)
+        self._layers[record.layer] -= 1
+        if not self._layers[record.layer]:
+            del self._layers[record.layer]
+        self._aggregates.clear()
+        self.invalidations += 1
+
+    def __accepted(self, entity):
+        """
+        Check if added object is entity of cached space and type
+        :return: ObjectName of entity or None if object is skipped
+        """
+        try:
+            if self.owner_id is not None and entity.OwnerID != self.owner_id:
+                return None
+            object_name = entity.ObjectName
+            if self.types is not None and object_name not in self.types:
+                return None
+            return object_name if entity.ObjectID not in self._erased else None
+        except com_error:
+            # object was erased
+            return None
+
+    def __refresh(self):
+        if self._added:
+            added, self._added = self._added, {}
+            for entity in added.values():
+                object_name = self.__accepted(entity)
+                if object_name is not None:
+                    self.__store(self.reader(entity, object_name), entity)
+                    self.refreshes += 1
+                else:
+                    self.skipped += 1
+            self._erased.clear()
+        for handle in list(self._dirty):
+            self.__store(self.reader(self._entities[handle], None), self._entities[handle])
+            self.refreshes += 1
+        self._dirty.clear()
+
+    def get(self, handle, default=None):
+        """
+        Get entity record by handle
+        :return: EntityRecord or default if entity is not in cache
+        """
+        if self._added:
+            self.__refresh()
+        if handle in self._dirty:
+            self._dirty.discard(handle)
+            self.__store(self.reader(self._entities[handle], None), self._entities[handle])
+            self.refreshes += 1
+        record = self._records.get(handle)
+        if record is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return record
+
+    def records(self):
+        """
+        Get all entity records
+        :return: list of EntityRecord
+        """
+        self.__refresh()
+        return list(self._records.values())
+
+    def count_by_layer(self):
+        """
+        :return: {layer: number of entities}
+        """
+        self.__refresh()
+        self.hits += 1
+        return dict(self._layers)
+
+    def count_by_type(self):
+        """
+        :return: {ObjectName: number of entities}
+        """
+        return self.__aggregate("count_by_type", lambda: dict(Counter(r.object_name for r in self._records.values())))
+
+    def total_length(self, layer=None):
+        """
+        Total length of lines, polylines, mlines and arcs, computed by pyacadcom.geometry (requires numpy)
+        :param layer: count only entities on layer
+        :return: total length
+        """
+        from .geometry import total_length
+        return self.__aggregate(("total_length", layer), lambda: total_length(
+            (record.object_name, record.geometry[1]) for record in self._records.values()
+            if record.geometry is not None and (layer is None or record.layer == layer)))
+
+    def __aggregate(self, key, compute):
+        """
+        Get aggregate value computed once after last change of cache
+        """
+        self.__refresh()
+        if key in self._aggregates:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._aggregates[key] = compute()
+        return self._aggregates[key]
+
+    def connect(self, document):
+        """
+        Subscribe cache to events of AutoCAD document, entities of its ModelSpace are cached
+        if owner is not set by constructor or load()
+        :param document: AutoCAD document (acad.ActiveDocument)
+        """
+        if self.owner_id is None:
+            self.owner_id = document.ModelSpace.ObjectID
+        from win32com.client import WithEvents, Dispatch
+        from .api import COMRetryObjectWrapper
+
+        cache = self
+
+        class DocumentEvents:
+            def OnObjectAdded(self, obj):
+                cache.on_added(COMRetryObjectWrapper(Dispatch(obj)))
+
+            def OnObjectModified(self, obj):
+                cache.on_modified(COMRetryObjectWrapper(Dispatch(obj)))
+
+            def OnObjectErased(self, object_id):
+                cache.on_erased(object_id)
+
+        self._events = WithEvents(getattr(document, "_inner", document), DocumentEvents)
+        return self._events
+
+    def disconnect(self):
+        if self._events is not None:
+            self._events.close()
+            self._events = None
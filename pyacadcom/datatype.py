@@ -8,9 +8,53 @@
     :licence: BSD
 """
 
-import win32com.client
 import operator
-from pythoncom import VT_R8, VT_ARRAY
+from functools import partial
+
+# numpy is optional and imported by first AcadPointArray, only AcadPointArray needs it
+np = None
+# VARIANT array of doubles constructor, pywin32 is imported by first conversion
+_VARIANT = None
+
+
+def _numpy():
+    """
+    Import numpy on first use of AcadPointArray
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("AcadPointArray requires numpy") from None
+        np = numpy
+    return np
+
+
+def set_variant_factory(factory=None):
+    """
+    Set function creating VARIANT arrays of doubles, e.g. to use and test AcadPoint without pywin32.
+    Points keep VARIANTs created before.
+        >>set_variant_factory(tuple)
+        >>AcadPoint(1, 2, 3)()
+        (1, 2, 3)
+    :param factory: function of sequence of numbers, None for win32com.client.VARIANT
+    """
+    global _VARIANT
+    _VARIANT = factory
+
+
+def _variant(values):
+    """
+    Create VARIANT array of doubles
+    """
+    global _VARIANT
+    if _VARIANT is None:
+        from win32com.client import VARIANT
+        from pythoncom import VT_R8, VT_ARRAY
+        _VARIANT = partial(VARIANT, VT_ARRAY | VT_R8)
+    return _VARIANT(values)
+
 
 class AcadPoint:
     """
@@ -48,131 +92,495 @@ class AcadPoint:
     (50.0, 100.0, 10.0) - variant array of doubles
     >>p1()
     (50.0, 100.0, 10.0) - variant array of doubles
+    VARIANT is created once and reused until coordinates are changed,
+    the same point can be passed to thousands of AddLine calls without conversion.
+    Points are hashable and equal to tuples with the same coordinates,
+    do not change a point with in-place operators while it is used as a dict key or set item.
     """
 
+    # VARIANT forms are cached until coordinates are changed
+    __slots__ = ("_x", "_y", "_z", "_variant", "_variant2")
+
     def __init__(self, *args):
-        coords = []
-        if len(args) == 1:
-            if isinstance(args[0], (list, tuple)) and len(args[0]) == 3:
-                coords = [item for item in args[0] if isinstance(item, (float, int))]
-            elif isinstance(args[0], AcadPoint):
-                coords = [args[0].x, args[0].y, args[0].z]
-        elif len(args) == 3:
-            coords = [item for item in args if isinstance(item, (float, int))]
-        if len(coords) != 3:
+        if len(args) == 3:
+            x, y, z = args
+        elif len(args) == 1 and isinstance(args[0], AcadPoint):
+            point = args[0]
+            self._x, self._y, self._z = point._x, point._y, point._z
+            self._variant = self._variant2 = None
+            return
+        elif len(args) == 1 and isinstance(args[0], (list, tuple)) and len(args[0]) == 3:
+            x, y, z = args[0]
+        else:
+            x = y = z = None
+        if not (isinstance(x, _NUMBERS) and isinstance(y, _NUMBERS) and isinstance(z, _NUMBERS)):
             raise TypeError("args in AcadPoint(args) can be:"
                             "list, tuple of three float/int, or three float/int, or AcadPoint object")
-        else:
-            self.x, self.y, self.z = coords
+        self._x = x
+        self._y = y
+        self._z = z
+        self._variant = self._variant2 = None
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        self._variant = self._variant2 = None
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        self._variant = self._variant2 = None
+
+    @property
+    def z(self):
+        return self._z
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+        self._variant = None
 
     def __call__(self):
         return self.coordinates
 
     @property
     def coordinates(self):
-        return convertcoordinates(self.x, self.y, self.z)
+        variant = self._variant
+        if variant is None:
+            variant = self._variant = _variant((self._x, self._y, self._z))
+        return variant
 
     @property
     def coordinates2D(self):
-        return convertcoordinates(self.x, self.y)
+        variant = self._variant2
+        if variant is None:
+            variant = self._variant2 = _variant((self._x, self._y))
+        return variant
 
     def __iter__(self):
-        self.__i = 0
-        return self
-
-    def __next__(self):
-        if self.__i == 0:
-            self.__i += 1
-            return self.x
-        elif self.__i == 1:
-            self.__i += 1
-            return self.y
-        elif self.__i == 2:
-            self.__i += 1
-            return self.z
-        else:
-            raise StopIteration
+        yield self._x
+        yield self._y
+        yield self._z
 
     def __str__(self):
-        return "(x={}, y={}, z={})".format(self.x, self.y, self.z)
+        return "(x={}, y={}, z={})".format(self._x, self._y, self._z)
 
     def __repr__(self):
-        return "AcadPoint(x={}, y={}, z={})".format(self.x, self.y, self.z)
+        return "AcadPoint(x={}, y={}, z={})".format(self._x, self._y, self._z)
 
     def __eq__(self, other):
-        if isinstance(other, (AcadPoint, list, tuple)):
-            return tuple(self) == tuple(other)
-        else:
-            raise TypeError("AcadPoint can be compared with AcadPoint, list or tuple only")
+        if isinstance(other, AcadPoint):
+            return self._x == other._x and self._y == other._y and self._z == other._z
+        elif isinstance(other, (list, tuple)):
+            return (self._x, self._y, self._z) == tuple(other)
+        # other types compare themselves or are not equal
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._x, self._y, self._z))
 
     def __add__(self, other):
-        return self.__operand(self, other, operator.add)
+        kind = type(other)
+        if kind is AcadPoint:
+            return _point(self._x + other._x, self._y + other._y, self._z + other._z)
+        elif kind is float or kind is int:
+            return _point(self._x + other, self._y + other, self._z + other)
+        return self.__operand(other, operator.add)
 
     def __radd__(self, other):
-        return self.__operand(other, self, operator.add)
+        return self.__operand(other, operator.add, reflected=True)
 
     def __iadd__(self, other):
+        kind = type(other)
+        if kind is AcadPoint:
+            self._x += other._x
+            self._y += other._y
+            self._z += other._z
+            self._variant = self._variant2 = None
+            return self
+        elif kind is float or kind is int:
+            self._x += other
+            self._y += other
+            self._z += other
+            self._variant = self._variant2 = None
+            return self
         return self.__ioperand(other, operator.add)
 
     def __sub__(self, other):
-        return self.__operand(self, other, operator.sub)
+        kind = type(other)
+        if kind is AcadPoint:
+            return _point(self._x - other._x, self._y - other._y, self._z - other._z)
+        elif kind is float or kind is int:
+            return _point(self._x - other, self._y - other, self._z - other)
+        return self.__operand(other, operator.sub)
 
     def __rsub__(self, other):
-        return self.__operand(other, self, operator.sub)
+        return self.__operand(other, operator.sub, reflected=True)
 
     def __isub__(self, other):
+        kind = type(other)
+        if kind is AcadPoint:
+            self._x -= other._x
+            self._y -= other._y
+            self._z -= other._z
+            self._variant = self._variant2 = None
+            return self
+        elif kind is float or kind is int:
+            self._x -= other
+            self._y -= other
+            self._z -= other
+            self._variant = self._variant2 = None
+            return self
         return self.__ioperand(other, operator.sub)
 
     def __mul__(self, other):
-        return self.__operand(self, other, operator.mul)
+        kind = type(other)
+        if kind is AcadPoint:
+            return _point(self._x * other._x, self._y * other._y, self._z * other._z)
+        elif kind is float or kind is int:
+            return _point(self._x * other, self._y * other, self._z * other)
+        return self.__operand(other, operator.mul)
 
     def __rmul__(self, other):
-        return self.__operand(other, self, operator.mul)
+        return self.__operand(other, operator.mul, reflected=True)
 
     def __imul__(self, other):
+        kind = type(other)
+        if kind is AcadPoint:
+            self._x *= other._x
+            self._y *= other._y
+            self._z *= other._z
+            self._variant = self._variant2 = None
+            return self
+        elif kind is float or kind is int:
+            self._x *= other
+            self._y *= other
+            self._z *= other
+            self._variant = self._variant2 = None
+            return self
         return self.__ioperand(other, operator.mul)
 
     def __truediv__(self, other):
-        return self.__operand(self, other, operator.truediv)
+        kind = type(other)
+        if kind is AcadPoint:
+            return _point(self._x / other._x, self._y / other._y, self._z / other._z)
+        elif kind is float or kind is int:
+            return _point(self._x / other, self._y / other, self._z / other)
+        return self.__operand(other, operator.truediv)
 
     def __rtruediv__(self, other):
-        return self.__operand(other, self, operator.truediv)
+        return self.__operand(other, operator.truediv, reflected=True)
 
     def __itruediv__(self, other):
+        kind = type(other)
+        if kind is AcadPoint:
+            self._x /= other._x
+            self._y /= other._y
+            self._z /= other._z
+            self._variant = self._variant2 = None
+            return self
+        elif kind is float or kind is int:
+            self._x /= other
+            self._y /= other
+            self._z /= other
+            self._variant = self._variant2 = None
+            return self
         return self.__ioperand(other, operator.truediv)
 
-    def __operand(self, point1, point2, operation):
-        points = [point1, point2]
-        coordinates = []
-        for i in range(2):
-            if isinstance(points[i], AcadPoint):
-                coordinates.append([points[i].x, points[i].y, points[i].z])
-            elif isinstance(points[i], (list, tuple)) and len(points[i]) == 3:
-                coordinates.append([points[i][0], points[i][1], points[i][2]])
-            elif isinstance(points[i], (int, float)):
-                coordinates.append([points[i], points[i], points[i]])
-            else:
-                raise TypeError("Incorrect type. Only int, float, [x,y,z], (x,y,z) or AcadPoint can be operated AcadPoint")
-        return AcadPoint(operation(coordinates[0][0], coordinates[1][0]), operation(coordinates[0][1], coordinates[1][1]),
-                         operation(coordinates[0][2], coordinates[1][2]))
+    def __operand(self, other, operation, reflected=False):
+        # generic path for subclasses, numbers other than int/float and (x,y,z) sequences
+        if isinstance(other, AcadPoint):
+            x, y, z = other._x, other._y, other._z
+        elif isinstance(other, (list, tuple)) and len(other) == 3:
+            x, y, z = other
+        elif isinstance(other, _NUMBERS):
+            x = y = z = other
+        else:
+            return NotImplemented
+        if reflected:
+            return _point(operation(x, self._x), operation(y, self._y), operation(z, self._z))
+        return _point(operation(self._x, x), operation(self._y, y), operation(self._z, z))
 
     def __ioperand(self, point, operation):
         if isinstance(point, AcadPoint):
-            coordinates = [point.x, point.y, point.z]
+            x, y, z = point._x, point._y, point._z
         elif isinstance(point, (list, tuple)):
             if len(point) == 3:
-                coordinates = [point[0], point[1], point[2]]
+                x, y, z = point
             elif len(point) == 2:
-                coordinates = [point[0], point[1], 0]
+                x, y = point
+                z = 0
             else:
                 raise TypeError("Incorrect length. List or tuple size should be from 2 to 3")
-        elif isinstance(point, (int, float)):
-            coordinates = [point, point, point]
+        elif isinstance(point, _NUMBERS):
+            x = y = z = point
         else:
             raise TypeError("Incorrect type. Only int, float, [x,y,z], (x,y,z) or AcadPoint can be added to AcadPoint")
-        self.x = operation(self.x, coordinates[0])
-        self.y = operation(self.y, coordinates[1])
-        self.z = operation(self.z, coordinates[2])
+        self._x = operation(self._x, x)
+        self._y = operation(self._y, y)
+        self._z = operation(self._z, z)
+        self._variant = self._variant2 = None
+        return self
+
+
+_NUMBERS = (int, float)
+
+
+def _point(x, y, z):
+    """
+    Create AcadPoint from already checked coordinates bypassing __init__
+    """
+    point = object.__new__(AcadPoint)
+    point._x = x
+    point._y = y
+    point._z = z
+    point._variant = point._variant2 = None
+    return point
+
+
+class AcadPointArray:
+    """
+    Class that represent array of AutoCAD points as (N, 3) array of doubles, requires numpy
+
+    New array:
+        >>pa = AcadPointArray([(0, 0, 0), [10, 0, 0], AcadPoint(10, 10, 0)])
+        >>pa = AcadPointArray.from_flat((0, 0, 10, 0, 10, 10), dim=2)
+    Supports vectorized math operations: `+`, `-`, `*`, `/`, `+=`, `-=`, `*=`, `/=`
+    with AcadPointArray of the same length, AcadPoint, (x,y,z), [x,y,z] or numbers:
+        >>pa + AcadPoint(5, 5, 0)
+        >>pa * 2
+    Indexing returns AcadPoint, slicing returns AcadPointArray sharing memory with the source:
+        >>pa[0]
+        AcadPoint(x=0.0, y=0.0, z=0.0)
+        >>pa[1:] += 5
+    Can be converted back to AcadPoint objects:
+        >>pa.to_points()
+        [AcadPoint(x=0.0, y=0.0, z=0.0), AcadPoint(x=10.0, y=0.0, z=0.0), AcadPoint(x=10.0, y=10.0, z=0.0)]
+    .coordinates attribute or call return all points as flat variant array of doubles (AddPolyline, Coordinates),
+    .coordinates2D returns x, y only (AddLightWeightPolyline):
+        >>acad.ActiveDocument.ModelSpace.AddPolyline(pa())
+    """
+
+    # makes numpy call our reflected operators for ndarray + AcadPointArray
+    __array_priority__ = 1000
+
+    def __init__(self, points=()):
+        _numpy()
+        if isinstance(points, AcadPointArray):
+            data = points._data
+        elif isinstance(points, np.ndarray):
+            data = points
+        else:
+            data = [tuple(point) for point in points]
+        data = np.array(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 3)
+        if data.ndim != 2 or data.shape[1] not in (2, 3):
+            raise TypeError("args in AcadPointArray(args) can be: sequence of AcadPoint objects, "
+                            "(x,y,z)/(x,y) tuples or lists, (N, 3)/(N, 2) array or AcadPointArray object")
+        if data.shape[1] == 2:
+            data = np.column_stack((data, np.zeros(len(data))))
+        self._data = data
+
+    @classmethod
+    def _wrap(cls, data):
+        """
+        Create AcadPointArray over existing (N, 3) float64 array without copying
+        """
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
+    @classmethod
+    def from_flat(cls, coordinates, dim=3):
+        """
+        Create AcadPointArray from flat sequence of coordinates as returned by AutoCAD Coordinates property
+        :param coordinates: sequence of numbers (x1,y1,z1,x2,y2,z2,...) or (x1,y1,x2,y2,...)
+        :param dim: number of coordinates per point, 2 or 3
+        :return: AcadPointArray object
+        """
+        if dim not in (2, 3):
+            raise ValueError("from_flat() dim must be 2 or 3")
+        _numpy()
+        data = np.asarray(coordinates, dtype=np.float64)
+        if data.ndim != 1 or data.size % dim != 0:
+            raise ValueError("from_flat() coordinates length must be a multiple of {}".format(dim))
+        return cls(data.reshape(-1, dim))
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Create AcadPointArray from iterable of AcadPoint objects or (x,y,z) sequences
+        :param points: iterable of points
+        :return: AcadPointArray object
+        """
+        return cls(list(points))
+
+    def to_points(self):
+        """
+        Convert array to list of AcadPoint objects
+        :return: list of AcadPoint
+        """
+        return [AcadPoint(x, y, z) for x, y, z in self._data.tolist()]
+
+    @property
+    def array(self):
+        return self._data
+
+    @property
+    def x(self):
+        return self._data[:, 0]
+
+    @property
+    def y(self):
+        return self._data[:, 1]
+
+    @property
+    def z(self):
+        return self._data[:, 2]
+
+    def flat(self, dim=3):
+        """
+        Return coordinates as flat array (x1,y1,z1,x2,y2,z2,...) or (x1,y1,x2,y2,...)
+        :param dim: number of coordinates per point, 2 or 3
+        :return: 1D numpy array of doubles
+        """
+        if dim not in (2, 3):
+            raise ValueError("flat() dim must be 2 or 3")
+        return self._data[:, :dim].ravel()
+
+    def __call__(self):
+        return self.coordinates
+
+    @property
+    def coordinates(self):
+        return _variant(self.flat(3).tolist())
+
+    @property
+    def coordinates2D(self):
+        return _variant(self.flat(2).tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._data
+        return self._data.astype(dtype)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        for x, y, z in self._data.tolist():
+            yield AcadPoint(x, y, z)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return AcadPoint(*self._data[item].tolist())
+        result = self._data[item]
+        if result.ndim != 2 or result.shape[1] != 3:
+            raise IndexError("AcadPointArray supports only point indexing and slicing")
+        return AcadPointArray._wrap(result)
+
+    def __setitem__(self, item, value):
+        operand = self.__operand(value)
+        if operand is NotImplemented:
+            raise TypeError("Incorrect type. Only int, float, [x,y,z], (x,y,z), AcadPoint "
+                            "or AcadPointArray can be assigned to AcadPointArray items")
+        self._data[item] = operand
+
+    def __str__(self):
+        return str(self._data)
+
+    def __repr__(self):
+        return "AcadPointArray({})".format(self._data.tolist())
+
+    def __eq__(self, other):
+        operand = self.__operand(other)
+        if operand is NotImplemented:
+            return NotImplemented
+        shape = np.shape(operand)
+        # number or one point is compared with every point, arrays of other shape are not equal
+        if shape not in ((), (3,)) and shape != self._data.shape:
+            return False
+        return bool(np.array_equal(self._data, np.broadcast_to(operand, self._data.shape)))
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self.__apply(other, np.add)
+
+    def __radd__(self, other):
+        return self.__apply(other, np.add, reflected=True)
+
+    def __iadd__(self, other):
+        return self.__iapply(other, np.add)
+
+    def __sub__(self, other):
+        return self.__apply(other, np.subtract)
+
+    def __rsub__(self, other):
+        return self.__apply(other, np.subtract, reflected=True)
+
+    def __isub__(self, other):
+        return self.__iapply(other, np.subtract)
+
+    def __mul__(self, other):
+        return self.__apply(other, np.multiply)
+
+    def __rmul__(self, other):
+        return self.__apply(other, np.multiply, reflected=True)
+
+    def __imul__(self, other):
+        return self.__iapply(other, np.multiply)
+
+    def __truediv__(self, other):
+        return self.__apply(other, np.true_divide)
+
+    def __rtruediv__(self, other):
+        return self.__apply(other, np.true_divide, reflected=True)
+
+    def __itruediv__(self, other):
+        return self.__iapply(other, np.true_divide)
+
+    @staticmethod
+    def __operand(other):
+        if isinstance(other, AcadPointArray):
+            return other._data
+        elif isinstance(other, AcadPoint):
+            return np.array((other._x, other._y, other._z))
+        elif isinstance(other, (int, float, np.number)):
+            return other
+        elif isinstance(other, (list, tuple)) and len(other) == 3:
+            return np.array(other, dtype=np.float64)
+        elif isinstance(other, np.ndarray):
+            return other
+        return NotImplemented
+
+    def __apply(self, other, operation, reflected=False):
+        operand = self.__operand(other)
+        if operand is NotImplemented:
+            return NotImplemented
+        if reflected:
+            result = operation(operand, self._data, dtype=np.float64)
+        else:
+            result = operation(self._data, operand, dtype=np.float64)
+        if result.shape != self._data.shape:
+            raise ValueError("Operand of shape {} can not be broadcast "
+                             "to AcadPointArray of {} points".format(np.shape(operand), len(self._data)))
+        return AcadPointArray._wrap(result)
+
+    def __iapply(self, other, operation):
+        operand = self.__operand(other)
+        if operand is NotImplemented:
+            return NotImplemented
+        operation(self._data, operand, out=self._data)
         return self
 
 
@@ -182,4 +590,73 @@ def convertcoordinates(*args):
     :param args: coordinates
     :return: VARIANT array of doubles (x,y,z)
     """
-    return win32com.client.VARIANT(VT_ARRAY | VT_R8, args)
\ No newline at end of file
+    return _variant(args)
+
+
+def convertmatrix(matrix):
+    """
+    Convert 4x4 transformation matrix to two-dimensional VARIANT array of doubles (TransformBy)
+        >>entity.TransformBy(convertmatrix(((0, -1, 0, 0), (1, 0, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1))))
+    :param matrix: 4 rows of 4 numbers: nested sequences or numpy array
+    :return: VARIANT array of doubles
+    """
+    if hasattr(matrix, "tolist"):
+        matrix = matrix.tolist()
+    rows = tuple(tuple(float(value) for value in row) for row in matrix)
+    if len(rows) != 4 or any(len(row) != 4 for row in rows):
+        raise ValueError("convertmatrix() matrix must be 4x4")
+    return _variant(rows)
+
+
+# struct formats of memoryview items which are numbers
+_NUMBER_FORMATS = frozenset("bBhHiIlLqQnNfd")
+
+
+def convertpoints(points, dim=3):
+    """
+    Convert many points to one flat VARIANT array of doubles (AddPolyline, Add3DPoly, Coordinates)
+        >>convertpoints([AcadPoint(0, 0, 0), (10, 0, 0), (10, 10, 0)])
+        (0.0, 0.0, 0.0, 10.0, 0.0, 0.0, 10.0, 10.0, 0.0) - variant array of doubles
+        >>convertpoints(array.array("d", flat_xy), dim=2)
+    :param points: AcadPointArray, (N, 2)/(N, 3) numpy array, typed buffer of numbers (array.array, memoryview)
+                   or bytes of doubles with dim values per point, or iterable of AcadPoint objects and (x,y,z) sequences
+    :param dim: number of coordinates per point in result, 2 or 3
+    :return: VARIANT array of doubles
+    """
+    if dim not in (2, 3):
+        raise ValueError("convertpoints() dim must be 2 or 3")
+    if isinstance(points, AcadPointArray):
+        return _variant(points.flat(dim).tolist())
+    if hasattr(points, "__array_interface__"):
+        data = _numpy().asarray(points, dtype=np.float64)
+        if data.ndim == 2 and data.shape[1] >= dim:
+            return _variant(data[:, :dim].ravel().tolist())
+        if data.ndim != 1:
+            raise ValueError("convertpoints() array must be flat or have at least {} columns".format(dim))
+        values = data.tolist()
+    else:
+        try:
+            view = memoryview(points)
+        except TypeError:
+            values = []
+            for point in points:
+                if isinstance(point, AcadPoint):
+                    values += (point._x, point._y, point._z)[:dim]
+                else:
+                    point = tuple(point)
+                    if len(point) < dim:
+                        raise ValueError("convertpoints() point {} has less than {} coordinates".format(point, dim))
+                    values += point[:dim]
+            return _variant(values)
+        if isinstance(points, (bytes, bytearray)):
+            # raw bytes are doubles in native byte order
+            view = view.cast("d")
+        elif view.format not in _NUMBER_FORMATS:
+            raise TypeError("convertpoints() buffer of format {!r} is not a buffer of numbers".format(view.format))
+        elif view.ndim != 1:
+            view = view.cast("B").cast(view.format)
+        # items of other formats than "d" (ints, floats) are converted by value
+        values = [float(value) for value in view.tolist()] if view.format != "d" else view.tolist()
+    if len(values) % dim:
+        raise ValueError("convertpoints() buffer length must be a multiple of {}".format(dim))
+    return _variant(values)
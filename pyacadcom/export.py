@@ -0,0 +1,275 @@
+"""
+    pyacadcom.export
+    ******************
+
+    Streaming export of entity properties to JSONL, CSV and Parquet files with bounded memory
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+from time import monotonic
+
+from .snapshot import DEFAULT_FIELDS, iter_snapshot
+
+
+class ExportResult:
+    """
+    Result of export(): number of entities and chunks written and time spent
+    """
+
+    def __init__(self, count, chunks, elapsed):
+        self.count = count
+        self.chunks = chunks
+        self.elapsed = elapsed
+
+    @property
+    def rate(self):
+        """
+        Throughput in entities per second
+        """
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return "ExportResult(count={}, chunks={}, elapsed={:.3f}, rate={:.0f})".format(
+            self.count, self.chunks, self.elapsed, self.rate)
+
+
+def iter_records(entities, fields=DEFAULT_FIELDS, chunk_size=1000, progress=None):
+    """
+    Read entities chunk by chunk as records
+        >>for chunk in iter_records(acad.ActiveDocument.ModelSpace, ["Handle", "Layer"]):
+        >>    chunk[0]
+        ('1F4', '0')
+    :param entities: iterable of entities: SelectionSet, ModelSpace, list, generator
+    :param fields: names of properties to read
+    :param chunk_size: number of entities in chunk
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :return: generator of lists of tuples with values of fields in their order
+    """
+    fields = tuple(fields)
+    for chunk in iter_snapshot(entities, fields, chunk_size, progress):
+        yield list(zip(*(chunk[field] for field in fields)))
+
+
+def _json_value(value):
+    # points and other sequences as lists, COM objects and others as text
+    if isinstance(value, (tuple, list)):
+        return list(value)
+    return str(value)
+
+
+class Sink:
+    """
+    Destination of export(): open() is called with field names, write() with every chunk of columns
+    {field: list of values}, close() at the end. Path or open file can be given, file is closed by sink
+    only if sink opened it.
+    """
+
+    def __init__(self, file):
+        """
+        :param file: path or file object
+        """
+        self.file = file
+        self._stream = None
+        self._own = False
+        self.fields = ()
+
+    def open(self, fields):
+        self.fields = tuple(fields)
+        if isinstance(self.file, (str, bytes, os.PathLike)):
+            self._stream = open(self.file, "w", newline="", encoding="utf-8")
+            self._own = True
+        else:
+            self._stream = self.file
+
+    def write(self, chunk):
+        raise NotImplementedError
+
+    def close(self):
+        if self._own and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JSONLSink(Sink):
+    """
+    One JSON object per line per entity, points as lists
+    """
+
+    def write(self, chunk):
+        fields = self.fields
+        dumps = json.JSONEncoder(ensure_ascii=False, default=_json_value).encode
+        self._stream.writelines(dumps(dict(zip(fields, row))) + "\n"
+                                for row in zip(*(chunk[field] for field in fields)))
+
+
+class CSVSink(Sink):
+    """
+    CSV with header, None as empty value, points and other sequences as JSON lists
+    """
+
+    def __init__(self, file, **options):
+        """
+        :param file: path or file object opened with newline=""
+        :param options: csv.writer options (delimiter, quoting...)
+        """
+        super().__init__(file)
+        self.options = options
+        self._writer = None
+
+    def open(self, fields):
+        super().open(fields)
+        self._writer = csv.writer(self._stream, **self.options)
+        self._writer.writerow(self.fields)
+
+    def write(self, chunk):
+        columns = []
+        for field in self.fields:
+            column = chunk[field]
+            if any(value is not None and not isinstance(value, (str, int, float)) for value in column):
+                column = [json.dumps(_json_value(value)) if isinstance(value, (tuple, list)) else value
+                          for value in column]
+            columns.append(column)
+        self._writer.writerows(zip(*columns))
+
+
+class ParquetSink(Sink):
+    """
+    Parquet file written chunk by chunk as row groups, requires pyarrow.
+    Column types are taken from schema or from first chunk (columns of None only become strings)
+    """
+
+    def __init__(self, file, schema=None, compression="snappy"):
+        """
+        :param file: path or binary file object
+        :param schema: pyarrow.Schema of columns, inferred from first chunk if None
+        :param compression: Parquet compression codec
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow") from None
+        super().__init__(file)
+        self._pa = pyarrow
+        self.schema = schema
+        self.compression = compression
+        self._writer = None
+
+    def open(self, fields):
+        self.fields = tuple(fields)
+        self._own = False
+
+    def write(self, chunk):
+        pa = self._pa
+        columns = {field: [_json_value(value) if value is not None and not isinstance(
+            value, (str, int, float, tuple, list)) else value for value in chunk[field]] for field in self.fields}
+        if self._writer is None:
+            schema = self.schema
+            if schema is None:
+                schema = pa.table(columns).schema
+                schema = pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                                    for field in schema])
+            self.schema = schema
+            self._writer = pa.parquet.ParquetWriter(self.file, schema, compression=self.compression)
+        try:
+            table = pa.table(columns, schema=self.schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as error:
+            raise ValueError("Chunk does not match schema of Parquet file, give schema to ParquetSink: {}".format(
+                error)) from error
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+_SINKS = {".jsonl": JSONLSink, ".ndjson": JSONLSink, ".csv": CSVSink, ".parquet": ParquetSink}
+
+
+def sink_for(path):
+    """
+    Create sink by file extension: .jsonl/.ndjson, .csv or .parquet
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    try:
+        return _SINKS[extension](path)
+    except KeyError:
+        raise ValueError("Unknown export format {!r}, use .jsonl, .csv or .parquet".format(extension)) from None
+
+
+def export(entities, sink, fields=DEFAULT_FIELDS, chunk_size=1000, progress=None, queue_size=0):
+    """
+    Write properties of entities to sink chunk by chunk, memory is bounded by chunk size and queue size
+        >>export(acad.ActiveDocument.ModelSpace, "entities.jsonl", ["Handle", "ObjectName", "Layer", "Length"])
+        ExportResult(count=120000, chunks=120, elapsed=14.100, rate=8511)
+        >>with open("entities.csv", "w", newline="") as file:
+        >>    export(selset, CSVSink(file), queue_size=4, progress=print)
+    :param entities: iterable of entities: SelectionSet, ModelSpace, list, generator
+    :param sink: Sink object or path (format is chosen by extension)
+    :param fields: names of properties to export
+    :param chunk_size: number of entities in chunk
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :param queue_size: 0 - write chunks in calling thread,
+                       N - write in background thread while next chunks are read from AutoCAD,
+                           reading waits when N chunks are not written yet
+    :return: ExportResult object
+    """
+    if not isinstance(sink, Sink):
+        sink = sink_for(sink)
+    fields = tuple(fields)
+    start = monotonic()
+    count = chunks = 0
+    sink.open(fields)
+    try:
+        if queue_size <= 0:
+            for chunk in iter_snapshot(entities, fields, chunk_size, progress):
+                sink.write(chunk)
+                count += chunk.count
+                chunks += 1
+        else:
+            # COM objects are read in calling thread, only plain values go to writer thread
+            pending = queue.Queue(maxsize=queue_size)
+            errors = []
+
+            def writer():
+                while True:
+                    chunk = pending.get()
+                    if chunk is None:
+                        break
+                    if not errors:
+                        try:
+                            sink.write(chunk)
+                        except BaseException as error:
+                            errors.append(error)
+
+            thread = threading.Thread(target=writer, name="pyacadcom-export", daemon=True)
+            thread.start()
+            try:
+                for chunk in iter_snapshot(entities, fields, chunk_size, progress):
+                    if errors:
+                        break
+                    pending.put(chunk)
+                    count += chunk.count
+                    chunks += 1
+            finally:
+                pending.put(None)
+                thread.join()
+            if errors:
+                raise errors[0]
+    finally:
+        sink.close()
+    return ExportResult(count, chunks, monotonic() - start)
@@ -0,0 +1,1066 @@
+"""
+    pyacadcom.fake
+    ******************
+
+    Pure Python stand-in of AutoCAD object model with configurable latency and injected COM faults
+    for running and benchmarking pyacadcom without Windows and AutoCAD
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from functools import wraps
+from math import atan, atan2, cos, pi, sin
+from random import Random
+from time import perf_counter, sleep
+from types import FunctionType
+
+from ._compat import _ERRORCODES, com_error
+
+try:
+    from .api import register_wrapped_type
+except ImportError:
+    # no pywin32: fake objects are used directly, without COMRetryObjectWrapper
+    def register_wrapped_type(cls):
+        return cls
+
+# hresults of errors raised by fake objects
+_UNKNOWN_NAME = -2147352570
+_INVALID_ARGUMENT = -2147024809
+_USER_CANCEL = -2147352567
+_DUPLICATE_KEY = -2145386475
+
+# shared DISPID registry of member names of all fake classes
+_DISPIDS = {}
+_NAMES = {}
+
+
+class Faults:
+    """
+    Latency and faults of every COM call (property read or write, method call) of fake objects
+        >>faults = Faults(latency=50e-6, busy_rate=0.01, attribute_error_rate=0.001, seed=1)
+        >>acad = COMRetryObjectWrapper(FakeAutoCAD(faults))
+        >>faults.stats()
+        {'calls': 10000, 'busy_errors': 96, 'attribute_errors': 11}
+    """
+
+    def __init__(self, latency=0.0, busy_rate=0.0, attribute_error_rate=0.0, hresults=None, seed=None):
+        """
+        :param latency: seconds spent in every call
+        :param busy_rate: share of calls rejected with busy hresult (RPC_E_CALL_REJECTED etc.)
+        :param attribute_error_rate: share of calls failing with transient AttributeError
+        :param hresults: busy hresults to inject, the ones retried by default retry policy if None
+        :param seed: seed of random generator for reproducible faults
+        """
+        self.latency = latency
+        self.busy_rate = busy_rate
+        self.attribute_error_rate = attribute_error_rate
+        self.hresults = list(hresults or _ERRORCODES)
+        self.calls = 0
+        self.busy_errors = 0
+        self.attribute_errors = 0
+        self._random = Random(seed)
+
+    def inject(self, member):
+        """
+        Spend latency and raise fault with configured rate, called by fake objects on every call
+        """
+        self.wait()
+        if self.busy_rate or self.attribute_error_rate:
+            value = self._random.random()
+            if value < self.busy_rate:
+                self.busy_errors += 1
+                raise com_error(self._random.choice(self.hresults), "Call was rejected by callee.", None, None)
+            if value < self.busy_rate + self.attribute_error_rate:
+                self.attribute_errors += 1
+                raise AttributeError(member)
+
+    def wait(self):
+        """
+        Spend latency of call without faults: iteration of collections is not retried by COM wrappers
+        """
+        self.calls += 1
+        if self.latency:
+            if self.latency >= 0.001:
+                sleep(self.latency)
+            else:
+                # sleep() is too coarse for microseconds
+                deadline = perf_counter() + self.latency
+                while perf_counter() < deadline:
+                    pass
+
+    def stats(self):
+        return {"calls": self.calls, "busy_errors": self.busy_errors, "attribute_errors": self.attribute_errors}
+
+
+def _member(function):
+    """
+    Make method of fake object a COM call
+    """
+    @wraps(function)
+    def member(self, *args):
+        self._faults.inject(function.__name__)
+        return function(self, *args)
+    return member
+
+
+class _FakeOleObject:
+    """
+    IDispatch of fake object: GetIDsOfNames/Invoke used by COMRetryObjectWrapper member cache
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        self._owner = owner
+
+    def GetIDsOfNames(self, lcid, name):
+        if name.startswith("_") or getattr(type(self._owner), name, None) is None:
+            raise com_error(_UNKNOWN_NAME, "Unknown name.", None, None)
+        dispid = _DISPIDS.get(name)
+        if dispid is None:
+            dispid = _DISPIDS[name] = len(_DISPIDS) + 1
+            _NAMES[dispid] = name
+        return dispid
+
+    def Invoke(self, dispid, lcid, flags, result):
+        return getattr(self._owner, _NAMES[dispid])
+
+
+@register_wrapped_type
+class FakeObject:
+    """
+    Base of fake COM objects: public members are COM calls passing through Faults,
+    underscore attributes are internal state
+    """
+
+    __slots__ = ("_faults",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.CLSID = "{{pyacadcom-fake-{}}}".format(cls.__name__)
+        for name, value in list(cls.__dict__.items()):
+            if not name.startswith("_") and type(value) is FunctionType:
+                setattr(cls, name, _member(value))
+
+    def __getattribute__(self, name):
+        # methods are counted when called
+        if name[0] != "_" and type(getattr(type(self), name, None)) is not FunctionType:
+            object.__getattribute__(self, "_faults").inject(name)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name[0] != "_":
+            self._faults.inject(name)
+        object.__setattr__(self, name, value)
+
+    @property
+    def _oleobj_(self):
+        return _FakeOleObject(self)
+
+    def _get_good_object_(self, value):
+        return value
+
+
+def _values(value):
+    """
+    Get tuple of floats from VARIANT, AcadPoint or sequence
+    """
+    return tuple(float(item) for item in getattr(value, "value", value))
+
+
+def _point(value):
+    point = _values(value)
+    if len(point) == 2:
+        return point + (0.0,)
+    if len(point) != 3:
+        raise com_error(_INVALID_ARGUMENT, "Invalid argument", None, None)
+    return point
+
+
+def _scale_and_angle(function):
+    """
+    Get scale and rotation angle in XY plane of transformation from image of X axis
+    """
+    origin = function((0.0, 0.0, 0.0))
+    x, y, z = (b - a for a, b in zip(origin, function((1.0, 0.0, 0.0))))
+    return (x * x + y * y + z * z) ** 0.5, atan2(y, x)
+
+
+class FakeEntity(FakeObject):
+    """
+    Base of fake entities
+    """
+
+    __slots__ = ("_document", "_handle", "_object_id", "_layer", "_color", "_erased")
+    _object_name = "AcDbEntity"
+    _dxf_name = ""
+
+    def __init__(self, document):
+        self._faults = document._faults
+        self._document = document
+        self._handle, self._object_id = document._new_handle()
+        self._layer = "0"
+        self._color = 256
+        self._erased = False
+
+    def __repr__(self):
+        return "<{} {}>".format(self._object_name, self._handle)
+
+    def __setattr__(self, name, value):
+        if name[0] != "_" and self._erased:
+            raise com_error(_INVALID_ARGUMENT, "Object was erased", None, None)
+        super().__setattr__(name, value)
+
+    @property
+    def ObjectName(self):
+        return self._object_name
+
+    @property
+    def EntityName(self):
+        return self._object_name
+
+    @property
+    def Handle(self):
+        return self._handle
+
+    @property
+    def ObjectID(self):
+        return self._object_id
+
+    @property
+    def Document(self):
+        return self._document
+
+    @property
+    def Layer(self):
+        return self._layer
+
+    @Layer.setter
+    def Layer(self, value):
+        self._layer = str(value)
+
+    @property
+    def Color(self):
+        # acByLayer
+        return self._color
+
+    @Color.setter
+    def Color(self, value):
+        self._color = int(value)
+
+    def Delete(self):
+        self._document._space._remove(self)
+
+    def GetBoundingBox(self):
+        points = self._extents()
+        return (min(p[0] for p in points), min(p[1] for p in points), min(p[2] for p in points)), \
+               (max(p[0] for p in points), max(p[1] for p in points), max(p[2] for p in points))
+
+    def TransformBy(self, matrix):
+        rows = [_values(row) for row in getattr(matrix, "value", matrix)]
+        if len(rows) != 4 or any(len(row) != 4 for row in rows):
+            raise com_error(_INVALID_ARGUMENT, "Invalid argument", None, None)
+        rows = rows[:3]
+        self._transform(lambda point: tuple(row[0] * point[0] + row[1] * point[1] + row[2] * point[2] + row[3]
+                                            for row in rows))
+
+    def Move(self, from_point, to_point):
+        offset = [b - a for a, b in zip(_point(from_point), _point(to_point))]
+        self._transform(lambda point: tuple(value + delta for value, delta in zip(point, offset)))
+
+    def Rotate(self, base, angle):
+        x0, y0, z0 = _point(base)
+        c, s = cos(angle), sin(angle)
+        self._transform(lambda point: (x0 + (point[0] - x0) * c - (point[1] - y0) * s,
+                                       y0 + (point[0] - x0) * s + (point[1] - y0) * c, point[2]))
+
+    def ScaleEntity(self, base, factor):
+        base = _point(base)
+        self._transform(lambda point: tuple(b + (value - b) * factor for value, b in zip(point, base)))
+
+    def _extents(self):
+        raise com_error(_INVALID_ARGUMENT, "Invalid extents", None, None)
+
+    def _transform(self, function):
+        raise com_error(_INVALID_ARGUMENT, "Invalid transformation", None, None)
+
+
+class FakeLine(FakeEntity):
+    __slots__ = ("_start", "_end")
+    _object_name = "AcDbLine"
+    _dxf_name = "LINE"
+
+    def __init__(self, document, start, end):
+        super().__init__(document)
+        self._start = _point(start)
+        self._end = _point(end)
+
+    @property
+    def StartPoint(self):
+        return self._start
+
+    @property
+    def EndPoint(self):
+        return self._end
+
+    @property
+    def Length(self):
+        start, end = self._start, self._end
+        return ((end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2 + (end[2] - start[2]) ** 2) ** 0.5
+
+    def _transform(self, function):
+        self._start, self._end = function(self._start), function(self._end)
+
+    def _extents(self):
+        return self._start, self._end
+
+
+def _segments_length(coordinates, dim, closed, bulges=None):
+    points = [coordinates[i:i + dim] for i in range(0, len(coordinates), dim)]
+    if closed and len(points) > 1:
+        points.append(points[0])
+    length = 0.0
+    for i in range(len(points) - 1):
+        chord = sum((b - a) ** 2 for a, b in zip(points[i], points[i + 1])) ** 0.5
+        if bulges and bulges[i]:
+            theta = 4 * atan(abs(bulges[i]))
+            chord *= theta / (2 * sin(theta / 2))
+        length += chord
+    return length
+
+
+class FakePolyline(FakeEntity):
+    """
+    Lightweight polyline
+    """
+
+    __slots__ = ("_coordinates", "_bulges", "_closed", "_elevation")
+    _object_name = "AcDbPolyline"
+    _dxf_name = "LWPOLYLINE"
+
+    def __init__(self, document, coordinates, bulges=None, closed=False, elevation=0.0):
+        super().__init__(document)
+        self._coordinates = _values(coordinates)
+        if len(self._coordinates) % 2 or len(self._coordinates) < 4:
+            raise com_error(_INVALID_ARGUMENT, "Invalid argument", None, None)
+        self._bulges = list(bulges) if bulges else None
+        self._closed = closed
+        self._elevation = elevation
+
+    @property
+    def Coordinates(self):
+        return self._coordinates
+
+    @property
+    def Closed(self):
+        return self._closed
+
+    @Closed.setter
+    def Closed(self, value):
+        self._closed = bool(value)
+
+    @property
+    def Elevation(self):
+        return self._elevation
+
+    @Elevation.setter
+    def Elevation(self, value):
+        self._elevation = float(value)
+
+    @property
+    def Length(self):
+        return _segments_length(self._coordinates, 2, self._closed, self._bulges)
+
+    def GetBulge(self, index):
+        if not 0 <= index < len(self._coordinates) // 2:
+            raise com_error(_INVALID_ARGUMENT, "Invalid index", None, None)
+        return self._bulges[index] if self._bulges else 0.0
+
+    def SetBulge(self, index, value):
+        if not 0 <= index < len(self._coordinates) // 2:
+            raise com_error(_INVALID_ARGUMENT, "Invalid index", None, None)
+        if self._bulges is None:
+            self._bulges = [0.0] * (len(self._coordinates) // 2)
+        self._bulges[index] = float(value)
+
+    def _transform(self, function):
+        coordinates = []
+        for i in range(0, len(self._coordinates), 2):
+            point = function((self._coordinates[i], self._coordinates[i + 1], self._elevation))
+            coordinates += point[:2]
+        self._coordinates = tuple(coordinates)
+        self._elevation = function((0.0, 0.0, self._elevation))[2]
+
+    def _extents(self):
+        coordinates = self._coordinates
+        return [(coordinates[i], coordinates[i + 1], self._elevation) for i in range(0, len(coordinates), 2)]
+
+
+class Fake3dPolyline(FakeEntity):
+    __slots__ = ("_coordinates", "_closed")
+    _object_name = "AcDb3dPolyline"
+    _dxf_name = "POLYLINE"
+
+    def __init__(self, document, coordinates, closed=False):
+        super().__init__(document)
+        self._coordinates = _values(coordinates)
+        if len(self._coordinates) % 3 or len(self._coordinates) < 6:
+            raise com_error(_INVALID_ARGUMENT, "Invalid argument", None, None)
+        self._closed = closed
+
+    @property
+    def Coordinates(self):
+        return self._coordinates
+
+    @property
+    def Closed(self):
+        return self._closed
+
+    @Closed.setter
+    def Closed(self, value):
+        self._closed = bool(value)
+
+    @property
+    def Length(self):
+        return _segments_length(self._coordinates, 3, self._closed)
+
+    def _transform(self, function):
+        coordinates = self._coordinates
+        self._coordinates = tuple(value for i in range(0, len(coordinates), 3)
+                                  for value in function(coordinates[i:i + 3]))
+
+    def _extents(self):
+        coordinates = self._coordinates
+        return [coordinates[i:i + 3] for i in range(0, len(coordinates), 3)]
+
+
+class FakeMline(FakeEntity):
+    """
+    Multiline, AutoCAD does not report its length
+    """
+
+    __slots__ = ("_coordinates",)
+    _object_name = "AcDbMline"
+    _dxf_name = "MLINE"
+
+    def __init__(self, document, coordinates):
+        super().__init__(document)
+        self._coordinates = _values(coordinates)
+        if len(self._coordinates) % 3 or len(self._coordinates) < 6:
+            raise com_error(_INVALID_ARGUMENT, "Invalid argument", None, None)
+
+    @property
+    def Coordinates(self):
+        return self._coordinates
+
+    def _transform(self, function):
+        coordinates = self._coordinates
+        self._coordinates = tuple(value for i in range(0, len(coordinates), 3)
+                                  for value in function(coordinates[i:i + 3]))
+
+    def _extents(self):
+        coordinates = self._coordinates
+        return [coordinates[i:i + 3] for i in range(0, len(coordinates), 3)]
+
+
+class FakeCircle(FakeEntity):
+    __slots__ = ("_center", "_radius")
+    _object_name = "AcDbCircle"
+    _dxf_name = "CIRCLE"
+
+    def __init__(self, document, center, radius):
+        super().__init__(document)
+        self._center = _point(center)
+        self._radius = float(radius)
+
+    @property
+    def Center(self):
+        return self._center
+
+    @property
+    def Radius(self):
+        return self._radius
+
+    @Radius.setter
+    def Radius(self, value):
+        self._radius = float(value)
+
+    @property
+    def Circumference(self):
+        return 2 * pi * self._radius
+
+    @property
+    def Area(self):
+        return pi * self._radius ** 2
+
+    def _transform(self, function):
+        self._center = function(self._center)
+        self._radius *= _scale_and_angle(function)[0]
+
+    def _extents(self):
+        x, y, z = self._center
+        return (x - self._radius, y - self._radius, z), (x + self._radius, y + self._radius, z)
+
+
+class FakeArc(FakeEntity):
+    __slots__ = ("_center", "_radius", "_start_angle", "_end_angle")
+    _object_name = "AcDbArc"
+    _dxf_name = "ARC"
+
+    def __init__(self, document, center, radius, start_angle, end_angle):
+        super().__init__(document)
+        self._center = _point(center)
+        self._radius = float(radius)
+        self._start_angle = float(start_angle) % (2 * pi)
+        self._end_angle = float(end_angle) % (2 * pi)
+
+    @property
+    def Center(self):
+        return self._center
+
+    @property
+    def Radius(self):
+        return self._radius
+
+    @property
+    def StartAngle(self):
+        return self._start_angle
+
+    @property
+    def EndAngle(self):
+        return self._end_angle
+
+    @property
+    def TotalAngle(self):
+        return (self._end_angle - self._start_angle) % (2 * pi) or 2 * pi
+
+    @property
+    def ArcLength(self):
+        return self._radius * ((self._end_angle - self._start_angle) % (2 * pi) or 2 * pi)
+
+    @property
+    def StartPoint(self):
+        return self.__at(self._start_angle)
+
+    @property
+    def EndPoint(self):
+        return self.__at(self._end_angle)
+
+    def __at(self, angle):
+        x, y, z = self._center
+        return x + self._radius * cos(angle), y + self._radius * sin(angle), z
+
+    def _transform(self, function):
+        scale, angle = _scale_and_angle(function)
+        self._center = function(self._center)
+        self._radius *= scale
+        self._start_angle = (self._start_angle + angle) % (2 * pi)
+        self._end_angle = (self._end_angle + angle) % (2 * pi)
+
+    def _extents(self):
+        # box of whole circle is enough for fake
+        x, y, z = self._center
+        return (x - self._radius, y - self._radius, z), (x + self._radius, y + self._radius, z)
+
+
+class FakeText(FakeEntity):
+    __slots__ = ("_text", "_insertion", "_height")
+    _object_name = "AcDbText"
+    _dxf_name = "TEXT"
+
+    def __init__(self, document, text, insertion, height):
+        super().__init__(document)
+        self._text = str(text)
+        self._insertion = _point(insertion)
+        self._height = float(height)
+
+    @property
+    def TextString(self):
+        return self._text
+
+    @TextString.setter
+    def TextString(self, value):
+        self._text = str(value)
+
+    @property
+    def InsertionPoint(self):
+        return self._insertion
+
+    @property
+    def Height(self):
+        return self._height
+
+    def _transform(self, function):
+        self._insertion = function(self._insertion)
+        self._height *= _scale_and_angle(function)[0]
+
+    def _extents(self):
+        if not self._text:
+            return super()._extents()
+        x, y, z = self._insertion
+        return (x, y, z), (x + self._height * 0.8 * len(self._text), y + self._height, z)
+
+
+class FakeBlock(FakeObject):
+    """
+    ModelSpace: ordered collection of entities of document
+    """
+
+    __slots__ = ("_document", "_entities", "_index")
+
+    def __init__(self, document):
+        self._faults = document._faults
+        self._document = document
+        self._entities = []
+        self._index = {}
+
+    def __iter__(self):
+        for entity in list(self._entities):
+            self._faults.wait()
+            yield entity
+
+    def __len__(self):
+        return len(self._entities)
+
+    def _append(self, entity):
+        self._index[entity._handle] = entity
+        self._entities.append(entity)
+        return entity
+
+    def _remove(self, entity):
+        if entity._erased:
+            raise com_error(_INVALID_ARGUMENT, "Object was erased", None, None)
+        entity._erased = True
+        del self._index[entity._handle]
+        self._entities.remove(entity)
+
+    @property
+    def Name(self):
+        return "*Model_Space"
+
+    @property
+    def Count(self):
+        return len(self._entities)
+
+    @property
+    def Document(self):
+        return self._document
+
+    def Item(self, index):
+        try:
+            return self._entities[index]
+        except (IndexError, TypeError):
+            raise com_error(_INVALID_ARGUMENT, "Invalid index", None, None)
+
+    def AddLine(self, start, end):
+        return self._append(FakeLine(self._document, start, end))
+
+    def AddLightWeightPolyline(self, coordinates):
+        return self._append(FakePolyline(self._document, coordinates))
+
+    def Add3DPoly(self, coordinates):
+        return self._append(Fake3dPolyline(self._document, coordinates))
+
+    def AddMLine(self, coordinates):
+        return self._append(FakeMline(self._document, coordinates))
+
+    def AddCircle(self, center, radius):
+        return self._append(FakeCircle(self._document, center, radius))
+
+    def AddArc(self, center, radius, start_angle, end_angle):
+        return self._append(FakeArc(self._document, center, radius, start_angle, end_angle))
+
+    def AddText(self, text, insertion, height):
+        return self._append(FakeText(self._document, text, insertion, height))
+
+
+def _matches(entity, filter_type, filter_data):
+    """
+    Check entity by selection filter: group 0 (DXF names) and 8 (layers), comma separated, * matches any
+    """
+    for code, value in zip(filter_type, filter_data):
+        names = {name.strip().upper() for name in str(value).split(",")}
+        if "*" in names:
+            continue
+        if code == 0 and entity._dxf_name not in names:
+            return False
+        if code == 8 and entity._layer.upper() not in names:
+            return False
+    return True
+
+
+class FakeSelectionSet(FakeObject):
+    __slots__ = ("_document", "_name", "_items")
+
+    def __init__(self, document, name):
+        self._faults = document._faults
+        self._document = document
+        self._name = name
+        self._items = []
+
+    def __iter__(self):
+        for entity in list(self._items):
+            self._faults.wait()
+            yield entity
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def Item(self, index):
+        try:
+            return self._items[index]
+        except (IndexError, TypeError):
+            raise com_error(_INVALID_ARGUMENT, "Invalid index", None, None)
+
+    def __select(self, entities, filter_type, filter_data):
+        if filter_type is not None:
+            filter_type = _values(filter_type)
+            filter_data = getattr(filter_data, "value", filter_data)
+            entities = [entity for entity in entities if _matches(entity, filter_type, filter_data)]
+        known = set(map(id, self._items))
+        self._items.extend(entity for entity in entities if id(entity) not in known and not entity._erased)
+
+    def SelectOnScreen(self, filter_type=None, filter_data=None):
+        """
+        Select entities picked by user: set by pick(), all entities of ModelSpace by default
+        """
+        picked = self._document._picked
+        self.__select(self._document._space._entities if picked is None else picked, filter_type, filter_data)
+
+    def Select(self, mode, point1=None, point2=None, filter_type=None, filter_data=None):
+        """
+        Select all entities of ModelSpace, selection by window and crossing is not simulated
+        """
+        self.__select(self._document._space._entities, filter_type, filter_data)
+
+    def SelectByPolygon(self, mode, points, filter_type=None, filter_data=None):
+        """
+        Select all entities of ModelSpace, selection by polygon and fence is not simulated
+        """
+        self.__select(self._document._space._entities, filter_type, filter_data)
+
+    def AddItems(self, items):
+        self.__select(getattr(items, "value", items), None, None)
+
+    def Clear(self):
+        del self._items[:]
+
+    def Erase(self):
+        for entity in self._items:
+            if not entity._erased:
+                self._document._space._remove(entity)
+        del self._items[:]
+
+    def Delete(self):
+        self._document._selection_sets._remove(self._name)
+
+
+class FakeSelectionSets(FakeObject):
+    __slots__ = ("_document", "_sets")
+
+    def __init__(self, document):
+        self._faults = document._faults
+        self._document = document
+        self._sets = {}
+
+    def __iter__(self):
+        for selection_set in list(self._sets.values()):
+            self._faults.wait()
+            yield selection_set
+
+    def _remove(self, name):
+        del self._sets[name]
+
+    @property
+    def Count(self):
+        return len(self._sets)
+
+    def Add(self, name):
+        if name in self._sets:
+            raise com_error(_DUPLICATE_KEY, "Duplicate record name", None, None)
+        self._sets[name] = FakeSelectionSet(self._document, name)
+        return self._sets[name]
+
+    def Item(self, index):
+        try:
+            if isinstance(index, str):
+                return self._sets[index]
+            return list(self._sets.values())[index]
+        except (KeyError, IndexError):
+            raise com_error(_INVALID_ARGUMENT, "Key not found", None, None)
+
+
+class FakeUtility(FakeObject):
+    """
+    Utility of document, Get* methods return responses given by feed(), user cancels when there are no responses
+        >>feed(doc, "text", (10.0, 20.0, 0.0))
+        >>doc.Utility.GetString(0, "Name")
+        'text'
+    Exception in responses is raised, e.g. com_error(-2145320928) for keyword input
+    """
+
+    __slots__ = ("_responses", "_prompts")
+
+    def __init__(self, document):
+        self._faults = document._faults
+        self._responses = []
+        self._prompts = []
+
+    def __next(self):
+        if not self._responses:
+            raise com_error(_USER_CANCEL, "Exception occurred.", None, None)
+        response = self._responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def Prompt(self, text):
+        self._prompts.append(text)
+
+    def InitializeUserInput(self, bits, keywords=""):
+        pass
+
+    def GetString(self, has_spaces, prompt=""):
+        return self.__next()
+
+    def GetKeyword(self, prompt=""):
+        return self.__next()
+
+    def GetInput(self):
+        return self.__next()
+
+    def GetInteger(self, prompt=""):
+        return int(self.__next())
+
+    def GetReal(self, prompt=""):
+        return float(self.__next())
+
+    def GetPoint(self, point=None, prompt=""):
+        return _point(self.__next())
+
+    def GetDistance(self, point=None, prompt=""):
+        return float(self.__next())
+
+    def GetEntity(self, prompt=""):
+        entity = self.__next()
+        return entity, entity.GetBoundingBox()[0]
+
+
+class FakeDocument(FakeObject):
+    __slots__ = ("_application", "_name", "_space", "_selection_sets", "_utility", "_picked", "_next_handle")
+
+    def __init__(self, application, name):
+        self._faults = application._faults
+        self._application = application
+        self._name = name
+        self._next_handle = 0x100
+        self._space = FakeBlock(self)
+        self._selection_sets = FakeSelectionSets(self)
+        self._utility = FakeUtility(self)
+        self._picked = None
+
+    def _new_handle(self):
+        self._next_handle += 1
+        return "{:X}".format(self._next_handle), 2000000000 + self._next_handle
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def Application(self):
+        return self._application
+
+    @property
+    def ModelSpace(self):
+        return self._space
+
+    @property
+    def SelectionSets(self):
+        return self._selection_sets
+
+    @property
+    def Utility(self):
+        return self._utility
+
+    def HandleToObject(self, handle):
+        try:
+            return self._space._index[handle]
+        except KeyError:
+            raise com_error(_INVALID_ARGUMENT, "Invalid handle", None, None)
+
+    def ObjectIdToObject(self, object_id):
+        return self.HandleToObject("{:X}".format(object_id - 2000000000))
+
+    def Regen(self, which):
+        pass
+
+    def Activate(self):
+        documents = self._application._documents._documents
+        documents.remove(self)
+        documents.append(self)
+
+    def Close(self, save=True):
+        self._application._documents._remove(self)
+
+
+class FakeDocuments(FakeObject):
+    __slots__ = ("_application", "_documents")
+
+    def __init__(self, application):
+        self._faults = application._faults
+        self._application = application
+        self._documents = []
+
+    def __iter__(self):
+        for document in list(self._documents):
+            self._faults.wait()
+            yield document
+
+    def _remove(self, document):
+        self._documents.remove(document)
+
+    @property
+    def Count(self):
+        return len(self._documents)
+
+    def Item(self, index):
+        try:
+            return self._documents[index]
+        except (IndexError, TypeError):
+            raise com_error(_INVALID_ARGUMENT, "Invalid index", None, None)
+
+    def Add(self, name=None):
+        document = FakeDocument(self._application, name or "Drawing{}.dwg".format(len(self._documents) + 1))
+        self._documents.append(document)
+        return document
+
+    def Open(self, name, read_only=False):
+        return self.Add(name)
+
+
+class FakeAutoCAD(FakeObject):
+    """
+    Fake AutoCAD.Application with one empty drawing
+
+        >>faults = Faults(latency=20e-6, busy_rate=0.01)
+        >>acad = COMRetryObjectWrapper(FakeAutoCAD(faults))
+        >>populate(acad.ActiveDocument.ModelSpace, 10000)
+        >>sum_length(acad.ActiveDocument.ModelSpace)
+    Fake objects are registered in COMRetryObjectWrapper wrapped types,
+    faults are retried by retry policy as busy AutoCAD ones
+    """
+
+    __slots__ = ("_documents", "_visible")
+
+    def __init__(self, faults=None):
+        """
+        :param faults: Faults object, no latency and faults if None
+        """
+        self._faults = faults or Faults()
+        self._visible = False
+        self._documents = FakeDocuments(self)
+        self._documents._documents.append(FakeDocument(self, "Drawing1.dwg"))
+
+    @property
+    def Name(self):
+        return "AutoCAD"
+
+    @property
+    def Visible(self):
+        return self._visible
+
+    @Visible.setter
+    def Visible(self, value):
+        self._visible = bool(value)
+
+    @property
+    def Documents(self):
+        return self._documents
+
+    @property
+    def ActiveDocument(self):
+        if not self._documents._documents:
+            raise com_error(_INVALID_ARGUMENT, "No active document", None, None)
+        return self._documents._documents[-1]
+
+    def Quit(self):
+        del self._documents._documents[:]
+
+
+def _fake(obj):
+    """
+    Get fake object from COMRetryObjectWrapper or AutoCAD
+    """
+    while not isinstance(obj, FakeObject):
+        obj = object.__getattribute__(obj, "_inner")
+    return obj
+
+
+def populate(space, count, kinds=("line", "polyline", "arc", "mline"), vertices=4, size=1000.0, seed=None):
+    """
+    Add random entities to fake ModelSpace without COM calls
+    :param space: FakeBlock or its wrapper
+    :param count: number of entities
+    :param kinds: types of entities taken in turn: "line", "polyline", "3dpolyline", "mline", "arc",
+                  "circle", "text"
+    :param vertices: number of vertices of polylines and mlines
+    :param size: size of square area with entities
+    :param seed: seed of random generator
+    :return: list of added entities
+    """
+    space = _fake(space)
+    document = space._document
+    random = Random(seed).random
+    added = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        x, y = random() * size, random() * size
+        if kind == "line":
+            entity = FakeLine(document, (x, y, 0.0), (x + random() * 10, y + random() * 10, 0.0))
+        elif kind == "polyline":
+            coordinates = []
+            for _ in range(vertices):
+                coordinates += [x, y]
+                x, y = x + random() * 10, y + random() * 10
+            entity = FakePolyline(document, coordinates)
+        elif kind in ("3dpolyline", "mline"):
+            coordinates = []
+            for _ in range(vertices):
+                coordinates += [x, y, 0.0]
+                x, y = x + random() * 10, y + random() * 10
+            entity = (Fake3dPolyline if kind == "3dpolyline" else FakeMline)(document, coordinates)
+        elif kind == "arc":
+            entity = FakeArc(document, (x, y, 0.0), 1 + random() * 10, random() * 2 * pi, random() * 2 * pi)
+        elif kind == "circle":
+            entity = FakeCircle(document, (x, y, 0.0), 1 + random() * 10)
+        elif kind == "text":
+            entity = FakeText(document, "Text {}".format(i), (x, y, 0.0), 2.5)
+        else:
+            raise ValueError("Unknown kind of entity: {}".format(kind))
+        added.append(space._append(entity))
+    return added
+
+
+def pick(document, entities=None):
+    """
+    Set entities user picks in SelectOnScreen of fake document
+    :param document: FakeDocument or its wrapper
+    :param entities: picked entities, all entities of ModelSpace if None
+    """
+    document = _fake(document)
+    document._picked = None if entities is None else [_fake(entity) for entity in entities]
+
+
+def feed(document, *responses):
+    """
+    Add responses of user to Get* methods of fake document Utility
+    :param document: FakeDocument or its wrapper
+    """
+    _fake(document)._utility._responses.extend(responses)
@@ -0,0 +1,276 @@
+"""
+    pyacadcom.geometry
+    ******************
+
+    Vectorized lengths and areas of AutoCAD entities computed from their geometry data, requires numpy
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import numpy as np
+
+
+def _points(coordinates, dim):
+    """
+    Get (N, dim) array view of flat coordinates (x1,y1,[z1],x2,y2,[z2],...) or of (N, dim) array
+    """
+    points = np.asarray(coordinates, dtype=np.float64)
+    if points.ndim == 1:
+        if points.size % dim != 0:
+            raise ValueError("coordinates length must be a multiple of {}".format(dim))
+        points = points.reshape(-1, dim)
+    return points
+
+
+# ObjectName -> number of values per vertex in Coordinates property
+COORDINATE_DIMENSIONS = {
+    "AcDbPolyline": 2,
+    "AcDb2dPolyline": 3,
+    "AcDb3dPolyline": 3,
+    "AcDbPolyFaceMesh": 3,
+    "AcDbPolygonMesh": 3,
+    "AcDbMline": 3,
+    "AcDbLeader": 3,
+    "AcDbFace": 3,
+    "AcDbSolid": 3,
+    "AcDbTrace": 3,
+    "AcDbPoint": 3,
+}
+
+
+def coordinate_dimension(object_name):
+    """
+    Number of values per vertex in Coordinates of entity: 2 for lightweight polylines, 3 for others
+    :param object_name: ObjectName of entity
+    """
+    try:
+        return COORDINATE_DIMENSIONS[object_name]
+    except KeyError:
+        raise ValueError("{} has no Coordinates property".format(object_name)) from None
+
+
+def decode_coordinates(coordinates, dim=None, object_name=None):
+    """
+    Get (N, dim) array of vertices from flat Coordinates without Python object per vertex.
+    Arrays and buffers (array.array, memoryview) are viewed without copying,
+    tuple returned by COM is copied once into contiguous array.
+        >>points = decode_coordinates(polyline.Coordinates, object_name="AcDbPolyline")
+        >>points.shape
+        (100000, 2)
+    :param coordinates: flat coordinates (x1,y1,[z1],x2,y2,[z2],...), VARIANT, array or buffer
+    :param dim: number of values per vertex, found by object_name if None
+    :param object_name: ObjectName of entity
+    :return: (N, dim) array
+    """
+    if dim is None:
+        if object_name is None:
+            raise ValueError("dim or object_name is required")
+        dim = coordinate_dimension(object_name)
+    return _points(getattr(coordinates, "value", coordinates), dim)
+
+
+def entity_points(entity, object_name=None):
+    """
+    Read Coordinates of entity as (N, 2) or (N, 3) array, dimension is found by type of entity
+    :param entity: AutoCAD entity with Coordinates property
+    :param object_name: ObjectName of entity if already known
+    :return: array of vertices
+    """
+    return decode_coordinates(entity.Coordinates, object_name=object_name or entity.ObjectName)
+
+
+def bounding_box(points):
+    """
+    Bounding box of vertices
+    :param points: (N, dim) array of vertices
+    :return: (min point, max point) arrays
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        raise ValueError("bounding box of no points")
+    return points.min(axis=0), points.max(axis=0)
+
+
+def _bulge_factor(bulges):
+    """
+    Ratio of arc length to chord length for segments with bulges (tangent of quarter of arc angle)
+    """
+    theta = 4 * np.arctan(np.abs(bulges))
+    half = np.sin(theta / 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(half > 0, theta / (2 * np.where(half > 0, half, 1)), 1.0)
+
+
+def line_lengths(starts, ends):
+    """
+    Lengths of lines
+    :param starts: (N, 3) array of start points
+    :param ends: (N, 3) array of end points
+    :return: (N,) array of lengths
+    """
+    return np.linalg.norm(np.asarray(ends, dtype=np.float64) - np.asarray(starts, dtype=np.float64), axis=-1)
+
+
+def segment_lengths(coordinates, dim=3, closed=False):
+    """
+    Lengths of straight segments of polyline
+    :param coordinates: flat coordinates or (N, dim) array of vertices
+    :param dim: 2 for lightweight polylines, 3 for 3D polylines and mlines
+    :param closed: add segment from last vertex to first
+    :return: (N-1,) or (N,) if closed array of lengths
+    """
+    points = _points(coordinates, dim)
+    if closed and len(points) > 1:
+        points = np.concatenate((points, points[:1]))
+    return np.linalg.norm(np.diff(points, axis=0), axis=1)
+
+
+def polyline_length(coordinates, dim=2, bulges=None, closed=False):
+    """
+    Length of polyline
+    :param coordinates: flat coordinates or (N, dim) array of vertices
+    :param dim: 2 for lightweight polylines, 3 for 3D polylines and mlines
+    :param bulges: bulge of every vertex (lightweight polylines), None for straight segments
+    :param closed: polyline is closed
+    :return: length
+    """
+    chords = segment_lengths(coordinates, dim, closed)
+    if bulges is not None:
+        bulges = np.asarray(bulges, dtype=np.float64)[:len(chords)]
+        chords = chords * _bulge_factor(bulges)
+    return float(chords.sum())
+
+
+def polyline_area(coordinates, bulges=None):
+    """
+    Area of closed lightweight polyline (open polylines are closed by straight segment as AutoCAD does)
+    :param coordinates: flat (x1,y1,x2,y2,...) coordinates or (N, 2) array of vertices
+    :param bulges: bulge of every vertex, None for straight segments
+    :return: area
+    """
+    points = _points(coordinates, 2)[:, :2]
+    if len(points) < 2:
+        return 0.0
+    following = np.roll(points, -1, axis=0)
+    area = (points[:, 0] * following[:, 1] - following[:, 0] * points[:, 1]).sum() / 2
+    if bulges is not None:
+        bulges = np.asarray(bulges, dtype=np.float64)[:len(points)]
+        chords = np.linalg.norm(following - points, axis=1)
+        theta = 4 * np.arctan(np.abs(bulges))
+        half = np.sin(theta / 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            radii = np.where(half > 0, chords / (2 * np.where(half > 0, half, 1)), 0.0)
+        # segment between chord and arc, positive bulge turns counterclockwise
+        area += (np.sign(bulges) * radii ** 2 / 2 * (theta - np.sin(theta))).sum()
+    return float(abs(area))
+
+
+def polylines_total_length(polylines, dim=2):
+    """
+    Total length of many polylines in one reduction
+    :param polylines: iterable of (coordinates, bulges or None, closed) tuples
+    :param dim: 2 for lightweight polylines, 3 for 3D polylines and mlines
+    :return: total length
+    """
+    chunks = []
+    factors = []
+    for coordinates, bulges, closed in polylines:
+        points = _points(coordinates, dim)
+        if len(points) < 2:
+            continue
+        if closed:
+            points = np.concatenate((points, points[:1]))
+        chunks.append(points)
+        # zero factor removes segment between last vertex of polyline and first vertex of next one
+        factor = np.ones(len(points))
+        factor[-1] = 0.0
+        if bulges is not None:
+            factor[:-1] = _bulge_factor(np.asarray(bulges, dtype=np.float64)[:len(points) - 1])
+        factors.append(factor)
+    if not chunks:
+        return 0.0
+    points = np.concatenate(chunks)
+    factor = np.concatenate(factors)[:-1]
+    return float((np.linalg.norm(np.diff(points, axis=0), axis=1) * factor).sum())
+
+
+def arc_sweeps(start_angles, end_angles):
+    """
+    Angles of arcs going counterclockwise from start angle to end angle as AutoCAD arcs do
+    :return: (N,) array of angles in radians
+    """
+    sweep = np.mod(np.asarray(end_angles, dtype=np.float64) - np.asarray(start_angles, dtype=np.float64), 2 * np.pi)
+    return np.where(sweep == 0, 2 * np.pi, sweep)
+
+
+def arc_lengths(radii, start_angles, end_angles):
+    """
+    Lengths of arcs
+    :param radii: (N,) radii
+    :param start_angles: (N,) start angles in radians
+    :param end_angles: (N,) end angles in radians
+    :return: (N,) array of lengths
+    """
+    return np.asarray(radii, dtype=np.float64) * arc_sweeps(start_angles, end_angles)
+
+
+def arc_areas(radii, start_angles, end_angles):
+    """
+    Areas between arcs and their chords
+    :return: (N,) array of areas
+    """
+    sweep = arc_sweeps(start_angles, end_angles)
+    return np.asarray(radii, dtype=np.float64) ** 2 / 2 * (sweep - np.sin(sweep))
+
+
+def circle_lengths(radii):
+    """
+    Circumferences of circles
+    :return: (N,) array of lengths
+    """
+    return 2 * np.pi * np.asarray(radii, dtype=np.float64)
+
+
+def circle_areas(radii):
+    """
+    Areas of circles
+    :return: (N,) array of areas
+    """
+    return np.pi * np.asarray(radii, dtype=np.float64) ** 2
+
+
+def total_length(geometries):
+    """
+    Total length of entities given by geometry data, entities of one type are summed in one reduction
+    :param geometries: iterable of (ObjectName, data) tuples, where data is
+                        AcDbLine: (StartPoint, EndPoint)
+                        AcDbPolyline: (Coordinates, bulges or None, Closed)
+                        AcDb3dPolyline: (Coordinates, Closed)
+                        AcDbMline: (Coordinates,)
+                        AcDbArc: (Radius, StartAngle, EndAngle)
+                        AcDbCircle: (Radius,)
+    :return: total length
+    """
+    groups = {}
+    for object_name, data in geometries:
+        groups.setdefault(object_name, []).append(data)
+    total = 0.0
+    for object_name, items in groups.items():
+        if object_name == "AcDbLine":
+            starts, ends = zip(*items)
+            total += line_lengths(starts, ends).sum()
+        elif object_name == "AcDbPolyline":
+            total += polylines_total_length(items, dim=2)
+        elif object_name == "AcDb3dPolyline":
+            total += polylines_total_length(((coordinates, None, closed) for coordinates, closed in items), dim=3)
+        elif object_name == "AcDbMline":
+            total += polylines_total_length(((item[0], None, False) for item in items), dim=3)
+        elif object_name == "AcDbArc":
+            radii, start_angles, end_angles = zip(*items)
+            total += arc_lengths(radii, start_angles, end_angles).sum()
+        elif object_name == "AcDbCircle":
+            total += circle_lengths([item[0] for item in items]).sum()
+        else:
+            raise ValueError("Length of {} can not be computed locally".format(object_name))
+    return float(total)
@@ -0,0 +1,185 @@
+"""
+    pyacadcom.metrics
+    ******************
+
+    Opt-in metrics of COM calls made through pyacadcom.api wrappers
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+
+# seconds: upper bounds of latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+def _label(value):
+    """
+    Escape label value for Prometheus text format: backslash, double quote and line feed
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# active collectors, COM wrappers skip all measurements while it is empty
+_collectors = []
+
+
+class COMMetrics:
+    """
+    Collector of COM call metrics: calls, errors and latency histogram per member,
+    retries per hresult, time spent sleeping in retry backoff and timeouts
+
+        >>with measure() as metrics:
+        >>    sum_length(selset)
+        >>metrics.as_dict()["calls"]
+        {'Count': 1, 'ObjectName': 2400, 'Length': 1800, ...}
+        >>print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.errors = {}
+            self.latency = {}
+            self.latency_sum = {}
+            self.retries = {}
+            self.sleep_time = 0.0
+            self.timeouts = 0
+
+    def record_call(self, member, seconds):
+        with self._lock:
+            self.calls[member] = self.calls.get(member, 0) + 1
+            self.latency_sum[member] = self.latency_sum.get(member, 0.0) + seconds
+            histogram = self.latency.get(member)
+            if histogram is None:
+                histogram = self.latency[member] = [0] * len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[i] += 1
+                    break
+
+    def record_error(self, member):
+        with self._lock:
+            self.errors[member] = self.errors.get(member, 0) + 1
+
+    def record_retry(self, hresult, delay):
+        with self._lock:
+            self.retries[hresult] = self.retries.get(hresult, 0) + 1
+            self.sleep_time += delay
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self):
+        """
+        Export metrics to dict
+        :return: {"calls": {member: count}, "errors": {member: count},
+                  "latency": {member: {"buckets": {bound: count}, "sum": seconds}},
+                  "retries": {hresult: count}, "sleep_time": seconds, "timeouts": count}
+        """
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "errors": dict(self.errors),
+                "latency": {member: {"buckets": dict(zip(self.buckets, histogram)),
+                                     "sum": self.latency_sum[member]}
+                            for member, histogram in self.latency.items()},
+                "retries": dict(self.retries),
+                "sleep_time": self.sleep_time,
+                "timeouts": self.timeouts,
+            }
+
+    def to_prometheus(self, prefix="pyacadcom"):
+        """
+        Export metrics in Prometheus text exposition format
+        :param prefix: prefix of metric names
+        :return: text
+        """
+        data = self.as_dict()
+        lines = ["# TYPE {}_com_calls_total counter".format(prefix)]
+        for member, count in sorted(data["calls"].items()):
+            lines.append('{}_com_calls_total{{member="{}"}} {}'.format(prefix, _label(member), count))
+        lines.append("# TYPE {}_com_errors_total counter".format(prefix))
+        for member, count in sorted(data["errors"].items()):
+            lines.append('{}_com_errors_total{{member="{}"}} {}'.format(prefix, _label(member), count))
+        lines.append("# TYPE {}_com_call_seconds histogram".format(prefix))
+        for member, latency in sorted(data["latency"].items()):
+            member = _label(member)
+            total = 0
+            for bound, count in latency["buckets"].items():
+                total += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append('{}_com_call_seconds_bucket{{member="{}",le="{}"}} {}'.format(prefix, member, le, total))
+            lines.append('{}_com_call_seconds_sum{{member="{}"}} {}'.format(prefix, member, latency["sum"]))
+            lines.append('{}_com_call_seconds_count{{member="{}"}} {}'.format(prefix, member, total))
+        lines.append("# TYPE {}_com_retries_total counter".format(prefix))
+        for hresult, count in sorted(data["retries"].items(), key=lambda item: str(item[0])):
+            lines.append('{}_com_retries_total{{hresult="{}"}} {}'.format(prefix, _label(hresult), count))
+        lines.append("# TYPE {}_com_backoff_seconds_total counter".format(prefix))
+        lines.append("{}_com_backoff_seconds_total {}".format(prefix, data["sleep_time"]))
+        lines.append("# TYPE {}_com_timeouts_total counter".format(prefix))
+        lines.append("{}_com_timeouts_total {}".format(prefix, data["timeouts"]))
+        return "\n".join(lines) + "\n"
+
+
+def enable(metrics):
+    """
+    Start collecting COM metrics to collector
+    :param metrics: COMMetrics object
+    """
+    if metrics not in _collectors:
+        _collectors.append(metrics)
+
+
+def disable(metrics):
+    """
+    Stop collecting COM metrics to collector
+    :param metrics: COMMetrics object
+    """
+    if metrics in _collectors:
+        _collectors.remove(metrics)
+
+
+@contextmanager
+def measure(metrics=None):
+    """
+    Context manager to collect metrics of COM calls made in block, scopes can be nested
+    :param metrics: COMMetrics object to add metrics to, new one if None
+    :return: COMMetrics object
+    """
+    if metrics is None:
+        metrics = COMMetrics()
+    enable(metrics)
+    try:
+        yield metrics
+    finally:
+        disable(metrics)
+
+
+def record_call(member, seconds):
+    for metrics in _collectors:
+        metrics.record_call(member, seconds)
+
+
+def record_error(member):
+    for metrics in _collectors:
+        metrics.record_error(member)
+
+
+def record_retry(error, delay):
+    hresult = getattr(error, "hresult", type(error).__name__)
+    for metrics in _collectors:
+        metrics.record_retry(hresult, delay)
+
+
+def record_timeout():
+    for metrics in _collectors:
+        metrics.record_timeout()
@@ -0,0 +1,366 @@
+"""
+    pyacadcom.pool
+    ******************
+
+    Pool of separate AutoCAD processes for parallel drawing-level batch jobs
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class InstanceCrashError(RuntimeError):
+    """
+    AutoCAD process of pool worker exited while running job
+    """
+
+
+class InstanceHangError(TimeoutError):
+    """
+    Job did not finish in time, AutoCAD process of pool worker was killed
+    """
+
+
+def new_instance(visible=False):
+    """
+    Start new AutoCAD process, default factory of AutoCADPool
+    """
+    from .api import AutoCAD
+    return AutoCAD(Visible=visible, new_instance=True)
+
+
+def window_process_id(app):
+    """
+    Get process id of AutoCAD application by its main window, default application_pid of AutoCADPool
+    """
+    import win32process
+    return win32process.GetWindowThreadProcessId(app.HWND)[1]
+
+
+@contextmanager
+def com_apartment():
+    """
+    Initialize COM for worker process, default worker context of AutoCADPool
+    """
+    import pythoncom
+    pythoncom.CoInitialize()
+    try:
+        yield
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def _quit(app):
+    try:
+        app.Quit()
+    except Exception:
+        pass
+
+
+def _terminate(pid):
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        # process already exited
+        pass
+
+
+def _worker_main(factory, shutdown, application_pid, worker_context, connection):
+    """
+    Main function of worker process: create application and run jobs received from pool
+    """
+    try:
+        if worker_context is None:
+            _serve_jobs(factory, shutdown, application_pid, connection)
+            return
+        with worker_context():
+            _serve_jobs(factory, shutdown, application_pid, connection)
+    except BaseException as error:
+        # worker context failed, pool gets error instead of ready message
+        try:
+            connection.send(("error", error))
+        except OSError:
+            pass
+    finally:
+        connection.close()
+
+
+def _serve_jobs(factory, shutdown, application_pid, connection):
+    """
+    Create application, send its process id to pool and run jobs until pool sends None
+    """
+    try:
+        app = factory()
+    except BaseException as error:
+        connection.send(("error", error))
+        return
+    try:
+        pid = application_pid(app) if application_pid is not None else None
+    except BaseException as error:
+        # untracked application would outlive worker process
+        if shutdown is not None:
+            shutdown(app)
+        connection.send(("error", error))
+        return
+    connection.send(("ready", pid))
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+        function, args, kwargs = job
+        try:
+            result = ("ok", function(app, *args, **kwargs))
+        except BaseException as error:
+            result = ("error", error)
+        try:
+            connection.send(result)
+        except Exception as error:
+            # COM objects and other unpicklable results can not leave worker process
+            connection.send(("error", TypeError("Job result can not be sent from worker: {}".format(error))))
+    if shutdown is not None:
+        shutdown(app)
+
+
+class _Instance:
+    """
+    Worker process with its own AutoCAD instance
+    """
+
+    def __init__(self, context, factory, shutdown, application_pid, worker_context, start_timeout):
+        # process id of application, it is terminated with worker process
+        self.pid = None
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main,
+                                       args=(factory, shutdown, application_pid, worker_context, child),
+                                       daemon=True)
+        self.process.start()
+        child.close()
+        if not self.connection.poll(start_timeout):
+            self.kill()
+            raise InstanceHangError("AutoCAD instance did not start in {} seconds".format(start_timeout))
+        try:
+            status, value = self.connection.recv()
+        except EOFError:
+            self.kill()
+            raise InstanceCrashError("AutoCAD instance exited while starting")
+        if status == "error":
+            self.kill()
+            raise value
+        self.pid = value
+
+    def run(self, function, args, kwargs, timeout):
+        """
+        Run job in worker process
+        :return: ("ok", result) or ("error", exception raised by job)
+        """
+        try:
+            self.connection.send((function, args, kwargs))
+            finished = self.connection.poll(timeout)
+            if finished:
+                return self.connection.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise InstanceCrashError("AutoCAD instance exited with code {}".format(self.process.exitcode))
+        self.kill()
+        raise InstanceHangError("Job did not finish in {} seconds".format(timeout))
+
+    def close(self, timeout):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.connection.close()
+
+    def kill(self):
+        """
+        Kill worker process and AutoCAD process started by it
+        """
+        self.process.kill()
+        self.process.join()
+        if self.pid is not None:
+            _terminate(self.pid)
+
+
+class AutoCADPool:
+    """
+    Pool of N AutoCAD processes owned by pool. Jobs are functions of application object and arguments,
+    they run in worker processes, so functions, arguments and results must be picklable
+    (module level functions, file names, numbers; not COM objects).
+    Instance which crashed or hung is restarted and job is retried.
+
+        >>def count_lines(app, path):
+        >>    document = app.Documents.Open(path)
+        >>    try:
+        >>        return sum(1 for item in document.ModelSpace if item.ObjectName == "AcDbLine")
+        >>    finally:
+        >>        document.Close(False)
+        >>
+        >>with AutoCADPool(4, job_timeout=600) as pool:
+        >>    counts = pool.map(count_lines, paths)
+        >>    pool.stats()
+        {'size': 4, 'queue_depth': 0, 'jobs': 120, 'failed': 0, 'crashes': 1, 'hangs': 0, 'restarts': 1}
+    Scripts using pool must start it under if __name__ == "__main__": as multiprocessing requires.
+    """
+
+    def __init__(self, size=2, factory=new_instance, job_timeout=None, start_timeout=300.0, retries=1,
+                 shutdown=_quit, worker_context=com_apartment, application_pid=window_process_id):
+        """
+        :param size: number of AutoCAD instances
+        :param factory: picklable function creating application object in worker process,
+                        new invisible AutoCAD instance by default
+        :param job_timeout: seconds to wait for job before instance is considered hung, no limit if None
+        :param start_timeout: seconds to wait for instance to start
+        :param retries: number of times job is retried after crash or hang of instance
+        :param shutdown: picklable function called with application object when pool is closed,
+                         quits AutoCAD by default
+        :param worker_context: picklable function returning context manager entered in worker process
+                               around factory and jobs, initializes COM by default;
+                               None for factories not using COM, then pool does not need pywin32
+        :param application_pid: picklable function returning process id of application object in worker
+                                process, the process is terminated when instance crashes or hangs;
+                                process id of AutoCAD main window by default, None to not track it
+        """
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.size = size
+        self.factory = factory
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.retries = retries
+        self.shutdown = shutdown
+        self.worker_context = worker_context
+        self.application_pid = application_pid
+        self.jobs = 0
+        self.failed = 0
+        self.crashes = 0
+        self.hangs = 0
+        self.restarts = 0
+        self._close_timeout = 60.0
+        self._context = multiprocessing.get_context("spawn")
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """
+        Start worker threads, each of them starts its AutoCAD instance on first job
+        """
+        if self._threads:
+            return self
+        for number in range(self.size):
+            thread = threading.Thread(target=self.__serve, name="pyacadcom-pool-{}".format(number), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def close(self, timeout=60.0):
+        """
+        Finish queued jobs, close AutoCAD instances and stop workers
+        :param timeout: seconds to wait for each instance to quit
+        """
+        self._close_timeout = timeout
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queue job function(app, *args, **kwargs)
+        :return: concurrent.futures.Future of job result
+        """
+        if not self._threads:
+            raise RuntimeError("Pool is not started")
+        future = Future()
+        self._queue.put((future, function, args, kwargs))
+        return future
+
+    def map(self, function, items, return_exceptions=False):
+        """
+        Run function(app, item) for every item
+        :param return_exceptions: put exceptions in result list instead of raising first of them
+        :return: list of results in order of items
+        """
+        futures = [self.submit(function, item) for item in items]
+        if not return_exceptions:
+            return [future.result() for future in futures]
+        return [future.exception() or future.result() for future in futures]
+
+    def stats(self):
+        """
+        :return: {"size", "queue_depth": jobs waiting, "jobs": jobs done, "failed": jobs failed,
+                  "crashes", "hangs": failures of instances, "restarts": instances started again}
+        """
+        with self._lock:
+            return {"size": self.size, "queue_depth": self._queue.qsize(), "jobs": self.jobs,
+                    "failed": self.failed, "crashes": self.crashes, "hangs": self.hangs, "restarts": self.restarts}
+
+    def __count(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __serve(self):
+        instance = None
+        started = False
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                future, function, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                attempt = 0
+                while True:
+                    try:
+                        if instance is None:
+                            if started:
+                                self.__count(restarts=1)
+                            started = True
+                            instance = _Instance(self._context, self.factory, self.shutdown,
+                                                 self.application_pid, self.worker_context, self.start_timeout)
+                        status, value = instance.run(function, args, kwargs, self.job_timeout)
+                    except (InstanceCrashError, InstanceHangError) as error:
+                        instance = None
+                        if isinstance(error, InstanceHangError):
+                            self.__count(hangs=1)
+                        else:
+                            self.__count(crashes=1)
+                        if attempt < self.retries:
+                            attempt += 1
+                            continue
+                        status, value = "error", error
+                    except BaseException as error:
+                        # factory failed, next job starts instance again
+                        instance = None
+                        status, value = "error", error
+                    break
+                if status == "ok":
+                    self.__count(jobs=1)
+                    future.set_result(value)
+                else:
+                    self.__count(jobs=1, failed=1)
+                    future.set_exception(value)
+        finally:
+            if instance is not None:
+                instance.close(self._close_timeout)
+
@@ -0,0 +1,513 @@
+"""
+    pyacadcom.replay
+    ******************
+
+    Recording of COM sessions into trace files and replaying them without AutoCAD
+    for offline profiling and regression benchmarks. Recording needs pywin32, replay works without it
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+import builtins
+import gzip
+import json
+import platform
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter, sleep, strftime
+from types import MethodType
+
+from . import __version__
+from ._compat import _ERRORCODES, com_error
+
+try:
+    from . import api
+except ImportError:
+    # no pywin32: replayed objects are used without retry wrappers
+    api = None
+
+FORMAT = "pyacadcom-trace"
+VERSION = 1
+
+# operations of trace events
+GET = "get"
+SET = "set"
+CALL = "call"
+ITER = "iter"
+
+_UNKNOWN_NAME = -2147352570
+
+
+class ReplayError(RuntimeError):
+    """
+    Script made COM operation different from the one recorded in trace
+    """
+
+    def __init__(self, position, expected, actual):
+        super().__init__("trace event {}: recorded {}, script made {}".format(position, expected, actual))
+        self.position = position
+        self.expected = expected
+        self.actual = actual
+
+
+def _is_com(value):
+    # registered types are read from api on every check as they can be added later
+    return api is not None and isinstance(value, api._TYPES_TO_WRAP) and \
+        not isinstance(value, (_Recorded, _Replayed))
+
+
+def _unwrap(value):
+    if api is not None and isinstance(value, api.COMRetryObjectWrapper):
+        return object.__getattribute__(value, "_inner")
+    return value
+
+
+def _retried(result):
+    """
+    Check if recorded result is busy AutoCAD error retried by default retry policy
+    """
+    if not isinstance(result, dict) or "$error" not in result:
+        return False
+    error = result["$error"]
+    return error == "AttributeError" or error == "com_error" and result["hresult"] in _ERRORCODES
+
+
+def _encode(value):
+    """
+    Encode value for trace: COM objects as {"$o": number}, VARIANT as {"$v": type, "value": value},
+    sequences as lists, unknown objects as {"$r": repr}
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    value = _unwrap(value)
+    if isinstance(value, (_Recorded, _Replayed)):
+        return {"$o": value._oid}
+    if _is_com(value):
+        # object got not through recorded session
+        return {"$o": None}
+    if isinstance(value, (tuple, list)):
+        return [_encode(item) for item in value]
+    if hasattr(value, "varianttype"):
+        return {"$v": value.varianttype, "value": _encode(value.value)}
+    if hasattr(value, "tolist"):
+        return _encode(value.tolist())
+    return {"$r": repr(value)}
+
+
+class Recorder:
+    """
+    Writes every property read, property write, method call and iteration of recorded COM objects
+    with arguments, results and time into gzip compressed JSON lines trace file.
+    COM objects are written as {"$o": number}, VARIANT as {"$v": type, "value": value},
+    failed attempts, including busy errors retried by retry policy, as {"$error": type, ...}.
+
+        >>with record("session.trace.gz") as acad:
+        >>    main(acad)
+    """
+
+    def __init__(self, path):
+        """
+        :param path: trace file, gzip compressed JSON lines
+        """
+        if api is None:
+            raise ImportError("recording of COM session requires pywin32")
+        self.path = path
+        self.events = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        self._objects = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"format": FORMAT, "version": VERSION, "pyacadcom": __version__,
+                     "python": platform.python_version(), "created": strftime("%Y-%m-%dT%H:%M:%S")})
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def stats(self):
+        return {"events": self.events, "errors": self.errors, "objects": self._objects, "seconds": self.seconds}
+
+    def application(self, inner=None):
+        """
+        Get recorded application wrapped by COMRetryObjectWrapper
+        :param inner: COM object of AutoCAD application, AutoCAD.Application is dispatched if None
+        """
+        if inner is None:
+            from win32com.client import Dispatch
+            inner = Dispatch("AutoCAD.Application")
+        if isinstance(inner, api.AutoCAD):
+            inner = object.__getattribute__(inner, "_inner")
+        api.register_wrapped_type(_Recorded)
+        return api.COMRetryObjectWrapper(self._recorded(_unwrap(inner)))
+
+    def _recorded(self, inner):
+        with self._lock:
+            oid = self._objects
+            self._objects += 1
+        return _Recorded(inner, self, oid)
+
+    def _result(self, value):
+        """
+        Encode result, new COM objects are recorded as well
+        :return: (encoded value, value for script)
+        """
+        if _is_com(value):
+            recorded = self._recorded(value)
+            return {"$o": recorded._oid}, recorded
+        if isinstance(value, (tuple, list)) and any(_is_com(item) for item in value):
+            pairs = [self._result(item) for item in value]
+            return [pair[0] for pair in pairs], tuple(pair[1] for pair in pairs)
+        return _encode(value), value
+
+    def _error(self, error, owner, member):
+        if isinstance(error, com_error):
+            return {"$error": "com_error", "hresult": error.hresult, "args": _encode(list(error.args[1:]))}
+        if isinstance(error, AttributeError) and member is not None:
+            # name unknown to COM object fails the same way in replay, busy AutoCAD error is retried
+            try:
+                owner._oleobj_.GetIDsOfNames(0, member)
+            except com_error as unknown:
+                if unknown.hresult == _UNKNOWN_NAME:
+                    return {"$error": "com_error", "hresult": _UNKNOWN_NAME, "args": ["Unknown name.", None, None]}
+            except AttributeError:
+                pass
+        return {"$error": type(error).__name__, "text": str(error)}
+
+    def _record(self, op, obj, member, args, function):
+        start = perf_counter()
+        try:
+            value = function()
+        except Exception as error:
+            self._failed(op, obj, member, args, error, perf_counter() - start)
+            raise
+        return self._succeeded(op, obj, member, args, value, perf_counter() - start)
+
+    def _failed(self, op, obj, member, args, error, seconds):
+        self.__event(op, obj, member, args, self._error(error, obj._inner, member if op == GET else None),
+                     seconds, True)
+
+    def _succeeded(self, op, obj, member, args, value, seconds):
+        """
+        :return: value for script, COM objects are replaced by recorded ones
+        """
+        if op == ITER:
+            pairs = [self._result(item) for item in value]
+            encoded, value = [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+        else:
+            encoded, value = self._result(value)
+        self.__event(op, obj, member, args, encoded, seconds, False)
+        return value
+
+    def __event(self, op, obj, member, args, result, seconds, error):
+        with self._lock:
+            if self._file is None:
+                raise ValueError("trace file is closed")
+            self.events += 1
+            self.errors += error
+            self.seconds += seconds
+            self._write([op, obj._oid, member, _encode(list(args)), result, round(seconds, 7)])
+
+
+def _real(value):
+    """
+    Get COM object to pass to AutoCAD instead of wrapper or recorded object
+    """
+    value = _unwrap(value)
+    if isinstance(value, _Recorded):
+        return value._inner
+    if isinstance(value, (tuple, list)) and any(_real(item) is not item for item in value):
+        return type(value)(_real(item) for item in value)
+    return value
+
+
+class _Recorded:
+    """
+    Recorded COM object: members are read from real object and written to trace
+    """
+
+    __slots__ = ("_inner", "_recorder", "_oid")
+
+    def __init__(self, inner, recorder, oid):
+        object.__setattr__(self, "_inner", inner)
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_oid", oid)
+
+    def __repr__(self):
+        return "<recorded {} {!r}>".format(self._oid, self._inner)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        inner = self._inner
+        if name.startswith("_"):
+            # _oleobj_ and other pywin32 internals are not COM members
+            return getattr(inner, name)
+        recorder = self._recorder
+        start = perf_counter()
+        try:
+            value = getattr(inner, name)
+        except Exception as error:
+            recorder._failed(GET, self, name, (), error, perf_counter() - start)
+            raise
+        if type(value) is MethodType:
+            # methods are recorded when called
+            return MethodType(_recorded_method(name), self)
+        return recorder._succeeded(GET, self, name, (), value, perf_counter() - start)
+
+    def __setattr__(self, name, value):
+        inner = self._inner
+        self._recorder._record(SET, self, name, (value,), lambda: setattr(inner, name, _real(value)))
+
+    def __call__(self, *args):
+        return self._recorder._record(CALL, self, "__call__", args, lambda: self._inner(*(_real(a) for a in args)))
+
+    def __iter__(self):
+        return iter(self._recorder._record(ITER, self, None, (), lambda: list(self._inner)))
+
+
+def _recorded_method(name):
+    def method(self, *args):
+        function = getattr(self._inner, name)
+        return self._recorder._record(CALL, self, name, args, lambda: function(*(_real(a) for a in args)))
+    method.__name__ = name
+    return method
+
+
+@contextmanager
+def record(path, inner=None):
+    """
+    Record COM session of block into trace file
+        >>with record("session.trace.gz") as acad:
+        >>    tool.sum_length(acad.ActiveDocument.ModelSpace)
+    :param path: trace file
+    :param inner: COM object of AutoCAD application, AutoCAD.Application is dispatched if None
+    :return: recorded application wrapped by COMRetryObjectWrapper, Recorder is in its _recorder attribute
+    """
+    with Recorder(path) as recorder:
+        yield recorder.application(inner)
+
+
+def read_trace(path):
+    """
+    Read trace file
+    :return: (header, list of events [operation, object, member, arguments, result, seconds])
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError("{} is not pyacadcom trace of version {}".format(path, VERSION))
+        return header, [json.loads(line) for line in file]
+
+
+def profile(path):
+    """
+    Summary of recorded COM time by member
+        >>profile("session.trace.gz")[:2]
+        [('call Item', 12000, 0, 3.81), ('get ObjectName', 12000, 14, 1.02)]
+    :param path: trace file
+    :return: list of (operation and member, calls, errors, seconds) by descending seconds
+    """
+    calls = Counter()
+    errors = Counter()
+    seconds = defaultdict(float)
+    for op, oid, member, args, result, elapsed in read_trace(path)[1]:
+        key = "{} {}".format(op, member) if member else op
+        calls[key] += 1
+        seconds[key] += elapsed
+        if isinstance(result, dict) and "$error" in result:
+            errors[key] += 1
+    return sorted(((key, calls[key], errors[key], seconds[key]) for key in calls), key=lambda row: -row[3])
+
+
+class _OleObject:
+    """
+    IDispatch of replayed object for name check after AttributeError
+    """
+
+    __slots__ = ()
+
+    def GetIDsOfNames(self, lcid, name):
+        return 0
+
+
+class _Replayed:
+    """
+    COM object of replayed session: operations are checked against trace and recorded results are returned
+    """
+
+    __slots__ = ("_player", "_oid")
+
+    def __init__(self, player, oid):
+        object.__setattr__(self, "_player", player)
+        object.__setattr__(self, "_oid", oid)
+
+    def __repr__(self):
+        return "<replayed {}>".format(self._oid)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "_oleobj_":
+            return _OleObject()
+        if name.startswith("_"):
+            raise AttributeError(name)
+        player = self._player
+        if player._next_is(CALL, self._oid, name):
+            return MethodType(_replayed_method(name), self)
+        return player._replay(GET, self, name, ())
+
+    def __setattr__(self, name, value):
+        self._player._replay(SET, self, name, (value,))
+
+    def __call__(self, *args):
+        return self._player._replay(CALL, self, "__call__", args)
+
+    def __iter__(self):
+        return iter(self._player._replay(ITER, self, None, ()))
+
+
+def _replayed_method(name):
+    def method(self, *args):
+        return self._player._replay(CALL, self, name, args)
+    method.__name__ = name
+    return method
+
+
+class Player:
+    """
+    Replays trace: every COM operation of script must match next recorded event,
+    recorded results and errors are returned, recorded COM time can be simulated.
+    Busy errors retried in recorded session are skipped, so script does not wait for retry delays
+
+        >>with replay("session.trace.gz", timing=1.0) as acad:
+        >>    main(acad)
+    """
+
+    def __init__(self, path, timing=0.0, check_args=True):
+        """
+        :param path: trace file
+        :param timing: share of recorded COM time to sleep on every operation, 0 - no waiting, 1.0 - as recorded
+        :param check_args: compare arguments of calls and written values with recorded ones
+        """
+        self.path = path
+        self.header, self._events = read_trace(path)
+        self.timing = timing
+        self.check_args = check_args
+        self.position = 0
+        self.seconds = 0.0
+        self._objects = {}
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {"events": len(self._events), "replayed": self.position, "seconds": self.seconds}
+
+    @property
+    def finished(self):
+        return self.position >= len(self._events)
+
+    def application(self):
+        """
+        Get replayed application wrapped by COMRetryObjectWrapper with retry policy without delays,
+        replayed application object itself without pywin32
+        """
+        if api is None:
+            return self._object(0)
+        api.register_wrapped_type(_Replayed)
+        return api.COMRetryObjectWrapper(self._object(0), _replay_policy())
+
+    def _object(self, oid):
+        obj = self._objects.get(oid)
+        if obj is None:
+            obj = self._objects[oid] = _Replayed(self, oid)
+        return obj
+
+    def _next_is(self, op, oid, member):
+        if self.position >= len(self._events):
+            return False
+        event = self._events[self.position]
+        return event[0] == op and event[1] == oid and event[2] == member
+
+    def _decode(self, value):
+        if isinstance(value, list):
+            return tuple(self._decode(item) for item in value)
+        if isinstance(value, dict):
+            if "$o" in value:
+                return self._object(value["$o"])
+            if "$v" in value:
+                return self._decode(value["value"])
+            return value["$r"]
+        return value
+
+    def _replay(self, op, obj, member, args):
+        with self._lock:
+            position = self.position
+            if position >= len(self._events):
+                raise ReplayError(position, "end of trace", [op, obj._oid, member])
+            event = self._events[position]
+            actual = [op, obj._oid, member]
+            if event[:3] != actual:
+                raise ReplayError(position, event[:3], actual)
+            if self.check_args and _encode(list(args)) != event[3]:
+                raise ReplayError(position, event[:4], actual + [_encode(list(args))])
+            seconds = event[5]
+            position += 1
+            # failed attempts followed by the same operation were retried by recorded session
+            while _retried(event[4]) and position < len(self._events) and self._events[position][:4] == event[:4]:
+                event = self._events[position]
+                seconds += event[5]
+                position += 1
+            self.position = position
+        result = event[4]
+        self.seconds += seconds
+        if self.timing and seconds:
+            sleep(seconds * self.timing)
+        if isinstance(result, dict) and "$error" in result:
+            if result["$error"] == "com_error":
+                raise com_error(result["hresult"], *self._decode(result["args"]))
+            raise getattr(builtins, result["$error"], RuntimeError)(result["text"])
+        if op == ITER:
+            return [self._decode(item) for item in result]
+        return self._decode(result)
+
+
+def _replay_policy():
+    """
+    Retry policy of replayed objects: recorded back-off is not repeated and calls do not time out,
+    retries are limited by trace
+    """
+    return api.RetryPolicy(timeout=float("inf"), initial_delay=0.0, max_delay=0.0, jitter=0.0)
+
+
+@contextmanager
+def replay(path, timing=0.0, check_args=True):
+    """
+    Run block against recorded trace instead of AutoCAD
+        >>with replay("session.trace.gz") as acad:
+        >>    tool.sum_length(acad.ActiveDocument.ModelSpace)
+    :param path: trace file
+    :param timing: share of recorded COM time to sleep on every operation, 0 - no waiting, 1.0 - as recorded
+    :param check_args: compare arguments of calls and written values with recorded ones
+    :return: replayed application wrapped by COMRetryObjectWrapper, replayed application object without pywin32
+    """
+    acad = Player(path, timing, check_args).application()
+    if api is None:
+        yield acad
+        return
+    # retry policy set by script outside of block must not delay replay
+    with api.retry_policy(_replay_policy()):
+        yield acad
@@ -0,0 +1,207 @@
+"""
+    pyacadcom.selection
+    ******************
+
+    Pool of reusable named selection sets for on-screen picking and programmatic selection
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from contextlib import contextmanager
+from itertools import count
+from time import perf_counter
+from uuid import uuid4
+
+from pywintypes import com_error
+
+from .datatype import convertcoordinates, convertpoints
+
+# AcSelect modes of Select and SelectByPolygon
+SELECT_WINDOW = 0
+SELECT_CROSSING = 1
+SELECT_FENCE = 2
+SELECT_PREVIOUS = 3
+SELECT_LAST = 4
+SELECT_ALL = 5
+SELECT_WINDOW_POLYGON = 6
+SELECT_CROSSING_POLYGON = 7
+
+_DUPLICATE_KEY = -2145386475
+
+
+class SelectionSetPool:
+    """
+    Named selection sets of document reused through Clear() instead of SelectionSets.Add/Delete on every query.
+    Names are unique for pool, sets are cleared when returned to pool and deleted by close().
+
+        >>with SelectionSetPool(acad.ActiveDocument) as pool:
+        >>    lines = pool.select(SELECT_ALL, filter_type=ft, filter_data=fd)
+        >>    picked = pool.select_on_screen()
+        >>    with pool.selection_set() as selset:
+        >>        selset.SelectOnScreen()
+        >>        selset.Erase()
+        >>pool.stats()
+        {'acquired': 3, 'hits': 2, 'created': 1, 'deleted': 1, 'discarded': 0,
+         'timings': {'select': {'calls': 1, 'seconds': 0.021}, ...}}
+    """
+
+    def __init__(self, doc, size=4, prefix="pyacadcom"):
+        """
+        :param doc: AutoCAD document
+        :param size: number of selection sets kept for reuse, 0 - every set is deleted after use
+        :param prefix: prefix of names of selection sets
+        """
+        self.doc = doc
+        self.size = size
+        self._prefix = "{}_{}".format(prefix, uuid4().hex[:8])
+        self._numbers = count(1)
+        self._free = []
+        self._timings = {}
+        self.acquired = 0
+        self.hits = 0
+        self.created = 0
+        self.deleted = 0
+        self.discarded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def stats(self):
+        return {"acquired": self.acquired, "hits": self.hits, "created": self.created, "deleted": self.deleted,
+                "discarded": self.discarded,
+                "timings": {operation: {"calls": calls, "seconds": seconds}
+                            for operation, (calls, seconds) in self._timings.items()}}
+
+    def _timed(self, operation, function, *args):
+        start = perf_counter()
+        try:
+            return function(*args)
+        finally:
+            timing = self._timings.setdefault(operation, [0, 0.0])
+            timing[0] += 1
+            timing[1] += perf_counter() - start
+
+    def acquire(self):
+        """
+        Get empty selection set, release() it after use
+        """
+        self.acquired += 1
+        if self._free:
+            self.hits += 1
+            return self._free.pop()
+        name = "{}_{}".format(self._prefix, next(self._numbers))
+        sets = self.doc.SelectionSets
+        try:
+            selset = self._timed("add", sets.Add, name)
+        except com_error as error:
+            if error.hresult != _DUPLICATE_KEY:
+                raise
+            # set left by previous run
+            selset = sets.Item(name)
+            selset.Clear()
+        self.created += 1
+        return selset
+
+    def release(self, selset):
+        """
+        Return selection set to pool: it is cleared and kept or deleted if pool is full
+        """
+        if len(self._free) < self.size:
+            try:
+                self._timed("clear", selset.Clear)
+            except com_error:
+                # set was deleted or document was closed
+                self.discarded += 1
+                return
+            self._free.append(selset)
+            return
+        self.__delete(selset)
+
+    def __delete(self, selset):
+        try:
+            self._timed("delete", selset.Delete)
+        except com_error:
+            self.discarded += 1
+            return
+        self.deleted += 1
+
+    def close(self):
+        """
+        Delete selection sets kept in pool
+        """
+        while self._free:
+            self.__delete(self._free.pop())
+
+    @contextmanager
+    def selection_set(self):
+        """
+        Context manager to use selection set of pool, set is returned to pool even if block fails
+        """
+        selset = self.acquire()
+        try:
+            yield selset
+        finally:
+            self.release(selset)
+
+    def __query(self, operation, method, *args):
+        with self.selection_set() as selset:
+            self._timed(operation, getattr(selset, method), *args)
+            return self._timed("read", list, selset)
+
+    def select_on_screen(self, filter_type=None, filter_data=None):
+        """
+        Select entities picked by user
+        :param filter_type: VARIANT array of DXF group codes (userinput.selection_filter)
+        :param filter_data: VARIANT array of values of groups
+        :return: list of entities
+        """
+        if filter_type is None:
+            return self.__query("select_on_screen", "SelectOnScreen")
+        return self.__query("select_on_screen", "SelectOnScreen", filter_type, filter_data)
+
+    def select(self, mode=SELECT_ALL, point1=None, point2=None, filter_type=None, filter_data=None):
+        """
+        Select entities without user: all, by window, crossing, last or previous
+            >>pool.select(SELECT_WINDOW, (0, 0, 0), (100, 100, 0))
+        :param mode: SELECT_WINDOW, SELECT_CROSSING, SELECT_PREVIOUS, SELECT_LAST or SELECT_ALL
+        :param point1: first corner for window and crossing
+        :param point2: second corner for window and crossing
+        :param filter_type: VARIANT array of DXF group codes (userinput.selection_filter)
+        :param filter_data: VARIANT array of values of groups
+        :return: list of entities
+        """
+        args = [mode]
+        if point1 is not None or filter_type is not None:
+            # corners are required before filter even if mode does not use them
+            args.append(convertcoordinates(*self.__point(point1)))
+            args.append(convertcoordinates(*self.__point(point2)))
+        if filter_type is not None:
+            args += [filter_type, filter_data]
+        return self.__query("select", "Select", *args)
+
+    def select_by_polygon(self, mode, points, filter_type=None, filter_data=None):
+        """
+        Select entities by fence or polygon
+            >>pool.select_by_polygon(SELECT_WINDOW_POLYGON, [(0, 0), (100, 0), (50, 80)])
+        :param mode: SELECT_FENCE, SELECT_WINDOW_POLYGON or SELECT_CROSSING_POLYGON
+        :param points: vertices: AcadPointArray, (N, 3) array or sequence of points
+        :param filter_type: VARIANT array of DXF group codes (userinput.selection_filter)
+        :param filter_data: VARIANT array of values of groups
+        :return: list of entities
+        """
+        points = [self.__point(point) for point in points] if isinstance(points, (list, tuple)) else points
+        args = [mode, convertpoints(points)]
+        if filter_type is not None:
+            args += [filter_type, filter_data]
+        return self.__query("select_by_polygon", "SelectByPolygon", *args)
+
+    @staticmethod
+    def __point(point):
+        if point is None:
+            return 0.0, 0.0, 0.0
+        point = tuple(float(value) for value in point)
+        return point if len(point) == 3 else point + (0.0,)
@@ -0,0 +1,165 @@
+"""
+    pyacadcom.snapshot
+    ******************
+
+    Bulk reading of entity properties into columns for Python side filtering and aggregation
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from time import monotonic
+
+from pywintypes import com_error
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, columns stay lists without it
+    np = None
+
+DEFAULT_FIELDS = ("Handle", "ObjectName", "Layer")
+# hresults of property which does not apply to entity: DISP_E_MEMBERNOTFOUND, DISP_E_UNKNOWNNAME, E_NOTIMPL
+_NOT_APPLICABLE = frozenset((-2147352573, -2147352570, -2147467263))
+
+
+class Snapshot(dict):
+    """
+    Columns of entity properties {field: list or numpy array}, all columns have the same length,
+    value is None (nan in numeric numpy columns) where field does not apply to entity type
+
+        >>data = snapshot(acad.ActiveDocument.ModelSpace, ["ObjectName", "Layer", "Length"])
+        >>sum(length for name, length in zip(data["ObjectName"], data["Length"]) if name == "AcDbLine")
+        >>data.count, data.rate
+        (120000, 8500.0)
+    """
+
+    def __init__(self, columns, count=0, elapsed=0.0):
+        super().__init__(columns)
+        self.count = count
+        self.elapsed = elapsed
+
+    @property
+    def rate(self):
+        """
+        Throughput in entities per second
+        """
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+
+def _has_member(entity, name):
+    """
+    Check if COM object has member without reading it
+    """
+    try:
+        oleobj = entity._oleobj_
+    except AttributeError:
+        return True
+    try:
+        oleobj.GetIDsOfNames(0, name)
+        return True
+    except com_error:
+        return False
+
+
+def _read(entity, name):
+    """
+    Read property, None if it does not apply to entity. Other errors are raised,
+    errors of busy AutoCAD are retried by COMRetryObjectWrapper of entities got from wrapped objects
+    """
+    try:
+        return getattr(entity, name)
+    except com_error as error:
+        if error.hresult in _NOT_APPLICABLE:
+            return None
+        raise
+    except AttributeError:
+        if hasattr(entity, "_oleobj_"):
+            # member of COM object exists, win32com raises AttributeError while AutoCAD is busy
+            raise
+        return None
+
+
+def iter_snapshot(entities, fields=DEFAULT_FIELDS, chunk_size=1000, progress=None):
+    """
+    Read properties of entities chunk by chunk, memory is bounded by chunk size
+    :param entities: iterable of entities: SelectionSet, ModelSpace, list
+    :param fields: names of properties to read
+    :param chunk_size: number of entities in chunk
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :return: generator of Snapshot objects, one per chunk
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    fields = tuple(fields)
+    # fields applicable to entity type by ObjectName, type is checked once per drawing
+    applicable = {}
+    start = monotonic()
+    done = 0
+    columns = {field: [] for field in fields}
+    count = 0
+    for entity in entities:
+        object_name = entity.ObjectName
+        own_fields = applicable.get(object_name)
+        if own_fields is None:
+            own_fields = applicable[object_name] = frozenset(
+                field for field in fields if field == "ObjectName" or _has_member(entity, field))
+        for field in fields:
+            if field == "ObjectName":
+                columns[field].append(object_name)
+            elif field in own_fields:
+                columns[field].append(_read(entity, field))
+            else:
+                columns[field].append(None)
+        count += 1
+        if count == chunk_size:
+            done += count
+            elapsed = monotonic() - start
+            if progress is not None:
+                progress(done, elapsed)
+            yield Snapshot(columns, count, elapsed)
+            columns = {field: [] for field in fields}
+            count = 0
+    if count:
+        done += count
+        elapsed = monotonic() - start
+        if progress is not None:
+            progress(done, elapsed)
+        yield Snapshot(columns, count, elapsed)
+
+
+def snapshot(entities, fields=DEFAULT_FIELDS, chunk_size=1000, as_numpy=False, progress=None):
+    """
+    Read properties of all entities into columns
+        >>data = snapshot(selset, ["Handle", "ObjectName", "Length"], as_numpy=True)
+        >>data["Length"][data["ObjectName"] == "AcDbLine"].sum()
+    :param entities: iterable of entities: SelectionSet, ModelSpace, list
+    :param fields: names of properties to read
+    :param chunk_size: number of entities read between progress reports
+    :param as_numpy: convert columns to numpy arrays, numeric columns to float arrays with nan for missing values
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :return: Snapshot object
+    """
+    fields = tuple(fields)
+    columns = {field: [] for field in fields}
+    start = monotonic()
+    count = 0
+    for chunk in iter_snapshot(entities, fields, chunk_size, progress):
+        for field in fields:
+            columns[field].extend(chunk[field])
+        count += chunk.count
+    if as_numpy:
+        if np is None:
+            raise ImportError("snapshot(as_numpy=True) requires numpy")
+        columns = {field: _to_numpy(column) for field, column in columns.items()}
+    return Snapshot(columns, count, monotonic() - start)
+
+
+def _to_numpy(column):
+    """
+    Convert column to float array if all values are numbers or None, to object array otherwise
+    """
+    if all(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in column):
+        return np.array([np.nan if value is None else value for value in column], dtype=np.float64)
+    result = np.empty(len(column), dtype=object)
+    result[:] = column
+    return result
@@ -0,0 +1,259 @@
+"""
+    pyacadcom.spatial
+    ******************
+
+    Spatial index of entity bounding boxes in XY plane for window, crossing and nearest queries
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from heapq import nsmallest
+from math import floor, sqrt
+
+# boxes covering more cells are kept in separate list checked by every query
+_MAX_CELLS_PER_BOX = 64
+
+
+class GridIndex:
+    """
+    Uniform grid index of bounding boxes by entity handle
+
+        >>index = GridIndex()
+        >>index.bulk_load((r.handle, r.min_point, r.max_point) for r in cache.records() if r.min_point)
+        >>index.crossing((0, 0), (100, 100))        # entities intersecting window
+        ['1F4', '2A0']
+        >>index.window((0, 0), (100, 100))          # entities entirely inside window
+        >>index.nearest((50, 50), k=3)
+        [('1F4', 0.0), ('2A0', 12.5), ('3B1', 40.0)]
+        >>index.at_point((50, 50))
+    Points can be (x, y) or (x, y, z), z is ignored.
+    """
+
+    def __init__(self, cell_size=None):
+        """
+        :param cell_size: size of grid cell in drawing units, computed by bulk_load() or from first box if None
+        """
+        if cell_size is not None and cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._boxes = {}
+        # cells keep short lists of handles: lists are smaller and faster to fill than sets
+        self._cells = {}
+        self._large = set()
+        self._bounds = None
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, handle):
+        return handle in self._boxes
+
+    def box(self, handle):
+        """
+        :return: (min_x, min_y, max_x, max_y) of entity
+        """
+        return self._boxes[handle]
+
+    def __cell_range(self, box):
+        size = self.cell_size
+        return floor(box[0] / size), floor(box[1] / size), floor(box[2] / size), floor(box[3] / size)
+
+    def bulk_load(self, items):
+        """
+        Add or move many boxes, cell size is chosen to get about one box per cell if it is not set
+        :param items: iterable of (handle, min point, max point)
+        """
+        boxes = [(handle, (min_point[0], min_point[1], max_point[0], max_point[1]))
+                 for handle, min_point, max_point in items]
+        if not boxes:
+            return
+        for handle, box in boxes:
+            if box[0] > box[2] or box[1] > box[3]:
+                raise ValueError("min_point must not be greater than max_point, handle {!r}".format(handle))
+        if self.cell_size is None and not self._boxes:
+            min_x = min(box[0] for _, box in boxes)
+            min_y = min(box[1] for _, box in boxes)
+            max_x = max(box[2] for _, box in boxes)
+            max_y = max(box[3] for _, box in boxes)
+            mean_size = sum(max(box[2] - box[0], box[3] - box[1]) for _, box in boxes) / len(boxes)
+            self.cell_size = max(mean_size, sqrt((max_x - min_x) * (max_y - min_y) / len(boxes))) or 1.0
+        size = self.cell_size
+        cells = self._cells
+        for handle, box in boxes:
+            if handle in self._boxes:
+                # handle is moved: old cells must not keep it
+                self.remove(handle)
+            i0, j0 = floor(box[0] / size), floor(box[1] / size)
+            if i0 == floor(box[2] / size) and j0 == floor(box[3] / size):
+                # most boxes are in one cell
+                self._boxes[handle] = box
+                cell = cells.get((i0, j0))
+                if cell is None:
+                    cells[(i0, j0)] = [handle]
+                else:
+                    cell.append(handle)
+            else:
+                self.__insert(handle, box)
+        self.__update_bounds()
+
+    def __update_bounds(self):
+        if not self._cells:
+            return
+        rows = [i for i, _ in self._cells]
+        columns = [j for _, j in self._cells]
+        self._bounds = [min(rows), min(columns), max(rows), max(columns)]
+
+    def insert(self, handle, min_point, max_point):
+        """
+        Add or move entity box
+        """
+        box = (min_point[0], min_point[1], max_point[0], max_point[1])
+        if box[0] > box[2] or box[1] > box[3]:
+            raise ValueError("min_point must not be greater than max_point")
+        if self.cell_size is None:
+            self.cell_size = max(box[2] - box[0], box[3] - box[1]) * 4 or 1.0
+        if handle in self._boxes:
+            self.remove(handle)
+        self.__insert(handle, box)
+        if handle not in self._large:
+            i0, j0, i1, j1 = self.__cell_range(box)
+            if self._bounds is None:
+                self._bounds = [i0, j0, i1, j1]
+            else:
+                bounds = self._bounds
+                bounds[0] = min(bounds[0], i0)
+                bounds[1] = min(bounds[1], j0)
+                bounds[2] = max(bounds[2], i1)
+                bounds[3] = max(bounds[3], j1)
+
+    def __insert(self, handle, box):
+        self._boxes[handle] = box
+        i0, j0, i1, j1 = self.__cell_range(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > _MAX_CELLS_PER_BOX:
+            self._large.add(handle)
+            return
+        cells = self._cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i, j))
+                if cell is None:
+                    cells[(i, j)] = [handle]
+                else:
+                    cell.append(handle)
+
+    def remove(self, handle):
+        """
+        Remove entity box
+        """
+        box = self._boxes.pop(handle)
+        if handle in self._large:
+            self._large.discard(handle)
+            return
+        i0, j0, i1, j1 = self.__cell_range(box)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells[(i, j)]
+                cell.remove(handle)
+                if not cell:
+                    del self._cells[(i, j)]
+
+    def clear(self):
+        self._boxes.clear()
+        self._cells.clear()
+        self._large.clear()
+        self._bounds = None
+
+    def __candidates(self, box):
+        i0, j0, i1, j1 = self.__cell_range(box)
+        cells = self._cells
+        found = set(self._large)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(cells):
+            for (i, j), cell in cells.items():
+                if i0 <= i <= i1 and j0 <= j <= j1:
+                    found.update(cell)
+        else:
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cell = cells.get((i, j))
+                    if cell:
+                        found.update(cell)
+        return found
+
+    def crossing(self, min_point, max_point):
+        """
+        Entities which boxes intersect window (crossing selection)
+        :return: list of handles
+        """
+        x0, y0, x1, y1 = min_point[0], min_point[1], max_point[0], max_point[1]
+        boxes = self._boxes
+        return [handle for handle in self.__candidates((x0, y0, x1, y1))
+                if boxes[handle][0] <= x1 and boxes[handle][2] >= x0
+                and boxes[handle][1] <= y1 and boxes[handle][3] >= y0]
+
+    def window(self, min_point, max_point):
+        """
+        Entities which boxes are entirely inside window (window selection)
+        :return: list of handles
+        """
+        x0, y0, x1, y1 = min_point[0], min_point[1], max_point[0], max_point[1]
+        boxes = self._boxes
+        return [handle for handle in self.__candidates((x0, y0, x1, y1))
+                if boxes[handle][0] >= x0 and boxes[handle][2] <= x1
+                and boxes[handle][1] >= y0 and boxes[handle][3] <= y1]
+
+    def at_point(self, point):
+        """
+        Entities which boxes contain point
+        :return: list of handles
+        """
+        return self.crossing(point, point)
+
+    def nearest(self, point, k=1):
+        """
+        Entities with nearest boxes, distance is 0 for boxes containing point
+        :param point: (x, y) or (x, y, z)
+        :param k: number of entities
+        :return: list of (handle, distance) sorted by distance
+        """
+        if not self._boxes or k < 1:
+            return []
+        x, y = point[0], point[1]
+        boxes = self._boxes
+        seen = set()
+        best = []
+
+        def visit(handles):
+            for handle in handles:
+                if handle not in seen:
+                    seen.add(handle)
+                    box = boxes[handle]
+                    dx = max(box[0] - x, 0.0, x - box[2])
+                    dy = max(box[1] - y, 0.0, y - box[3])
+                    best.append((sqrt(dx * dx + dy * dy), handle))
+
+        visit(self._large)
+        if self._cells:
+            size = self.cell_size
+            ci, cj = floor(x / size), floor(y / size)
+            i0, j0, i1, j1 = self._bounds
+            cells = self._cells
+            # rings of cells around cell of point, clipped by occupied part of grid
+            first_ring = max(i0 - ci, ci - i1, j0 - cj, cj - j1, 0)
+            last_ring = max(ci - i0, i1 - ci, cj - j0, j1 - cj, 0)
+            for ring in range(first_ring, last_ring + 1):
+                for i in range(max(ci - ring, i0), min(ci + ring, i1) + 1):
+                    edge = ring if i in (ci - ring, ci + ring) else 0
+                    if edge:
+                        rows = range(max(cj - ring, j0), min(cj + ring, j1) + 1)
+                    else:
+                        rows = [j for j in (cj - ring, cj + ring) if j0 <= j <= j1]
+                    for j in rows:
+                        handles = cells.get((i, j))
+                        if handles:
+                            visit(handles)
+                # boxes out of visited rings are not closer than ring * cell_size
+                if len(best) >= k and nsmallest(k, best)[-1][0] <= ring * size:
+                    break
+        best.sort()
+        return [(handle, distance) for distance, handle in best[:k]]
@@ -30,18 +30,31 @@ def int_from_string(str):
     :return: возвращаемый результат - число
     """
     try:
-        int(str)
+        return int(str)
     except ValueError:
-        "not a int in string"
+        return "not a int in string"
 
-def sum_length(selset):
+def sum_length(selset, local=False):
     """
     Функция подсчёта суммы длин линий, полилиний, мультилиний и дуг в выборке
     :param selset: выборка объектов типа Autocad SelectionSet
+    :param local: True - длины вычисляются локально по геометрии объектов одной операцией numpy
+                  (модуль pyacadcom.geometry, требуется numpy), False - запрашиваются у AutoCAD.
+                  Локальный режим не уменьшает число обращений к AutoCAD: вместо одного Length/ArcLength
+                  на объект читается его геометрия (entity_geometry), у AutoCAD длины не запрашиваются
     :return: сумма длин
     """
     if selset.Count == 0:
         raise ValueError("No elements are chosen")
+    if local:
+        # numpy нужен только для локального вычисления
+        from .geometry import total_length
+        geometries = []
+        for item in selset:
+            geometry = entity_geometry(item)
+            if geometry is not None:
+                geometries.append(geometry)
+        return total_length(geometries)
     line_types = ("AcDbPolyline", "AcDbLine")
     total_length = 0.0
     for item in selset:
@@ -53,6 +66,32 @@ def sum_length(selset):
             total_length += mlinelength(item)
     return total_length
 
+def entity_geometry(item, object_name=None):
+    """
+    Функция получения геометрии объекта для вычисления длины в pyacadcom.geometry.total_length.
+    Обращения к AutoCAD: линия - 2 (StartPoint, EndPoint), дуга - 3 (Radius, StartAngle, EndAngle),
+    мультилиния - 1 (Coordinates), полилиния - Coordinates, Closed и GetBulge по вершинам,
+    с которых начинаются сегменты (у незамкнутой полилинии выпуклость последней вершины не нужна)
+    :param item: объект AutoCAD (линия, полилиния, мультилиния или дуга)
+    :param object_name: тип объекта, если уже известен
+    :return: (ObjectName, данные геометрии) или None для объектов других типов
+    """
+    if object_name is None:
+        object_name = item.ObjectName
+    if object_name == "AcDbLine":
+        return object_name, (item.StartPoint, item.EndPoint)
+    elif object_name == "AcDbPolyline":
+        coordinates = item.Coordinates
+        closed = item.Closed
+        segments = len(coordinates) // 2 - (0 if closed else 1)
+        bulges = [item.GetBulge(i) for i in range(max(segments, 0))]
+        return object_name, (coordinates, bulges, closed)
+    elif object_name == "AcDbMline":
+        return object_name, (item.Coordinates,)
+    elif object_name == "AcDbArc":
+        return object_name, (item.Radius, item.StartAngle, item.EndAngle)
+    return None
+
 def distance(coord1, coord2):
     """
     Функция вычисления расстояния между двумя точками
@@ -73,6 +112,13 @@ def mlinelength(multiline):
     :param multiline: объект мультилинии
     :return: длина мультилинии
     """
+    try:
+        from .geometry import decode_coordinates, segment_lengths
+    except ImportError:
+        pass
+    else:
+        # массив (N, 3) без кортежа на каждую вершину
+        return float(segment_lengths(decode_coordinates(multiline.Coordinates, 3)).sum())
     coordinates = triplecoordinates(multiline.Coordinates)
     length = 0
     for i in range(len(coordinates)-1):
@@ -0,0 +1,247 @@
+"""
+    pyacadcom.transform
+    ******************
+
+    Affine transformations as 4x4 matrices: composition, vectorized application to point arrays
+    and batch TransformBy of entities, requires numpy
+
+    :copyright: (c) 2022 by Dmitriy Lobyntsev
+    :licence: BSD
+"""
+
+from math import cos, sin
+from time import monotonic
+
+import numpy as np
+
+from .datatype import AcadPointArray, convertmatrix
+
+
+def _matrix(matrix):
+    """
+    Get 4x4 float64 array of matrix: array, nested sequences or VARIANT
+    """
+    matrix = np.asarray(getattr(matrix, "value", matrix), dtype=np.float64)
+    if matrix.shape != (4, 4):
+        raise ValueError("transformation matrix must be 4x4, got shape {}".format(matrix.shape))
+    return matrix
+
+
+def _about(matrix, base):
+    """
+    Make linear matrix act about base point instead of origin
+    """
+    if base is not None:
+        base = np.asarray(tuple(base), dtype=np.float64)
+        if base.shape == (2,):
+            base = np.append(base, 0.0)
+        matrix[:3, 3] = base - matrix[:3, :3] @ base
+    return matrix
+
+
+def identity():
+    """
+    :return: 4x4 identity matrix
+    """
+    return np.eye(4)
+
+
+def translation(offset):
+    """
+    Matrix of displacement
+        >>translation((10, 5, 0))
+    :param offset: (dx, dy, dz) or (dx, dy)
+    :return: 4x4 matrix
+    """
+    offset = tuple(offset)
+    if len(offset) not in (2, 3):
+        raise ValueError("translation() offset must have 2 or 3 values")
+    matrix = np.eye(4)
+    matrix[:len(offset), 3] = offset
+    return matrix
+
+
+def scaling(factor, base=None):
+    """
+    Matrix of scaling, AutoCAD accepts only uniform scaling in TransformBy
+        >>scaling(2, base=(10, 10, 0))
+    :param factor: number or (sx, sy, sz)
+    :param base: fixed point, origin if None
+    :return: 4x4 matrix
+    """
+    factors = np.broadcast_to(np.asarray(factor, dtype=np.float64), (3,))
+    matrix = np.eye(4)
+    matrix[(0, 1, 2), (0, 1, 2)] = factors
+    return _about(matrix, base)
+
+
+def rotation(angle, base=None, axis=(0, 0, 1)):
+    """
+    Matrix of rotation counterclockwise looking against axis
+        >>rotation(math.pi / 2, base=(10, 10, 0))
+    :param angle: angle in radians
+    :param base: point on rotation axis, origin if None
+    :param axis: direction of rotation axis, Z axis by default
+    :return: 4x4 matrix
+    """
+    x, y, z = axis = np.asarray(tuple(axis), dtype=np.float64)
+    length = np.sqrt(axis @ axis)
+    if length == 0:
+        raise ValueError("rotation() axis must not be zero vector")
+    x, y, z = x / length, y / length, z / length
+    c, s = cos(angle), sin(angle)
+    t = 1 - c
+    matrix = np.eye(4)
+    matrix[:3, :3] = ((t * x * x + c, t * x * y - s * z, t * x * z + s * y),
+                      (t * x * y + s * z, t * y * y + c, t * y * z - s * x),
+                      (t * x * z - s * y, t * y * z + s * x, t * z * z + c))
+    return _about(matrix, base)
+
+
+def mirroring(point1, point2):
+    """
+    Matrix of mirroring about line in XY plane, as MIRROR command
+    :param point1: first point of mirror line
+    :param point2: second point of mirror line
+    :return: 4x4 matrix
+    """
+    x1, y1 = tuple(point1)[:2]
+    x2, y2 = tuple(point2)[:2]
+    dx, dy = x2 - x1, y2 - y1
+    length = dx * dx + dy * dy
+    if length == 0:
+        raise ValueError("mirroring() points must differ")
+    matrix = np.eye(4)
+    matrix[:2, :2] = ((dx * dx - dy * dy) / length, 2 * dx * dy / length), \
+                     (2 * dx * dy / length, (dy * dy - dx * dx) / length)
+    return _about(matrix, (x1, y1, 0.0))
+
+
+def compose(*matrices):
+    """
+    Combine transformations into one matrix, they are applied in given order
+        >>compose(translation((-10, -10)), rotation(math.pi / 4), scaling(2), translation((10, 10)))
+    :param matrices: 4x4 matrices
+    :return: 4x4 matrix
+    """
+    result = np.eye(4)
+    for matrix in matrices:
+        result = _matrix(matrix) @ result
+    return result
+
+
+def apply(matrix, points, dim=None):
+    """
+    Transform many points in one vectorized operation
+        >>apply(rotation(math.pi / 2), AcadPointArray.from_flat(polyline.Coordinates, dim=2))
+        >>apply(scaling(2), polyline.Coordinates, dim=2)
+    :param matrix: 4x4 matrix
+    :param points: AcadPointArray, (N, 3) or (N, 2) array or sequence of points,
+                   or flat coordinates (x1,y1,[z1],x2,y2,[z2],...) when dim is given
+    :param dim: number of values per point in flat coordinates, 2 or 3
+    :return: transformed points of the same kind: AcadPointArray, (N, 3)/(N, 2) array or flat array,
+             2D points are transformed in XY plane at zero elevation
+    """
+    matrix = _matrix(matrix)
+    if isinstance(points, AcadPointArray):
+        data = points.array
+        return AcadPointArray._wrap(data @ matrix[:3, :3].T + matrix[:3, 3])
+    data = np.asarray(getattr(points, "value", points), dtype=np.float64)
+    if dim is not None:
+        if dim not in (2, 3):
+            raise ValueError("apply() dim must be 2 or 3")
+        if data.ndim != 1 or data.size % dim:
+            raise ValueError("apply() coordinates length must be a multiple of {}".format(dim))
+        return apply(matrix, data.reshape(-1, dim)).ravel()
+    if data.ndim != 2 or data.shape[1] not in (2, 3):
+        raise ValueError("apply() points must be (N, 2) or (N, 3), give dim for flat coordinates")
+    dim = data.shape[1]
+    return data @ matrix[:dim, :dim].T + matrix[:dim, 3]
+
+
+def matrix_variant(matrix):
+    """
+    Convert matrix to 4x4 VARIANT array of doubles for TransformBy
+    :param matrix: 4x4 matrix
+    :return: VARIANT
+    """
+    return convertmatrix(_matrix(matrix))
+
+
+class TransformResult:
+    """
+    Result of transform_many(): number of transformed entities, number of TransformBy calls,
+    number of distinct matrices converted to VARIANT and time spent
+    """
+
+    def __init__(self, count, calls, matrices, elapsed):
+        self.count = count
+        self.calls = calls
+        self.matrices = matrices
+        self.elapsed = elapsed
+
+    @property
+    def rate(self):
+        """
+        Throughput in entities per second
+        """
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return "TransformResult(count={}, calls={}, matrices={}, elapsed={:.3f}, rate={:.0f})".format(
+            self.count, self.calls, self.matrices, self.elapsed, self.rate)
+
+
+def transform_many(entities, matrix, chunk_size=1000, progress=None, skip_identity=True):
+    """
+    Transform entities by TransformBy, one COM call per entity.
+    Several moves, rotations and scalings composed into one matrix are one call instead of one per operation,
+    every distinct matrix is converted to VARIANT once.
+        >>transform_many(selset, compose(rotation(math.pi / 2, base=(10, 10)), translation((100, 0))))
+        TransformResult(count=5000, calls=5000, matrices=1, elapsed=1.210, rate=4132)
+        >>transform_many(selset, lambda entity: offsets[entity.Layer])
+    :param entities: iterable of entities: SelectionSet, ModelSpace, list
+    :param matrix: 4x4 matrix for all entities, or function of entity returning matrix or None to skip entity
+    :param chunk_size: number of entities between progress reports
+    :param progress: function called after every chunk with arguments (entities done, seconds elapsed)
+    :param skip_identity: do not call TransformBy for identity matrix
+    :return: TransformResult object
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    start = monotonic()
+    variants = {}
+    identity_key = np.eye(4).tobytes()
+
+    def variant(matrix):
+        matrix = _matrix(matrix)
+        key = matrix.tobytes()
+        if skip_identity and key == identity_key:
+            return None
+        value = variants.get(key)
+        if value is None:
+            value = variants[key] = convertmatrix(matrix)
+        return value
+
+    if callable(matrix):
+        function = matrix
+    else:
+        single = variant(matrix)
+        function = None
+    count = calls = 0
+    for entity in entities:
+        if function is None:
+            value = single
+        else:
+            value = function(entity)
+            if value is not None:
+                value = variant(value)
+        if value is not None:
+            entity.TransformBy(value)
+            calls += 1
+        count += 1
+        if progress is not None and count % chunk_size == 0:
+            progress(count, monotonic() - start)
+    if progress is not None and count % chunk_size:
+        progress(count, monotonic() - start)
+    return TransformResult(count, calls, len(variants), monotonic() - start)
@@ -11,14 +11,331 @@
 """
 
 
-from random import randint
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from pythoncom import VT_R8, VT_ARRAY, VT_DISPATCH, VT_BSTR, VT_BYREF, com_error
+import win32com.client
+from pythoncom import VT_R8, VT_ARRAY, VT_DISPATCH, VT_BSTR, VT_BYREF, VT_I2, VT_VARIANT, com_error
 
+from .selection import SelectionSetPool
 from .tool import double_from_string, int_from_string
 
+# hresult отмены ввода пользователем (Esc) и ввода ключевого слова вместо точки
+_CANCELED = -2147352567
+_KEYWORD = -2145320928
 
-def text_input(app, request_type="str", prompt="", options=None, default=None):
+# типы примитивов: (ObjectName, имя DXF, псевдонимы)
+_ENTITY_TYPES = (
+    ("AcDbLine", "LINE", ("line", "l")),
+    ("AcDbPolyline", "LWPOLYLINE", ("pline", "polyline", "pl", "lwpolyline")),
+    ("AcDb2dPolyline", "POLYLINE", ("2dpolyline", "2dpoly")),
+    ("AcDb3dPolyline", "POLYLINE", ("3dpolyline", "3dpoly")),
+    ("AcDbPolyFaceMesh", "POLYLINE", ("polyfacemesh", "pface")),
+    ("AcDbPolygonMesh", "POLYLINE", ("polygonmesh", "mesh")),
+    ("AcDbBlockReference", "INSERT", ("block", "blockreference", "bl", "blockref", "insert")),
+    ("AcDbMInsertBlock", "INSERT", ("minsert", "minsertblock")),
+    ("AcDbArc", "ARC", ("arc", "a")),
+    ("AcDbCircle", "CIRCLE", ("circle", "c")),
+    ("AcDbEllipse", "ELLIPSE", ("ellipse", "el")),
+    ("AcDbSpline", "SPLINE", ("spline", "spl")),
+    ("AcDbMline", "MLINE", ("mline", "ml")),
+    ("AcDbRay", "RAY", ("ray",)),
+    ("AcDbXline", "XLINE", ("xline", "xl")),
+    ("AcDbPoint", "POINT", ("point", "po")),
+    ("AcDbText", "TEXT", ("text", "dtext", "dt")),
+    ("AcDbMText", "MTEXT", ("mtext", "mt")),
+    ("AcDbAttributeDefinition", "ATTDEF", ("attdef", "attributedefinition")),
+    ("AcDbMLeader", "MULTILEADER", ("mleader", "multileader")),
+    ("AcDbLeader", "LEADER", ("leader", "le")),
+    ("AcDbHatch", "HATCH", ("hatch", "h")),
+    ("AcDbTable", "ACAD_TABLE", ("table", "tb")),
+    ("AcDbSolid", "SOLID", ("solid", "2dsolid", "so")),
+    ("AcDbTrace", "TRACE", ("trace",)),
+    ("AcDbFace", "3DFACE", ("3dface", "face")),
+    ("AcDb3dSolid", "3DSOLID", ("3dsolid",)),
+    ("AcDbRegion", "REGION", ("region", "reg")),
+    ("AcDbBody", "BODY", ("body",)),
+    ("AcDbShape", "SHAPE", ("shape",)),
+    ("AcDbTolerance", "TOLERANCE", ("tolerance", "tol")),
+    ("AcDbWipeout", "WIPEOUT", ("wipeout",)),
+    ("AcDbRasterImage", "IMAGE", ("image", "rasterimage")),
+    ("AcDbOle2Frame", "OLE2FRAME", ("ole", "ole2frame")),
+    ("AcDbViewport", "VIEWPORT", ("viewport", "vport")),
+    ("AcDbRotatedDimension", "DIMENSION", ("dimension", "dim", "rotateddimension", "dimlinear")),
+    ("AcDbAlignedDimension", "DIMENSION", ("dimension", "dim", "aligneddimension", "dimaligned")),
+    ("AcDbRadialDimension", "DIMENSION", ("dimension", "dim", "radialdimension", "dimradius")),
+    ("AcDbDiametricDimension", "DIMENSION", ("dimension", "dim", "diametricdimension", "dimdiameter")),
+    ("AcDb2LineAngularDimension", "DIMENSION", ("dimension", "dim", "angulardimension", "dimangular")),
+    ("AcDb3PointAngularDimension", "DIMENSION", ("dimension", "dim", "angulardimension", "dimangular")),
+    ("AcDbOrdinateDimension", "DIMENSION", ("dimension", "dim", "ordinatedimension", "dimordinate")),
+    ("AcDbArcDimension", "ARC_DIMENSION", ("dimension", "dim", "arcdimension", "dimarc")),
+    ("AcDbRadialDimensionLarge", "LARGE_RADIAL_DIMENSION", ("dimension", "dim", "dimjogged")),
+)
+
+# псевдоним в нижнем регистре (включая ObjectName) -> множество ObjectName
+_TYPE_ALIASES = {alias: {object_name for object_name, _, aliases in _ENTITY_TYPES
+                         if alias in aliases or alias == object_name.lower()}
+                 for object_name, _, aliases in _ENTITY_TYPES for alias in aliases + (object_name.lower(),)}
+# ObjectName -> имя DXF для фильтра выбора (группа 0)
+_DXF_NAMES = {object_name: dxf_name for object_name, dxf_name, _ in _ENTITY_TYPES}
+# имя DXF -> все ObjectName, которые им выбираются
+_DXF_OBJECT_NAMES = {dxf_name: {object_name for object_name, name, _ in _ENTITY_TYPES if name == dxf_name}
+                     for dxf_name in _DXF_NAMES.values()}
+
+
+def selection_filter(obj_type):
+    """
+    Функция построения фильтра выбора AutoCAD по типам объектов
+    :param obj_type: типы объектов через пробел (псевдонимы из get_obj или ObjectName, регистр не имеет значения)
+    :return: (FilterType, FilterData, allowed_types, exact)
+                FilterType, FilterData - массивы VARIANT для SelectOnScreen/Select, None если типы не распознаны
+                allowed_types - множество допустимых ObjectName
+                exact - True, если фильтр AutoCAD выбирает только допустимые типы и проверка ObjectName не нужна
+    """
+    allowed_types = set()
+    for value in obj_type.lower().split():
+        allowed_types.update(_TYPE_ALIASES.get(value, ()))
+    if not allowed_types:
+        return None, None, allowed_types, False
+    dxf_names = sorted({_DXF_NAMES[object_name] for object_name in allowed_types})
+    exact = all(_DXF_OBJECT_NAMES[dxf_name] <= allowed_types for dxf_name in dxf_names)
+    filter_type = win32com.client.VARIANT(VT_ARRAY | VT_I2, [0])
+    filter_data = win32com.client.VARIANT(VT_ARRAY | VT_VARIANT, [",".join(dxf_names)])
+    return filter_type, filter_data, allowed_types, exact
+
+
+class InputProvider:
+    """
+    Источник пользовательского ввода для text_input, get_keyword, get_obj и dist.
+    Методы повторяют методы AutoCAD Utility и SelectionSet: отмена ввода - com_error с hresult -2147352567,
+    ключевое слово вместо точки в get_point - com_error с hresult -2145320928, после которого слово
+    возвращает get_input.
+    """
+
+    def prompt(self, text):
+        raise NotImplementedError
+
+    def initialize(self, bits, keywords=""):
+        raise NotImplementedError
+
+    def get_string(self, has_spaces, prompt=""):
+        raise NotImplementedError
+
+    def get_keyword(self, prompt=""):
+        raise NotImplementedError
+
+    def get_point(self, base=None, prompt=""):
+        raise NotImplementedError
+
+    def get_input(self):
+        raise NotImplementedError
+
+    def select(self, filter_type=None, filter_data=None):
+        """
+        :return: список выбранных объектов
+        """
+        raise NotImplementedError
+
+
+class COMInput(InputProvider):
+    """
+    Ввод пользователя в документе AutoCAD через COM.
+    Набор выбора создаётся при первом выборе и очищается для следующих, close() удаляет его из документа.
+        >>with COMInput(acad.ActiveDocument) as provider, input_provider(provider):
+        >>    for _ in range(10):
+        >>        get_obj(acad, "line")
+    Функции ввода без источника создают его на один вызов, и набор удаляется сразу после выбора.
+    """
+
+    def __init__(self, doc, pool=None):
+        """
+        :param doc: документ AutoCAD (app.ActiveDocument)
+        :param pool: SelectionSetPool для выбора объектов, по умолчанию - собственный пул из одного набора
+        """
+        self.doc = doc
+        # Utility запрашивается один раз, а не при каждом вводе
+        self.utility = doc.Utility
+        self._owns_pool = pool is None
+        self.pool = SelectionSetPool(doc, size=1) if pool is None else pool
+
+    def close(self):
+        """
+        Удаление наборов собственного пула, переданный пул закрывает его владелец
+        """
+        if self._owns_pool:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def prompt(self, text):
+        self.utility.Prompt(text)
+
+    def initialize(self, bits, keywords=""):
+        self.utility.InitializeUserInput(bits, keywords)
+
+    def get_string(self, has_spaces, prompt=""):
+        return self.utility.GetString(has_spaces, prompt)
+
+    def get_keyword(self, prompt=""):
+        return self.utility.GetKeyword(prompt)
+
+    def get_point(self, base=None, prompt=""):
+        if base is None:
+            return self.utility.GetPoint()
+        return self.utility.GetPoint(win32com.client.VARIANT(VT_ARRAY | VT_R8, base), prompt)
+
+    def get_input(self):
+        return self.utility.GetInput()
+
+    def select(self, filter_type=None, filter_data=None):
+        return self.pool.select_on_screen(filter_type, filter_data)
+
+
+# ответ ScriptedInput, отменяющий ввод (как Esc)
+CANCEL = object()
+# строка файла ответов, отменяющая ввод
+CANCEL_LINE = "*cancel*"
+
+
+def _parse_point(text):
+    """
+    Разбор точки в формате AutoCAD "x,y" или "x,y,z"
+    :return: (x, y, z) или None, если текст не является точкой
+    """
+    values = text.split(",")
+    if len(values) not in (2, 3):
+        return None
+    try:
+        point = tuple(float(value) for value in values)
+    except ValueError:
+        return None
+    return point if len(point) == 3 else point + (0.0,)
+
+
+class ScriptedInput(InputProvider):
+    """
+    Ввод из заранее заданных ответов для пакетной обработки без участия пользователя и тестов.
+    Ответы: строки (текст, ключевые слова, "x,y[,z]" для точек, "" - Enter), точки (x, y[, z]),
+    списки объектов для выбора, CANCEL или None - отмена, исключения - выбрасываются.
+    Когда ответы закончились, ввод отменяется.
+        >>with input_provider(ScriptedInput(["2.5", "Yes", [line1, line2]])):
+        >>    text_input(app, "double")
+        (1, 2.5)
+        >>text_input(None, "double", provider=ScriptedInput.from_file("answers.txt"))
+    """
+
+    def __init__(self, responses):
+        """
+        :param responses: список, генератор или другой итерируемый объект ответов
+        """
+        self._responses = iter(responses)
+        self._keyword = None
+        self.prompts = []
+        self.consumed = 0
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8"):
+        """
+        Ответы из текстового файла, по одному в строке, строка CANCEL_LINE отменяет ввод.
+        Файл читается по мере ввода.
+        """
+        def lines():
+            with open(path, encoding=encoding) as file:
+                for line in file:
+                    line = line.rstrip("\r\n")
+                    yield CANCEL if line == CANCEL_LINE else line
+        return cls(lines())
+
+    def __next(self):
+        response = next(self._responses, CANCEL)
+        self.consumed += 1
+        if response is CANCEL or response is None:
+            raise com_error(_CANCELED, "Exception occurred.", None, None)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def prompt(self, text):
+        self.prompts.append(text)
+
+    def initialize(self, bits, keywords=""):
+        pass
+
+    def get_string(self, has_spaces, prompt=""):
+        self.prompts.append(prompt)
+        text = str(self.__next())
+        return text if has_spaces else text.split(" ")[0]
+
+    def get_keyword(self, prompt=""):
+        self.prompts.append(prompt)
+        return str(self.__next())
+
+    def get_point(self, base=None, prompt=""):
+        self.prompts.append(prompt)
+        response = self.__next()
+        if isinstance(response, str):
+            point = _parse_point(response)
+            if point is None:
+                # ключевое слово или Enter вместо точки
+                self._keyword = response
+                raise com_error(_KEYWORD, "User input is a keyword", None, None)
+            return point
+        point = tuple(float(value) for value in response)
+        return point if len(point) == 3 else point + (0.0,)
+
+    def get_input(self):
+        keyword, self._keyword = self._keyword, None
+        return keyword if keyword is not None else str(self.__next())
+
+    def select(self, filter_type=None, filter_data=None):
+        response = self.__next()
+        if isinstance(response, str):
+            raise TypeError("ScriptedInput: ответ для выбора объектов должен быть списком объектов, а не строкой")
+        selection = list(response)
+        if filter_type is not None:
+            # выбор по именам DXF, как фильтр AutoCAD (группа 0)
+            allowed = set()
+            for dxf_name in str(getattr(filter_data, "value", filter_data)[0]).split(","):
+                allowed.update(_DXF_OBJECT_NAMES.get(dxf_name, ()))
+            selection = [item for item in selection if item.ObjectName in allowed]
+        return selection
+
+
+_provider = ContextVar("pyacadcom_input_provider", default=None)
+
+
+@contextmanager
+def input_provider(provider):
+    """
+    Контекстный менеджер источника ввода для text_input, get_keyword, get_obj и dist в блоке
+        >>with input_provider(ScriptedInput(answers)):
+        >>    for path in drawings:
+        >>        command(app)
+    """
+    token = _provider.set(provider)
+    try:
+        yield provider
+    finally:
+        _provider.reset(token)
+
+
+def _input(app, provider):
+    """
+    Источник ввода: переданный в функцию, заданный input_provider или ввод в активном документе
+    """
+    provider = provider or _provider.get()
+    if provider is not None:
+        return provider
+    #источник на один вызов: временный набор выбора удаляется сразу после выбора и при ошибке
+    doc = app.ActiveDocument
+    return COMInput(doc, SelectionSetPool(doc, size=0))
+
+
+def text_input(app, request_type="str", prompt="", options=None, default=None, provider=None):
     """
     Функция текстового ввода в активном документе
     :param app: экземпляр Autocad
@@ -29,6 +346,7 @@ def text_input(app, request_type="str", prompt="", options=None, default=None):
                     "str_spaced" - строка с пробелами
     :param prompt: текст запроса
     :param options: перечень опций в виде словаря {имя опции: значение, ...}
+    :param provider: источник ввода (InputProvider), по умолчанию - input_provider или активный документ
     :return: Resultcode, Resultvalue
                 Resultcode: тип возвращаемого результата:
                                                 1 - введены данные
@@ -36,7 +354,7 @@ def text_input(app, request_type="str", prompt="", options=None, default=None):
                                                 -1 - ввод отменен пользователем
                 Resultvalue: возвращаемый результат - данные, имя выбранной опции или описание ошибки
     """
-    doc = app.ActiveDocument
+    inp = _input(app, provider)
     if isinstance(options, dict):
         opt = {}
         init_string = " ".join([item.replace(" ", "") for item in options.values()])
@@ -51,16 +369,16 @@ def text_input(app, request_type="str", prompt="", options=None, default=None):
         init_string = ""
 
     prompt = "\n" + prompt
-    doc.Utility.InitializeUserInput(128, init_string)
+    inp.initialize(128, init_string)
 
     while True:
         try:
-            text = doc.Utility.GetString(1 if request_type == "str_spaced" else 0, prompt + options_string)
+            text = inp.get_string(1 if request_type == "str_spaced" else 0, prompt + options_string)
             if text == "":
                 text = "@defaultvalue@"
         except com_error as error:
-            if error.hresult == -2147352567:
-                doc.Utility.Prompt("Отменено пользователем/Canceled by user\n")
+            if error.hresult == _CANCELED:
+                inp.prompt("Отменено пользователем/Canceled by user\n")
                 return -1, "Esc is pressed"
             else:
                 raise
@@ -72,93 +390,75 @@ def text_input(app, request_type="str", prompt="", options=None, default=None):
             return 1, text
         elif request_type == "int":
             res = int_from_string(text)
-            if res[0] >= 0:
-                return 1, res[1]
+            if isinstance(res, int):
+                return 1, res
         elif request_type == "double":
             res = double_from_string(text)
-            if res[0] >= 0:
-                return 1, res[1]
+            if isinstance(res, float):
+                return 1, res
 
-def get_obj(app, obj_type = "all", prompt = ""):
+def get_obj(app, obj_type = "all", prompt = "", provider=None):
     """
     Функция выбора объектов автокада, с поддержкой фильтрации
     :param app: объект-приложение автокада
     :param obj_type: тип допустимых объектов (регистр не имеет значения), для выбора нескольких типов перечислить их через пробел
                         All - допустим выбор любого объекта
-                        "Line", "AcDbLine" - линия
+                        "Line", "l", "AcDbLine" - линия
                         "Pline", "Polyline", "pl", "AcDbPolyline" - полилиния
                         "Block", "Blockreference", "bl", "blockref", "AcDbBlockReference" - блок
                         "Arc", "a", "AcDbArc" - дуга
-                        ""Mline", "ml", "AcDbMline" - мультилиния
+                        "Mline", "ml", "AcDbMline" - мультилиния
+                        "Mleader", "Multileader", "AcDbMLeader" - мультивыноска
+                        "Circle", "Text", "Mtext", "Hatch", "Dimension" и др. - см. _ENTITY_TYPES,
+                        а также ObjectName любого примитива из _ENTITY_TYPES
+                    Фильтр по типу передаётся в AutoCAD, неподходящие объекты не выбираются
     :param prompt: текст запроса в командной строке
+    :param provider: источник ввода (InputProvider), по умолчанию - input_provider или активный документ
     :return: Resultcode, Resultvalue
                 Resultcode: тип возвращаемого результата:
                                                 1 - выбран объект/объекты
                                                 -1 - ничего не выбрано
                                                 -2 - нет объектов, соответствующих допустимому типу
+                                                     (среди выбранных объектов с тем же именем DXF)
                 Resultvalue: возвращаемый результат - список объектов или описание ошибки
     """
+    if obj_type.lower() != "all":
+        filter_type, filter_data, allowed_types, exact = selection_filter(obj_type)
+    else:
+        filter_type = filter_data = None
+        allowed_types, exact = None, True
     #подключаемся к активному документу
-    doc = app.ActiveDocument
-    #создаём временный набор и запрашиваем у пользователя добавление в него элементов
-    selset = doc.SelectionSets.Add(str(randint(0, 100000)))
-    doc.Utility.Prompt(prompt)
-    selset.SelectOnScreen()
-    #создаём список из элементов набора
-    selection = [x for x in selset]
-    #удаляем временный набор
-    selset.Delete()
+    inp = _input(app, provider)
+    inp.prompt(prompt)
+    #список выбранных элементов
+    selection = inp.select(filter_type, filter_data)
     #обрабатываем вариант, при котором ничего не выбрано
+    #(с фильтром AutoCAD неподходящие объекты не выбираются, поэтому это тоже пустой выбор)
     if len(selection) == 0:
-        doc.Utility.Prompt("Ничего не выбрано")
+        inp.prompt("Ничего не выбрано")
         return -1, "No choice"
-    obj_type = obj_type.lower()
-    if obj_type.lower() != "all":
-        # приводим названия типов разрешенных лбъектов к каноническому виду
-        allowed_types = [x.lower() for x in obj_type.split(" ")]
-        for i, value in enumerate(allowed_types):
-            if value in ("line", "acdbline", "l"):
-                allowed_types[i] = "AcDbLine"
-            elif value in ("pline", "polyline", "pl", "acdbpolyline"):
-                allowed_types[i] = "AcDbPolyline"
-            elif value in ("block", "blockreference", "bl", "blockref", "acdbblockreference"):
-                allowed_types[i] = "AcDbBlockReference"
-            elif value in ("arc", "a", "acdbarc"):
-                allowed_types[i] = "AcDbArc"
-            elif value in ("mleader", "multileader", "acdbmleader"):
-                allowed_types[i] = "AcDbMLeader"
-            elif value in ("arc", "a", "acdbarc"):
-                allowed_types[i] = "AcDbArc"
-            elif value in ("mline", "ml", "acdbmline"):
-                allowed_types[i] = "AcDbMline"
-            #TODO: Добавить все примитивы автокада
-            else:
-                allowed_types[i] = ""
-        #определяем индексы элементов списка, которые проходят по фильтру
-        items_to_keep = []
-        for i, item in enumerate(selection):
-            if item.ObjectName in allowed_types:
-                items_to_keep.append(i)
-        #определяем элементы, удовлетворяющие фильтру
-        selection = [selection[i] for i in items_to_keep]
+    if not exact:
+        #фильтр AutoCAD выбирает и другие типы с тем же именем DXF (POLYLINE, INSERT, DIMENSION)
+        selection = [item for item in selection if item.ObjectName in allowed_types]
         #обрабатываем случай, при котором нет элементов удовлетворяющих списку
         if len(selection) == 0:
             return -2, "Не выбрано объектов, соответствующих фильтру"
     return 1, selection
 
-def get_keyword(app, prompt = "", options = None, default = None):
+def get_keyword(app, prompt = "", options = None, default = None, provider=None):
     """
         Функция ввода опций в активном документе
         :param app: экземпляр Autocad
         :param prompt: текст запроса
         :param options: перечень опций в виде словаря {имя опции: значение, ...}
+        :param provider: источник ввода (InputProvider), по умолчанию - input_provider или активный документ
         :return: Resultcode, Resultvalue
                     Resultcode: тип возвращаемого результата:
                                                             -1 - ввод отменен пользователем
                                                             2 - введена опция, отрицательные числа - ошибки
                     Resultvalue: возвращаемый результат - имя выбранной опции или описание ошибки
         """
-    doc = app.ActiveDocument
+    inp = _input(app, provider)
     if isinstance(options, dict):
         opt = {}
         init_string = " ".join([item.replace(" ", "") for item in options.values()])
@@ -172,16 +472,16 @@ def get_keyword(app, prompt = "", options = None, default = None):
         options_string = ""
         init_string = ""
     prompt = "\n" + prompt
-    doc.Utility.InitializeUserInput(128, init_string)
+    inp.initialize(128, init_string)
 
     while True:
         try:
-            text = doc.Utility.GetKeyword(prompt + options_string)
+            text = inp.get_keyword(prompt + options_string)
             if text == "":
                 text = "@defaultvalue@"
         except com_error as error:
-            if error.hresult == -2147352567:
-                doc.Utility.Prompt("Отмена\n")
+            if error.hresult == _CANCELED:
+                inp.prompt("Отмена\n")
                 return -1, "Esc is pressed"
             else:
                 raise
@@ -189,13 +489,14 @@ def get_keyword(app, prompt = "", options = None, default = None):
             if option.replace(" ", "").find(text) != -1:
                 return 2, opt[option]
 
-def dist(app, options=None, default=None):
+def dist(app, options=None, default=None, provider=None):
     """
     Функция для измерения расстояния
     :param app:
+    :param provider: источник ввода (InputProvider), по умолчанию - input_provider или активный документ
     :return:
     """
-    doc = app.ActiveDocument
+    inp = _input(app, provider)
     if isinstance(options, dict):
         opt = {}
         init_string = " ".join([item.replace(" ", "") for item in options.values()])
@@ -210,20 +511,20 @@ def dist(app, options=None, default=None):
         options_string = ""
         init_string = ""
 
-    doc.Utility.InitializeUserInput(128, init_string)
+    inp.initialize(128, init_string)
 
     finish = False
     while not finish:
         try:
-            doc.Utility.Prompt("\nВведите первую точку для измерения расстояния" + options_string)
-            prevpoint = doc.Utility.GetPoint()
+            inp.prompt("\nВведите первую точку для измерения расстояния" + options_string)
+            prevpoint = inp.get_point()
             finish = True
         except com_error as error:
-            if error.hresult == -2145320928:
-                text = doc.Utility.GetInput()
+            if error.hresult == _KEYWORD:
+                text = inp.get_input()
                 if text == "":
                     text = "@defaultvalue@"
-            elif error.hresult == -2147352567:
+            elif error.hresult == _CANCELED:
                 return -2, "Esc is pressed"
             else:
                 raise
@@ -235,17 +536,17 @@ def dist(app, options=None, default=None):
     finish = False
     while not finish:
         try:
-            curpoint = doc.Utility.GetPoint(win32com.client.VARIANT(VT_ARRAY | VT_R8, prevpoint), "Введите следующую точку для измерения расстояния [Ввод для завершения]")
+            curpoint = inp.get_point(prevpoint, "Введите следующую точку для измерения расстояния [Ввод для завершения]")
             dist += ((curpoint[0] - prevpoint[0]) ** 2 + (curpoint[1] - prevpoint[1]) ** 2) ** 0.5
             prevpoint = curpoint
         except com_error as error:
-            if error.hresult == -2145320928:
-                key = doc.Utility.GetInput()
+            if error.hresult == _KEYWORD:
+                key = inp.get_input()
                 if key == "" or key.upper() == "В":
                     finish = True
                 else:
                     continue
-            elif error.hresult == -2147352567:
+            elif error.hresult == _CANCELED:
                 return -2, "Esc is pressed"
             else:
                 raise
@@ -14,6 +14,10 @@ setup(
     install_requires=[
         'pywin32>=214',
     ],
+    extras_require={
+        'numpy': ['numpy>=1.17'],
+        'parquet': ['pyarrow'],
+    },
     keywords=["autocad", "automation", "activex", "pywin32"],
     license="BSD License",
     include_package_data=True,